@@ -0,0 +1,89 @@
+"""initial schema
+
+Revision ID: 4a1d7c2e9b10
+Revises: 
+Create Date: 2025-05-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a1d7c2e9b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list:
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'persons',
+        *_timestamps(),
+        sa.Column('first_name', sa.String(length=50), nullable=False),
+        sa.Column('last_name', sa.String(length=50), nullable=False),
+        sa.Column('surname', sa.String(length=50), nullable=True),
+        sa.Column('email', sa.String(length=254), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    op.create_table(
+        'books',
+        *_timestamps(),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('author', sa.String(length=255), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('isbn', sa.String(length=17), nullable=True),
+        sa.Column('number_of_copies', sa.Integer(), nullable=False),
+        sa.Column('description', sa.String(length=300), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('isbn')
+    )
+    op.create_table(
+        'librarians',
+        *_timestamps(),
+        sa.Column('hash_password', sa.String(length=60), nullable=False),
+        sa.Column('person_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['person_id'], ['persons.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'readers',
+        *_timestamps(),
+        sa.Column('person_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['person_id'], ['persons.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'borrowedbooks',
+        *_timestamps(),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('reader_id', sa.Integer(), nullable=False),
+        sa.Column('librarian_id', sa.Integer(), nullable=False),
+        sa.Column('borrowed_date', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('returned_date', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id']),
+        sa.ForeignKeyConstraint(['librarian_id'], ['librarians.id']),
+        sa.ForeignKeyConstraint(['reader_id'], ['readers.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('borrowedbooks')
+    op.drop_table('readers')
+    op.drop_table('librarians')
+    op.drop_table('books')
+    op.drop_table('persons')
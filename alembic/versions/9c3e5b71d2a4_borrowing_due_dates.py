@@ -0,0 +1,43 @@
+"""borrowing due dates and renewals
+
+Revision ID: 9c3e5b71d2a4
+Revises: 4a1d7c2e9b10
+Create Date: 2025-06-02 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5b71d2a4'
+down_revision: Union[str, None] = '4a1d7c2e9b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('borrowedbooks', sa.Column('due_date', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.add_column(
+        'borrowedbooks',
+        sa.Column('renewal_count', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.execute("UPDATE borrowedbooks SET due_date = borrowed_date + INTERVAL '14 days'")
+    op.alter_column('borrowedbooks', 'due_date', nullable=False)
+    op.alter_column('borrowedbooks', 'renewal_count', server_default=None)
+    op.create_index(
+        'ix_borrowedbooks_open_due_date',
+        'borrowedbooks',
+        ['due_date', 'id'],
+        postgresql_where=sa.text('returned_date IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrowedbooks_open_due_date', table_name='borrowedbooks')
+    op.drop_column('borrowedbooks', 'renewal_count')
+    op.drop_column('borrowedbooks', 'due_date')
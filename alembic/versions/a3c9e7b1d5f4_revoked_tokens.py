@@ -0,0 +1,50 @@
+"""revoked tokens
+
+Revision ID: a3c9e7b1d5f4
+Revises: f1b5d9a3c7e2
+Create Date: 2025-07-04 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e7b1d5f4'
+down_revision: Union[str, None] = 'f1b5d9a3c7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'revokedtokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('jti', sa.String(length=32), nullable=True),
+        sa.Column('librarian_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['librarian_id'], ['librarians.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti')
+    )
+    op.create_index('ix_revokedtokens_expires_at', 'revokedtokens', ['expires_at'])
+    op.create_index('ix_revokedtokens_created_at', 'revokedtokens', ['created_at'])
+    op.create_index(
+        'ix_revokedtokens_librarian_all',
+        'revokedtokens',
+        ['librarian_id', 'created_at'],
+        postgresql_where=sa.text('jti IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_revokedtokens_librarian_all', table_name='revokedtokens')
+    op.drop_index('ix_revokedtokens_created_at', table_name='revokedtokens')
+    op.drop_index('ix_revokedtokens_expires_at', table_name='revokedtokens')
+    op.drop_table('revokedtokens')
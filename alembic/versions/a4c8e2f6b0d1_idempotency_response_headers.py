@@ -0,0 +1,33 @@
+"""store response headers of idempotent requests
+
+Revision ID: a4c8e2f6b0d1
+Revises: f1a7c3e9b5d2
+Create Date: 2025-07-07 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e2f6b0d1'
+down_revision: Union[str, None] = 'f1a7c3e9b5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows stored before this keep replaying only their content type
+    op.add_column(
+        'idempotencykeys',
+        sa.Column('response_headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotencykeys', 'response_headers')
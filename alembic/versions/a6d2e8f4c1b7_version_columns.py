@@ -0,0 +1,30 @@
+"""version columns for optimistic locking
+
+Revision ID: a6d2e8f4c1b7
+Revises: f3c7a9d1b5e2
+Create Date: 2025-06-25 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2e8f4c1b7'
+down_revision: Union[str, None] = 'f3c7a9d1b5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('books', sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('persons', sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('persons', 'version_id')
+    op.drop_column('books', 'version_id')
@@ -0,0 +1,56 @@
+"""fines and job watermarks
+
+Revision ID: b27f04c8e6d1
+Revises: 9c3e5b71d2a4
+Create Date: 2025-06-09 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b27f04c8e6d1'
+down_revision: Union[str, None] = '9c3e5b71d2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'fines',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('borrowing_id', sa.Integer(), nullable=False),
+        sa.Column('reader_id', sa.Integer(), nullable=False),
+        sa.Column('days_overdue', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['borrowing_id'], ['borrowedbooks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['reader_id'], ['readers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('borrowing_id')
+    )
+    op.create_index('ix_fines_reader_id', 'fines', ['reader_id'])
+    op.create_table(
+        'jobwatermarks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_run_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index('ix_borrowedbooks_updated_at', 'borrowedbooks', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrowedbooks_updated_at', table_name='borrowedbooks')
+    op.drop_table('jobwatermarks')
+    op.drop_index('ix_fines_reader_id', table_name='fines')
+    op.drop_table('fines')
@@ -0,0 +1,35 @@
+"""sync shelf counts of titles with per-copy stock
+
+Revision ID: b8e4a2c6f0d3
+Revises: e5b1d7f3a9c2
+Create Date: 2025-07-06 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4a2c6f0d3'
+down_revision: Union[str, None] = 'e5b1d7f3a9c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Checkouts and returns of registered copies did not move the counter until now
+    op.execute(
+        "UPDATE books SET number_of_copies = ("
+        "SELECT count(*) FROM bookcopies "
+        "WHERE bookcopies.book_id = books.id AND bookcopies.status = 'available'"
+        "), version_id = version_id + 1 "
+        "WHERE EXISTS (SELECT 1 FROM bookcopies WHERE bookcopies.book_id = books.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
@@ -0,0 +1,57 @@
+"""holds
+
+Revision ID: b9e1f5a3d7c4
+Revises: a6d2e8f4c1b7
+Create Date: 2025-06-26 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e1f5a3d7c4'
+down_revision: Union[str, None] = 'a6d2e8f4c1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'holds',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('reader_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('ready_until', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['reader_id'], ['readers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_holds_reader_id', 'holds', ['reader_id'])
+    op.create_index(
+        'ix_holds_queue', 'holds', ['book_id', 'created_at'],
+        postgresql_where=sa.text("status = 'waiting'")
+    )
+    op.create_index(
+        'ux_holds_open_reader_book', 'holds', ['book_id', 'reader_id'], unique=True,
+        postgresql_where=sa.text("status IN ('waiting', 'ready')")
+    )
+    op.create_index(
+        'ix_holds_ready_until', 'holds', ['ready_until'],
+        postgresql_where=sa.text("status = 'ready'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_holds_ready_until', table_name='holds')
+    op.drop_index('ux_holds_open_reader_book', table_name='holds')
+    op.drop_index('ix_holds_queue', table_name='holds')
+    op.drop_index('ix_holds_reader_id', table_name='holds')
+    op.drop_table('holds')
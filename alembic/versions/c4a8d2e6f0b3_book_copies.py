@@ -0,0 +1,74 @@
+"""book copies
+
+Revision ID: c4a8d2e6f0b3
+Revises: b9e1f5a3d7c4
+Create Date: 2025-06-27 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8d2e6f0b3'
+down_revision: Union[str, None] = 'b9e1f5a3d7c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'bookcopies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('barcode', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('location', sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('barcode')
+    )
+    op.create_index('ix_bookcopies_book_id', 'bookcopies', ['book_id'])
+    op.create_index(
+        'ix_bookcopies_available', 'bookcopies', ['book_id', 'id'],
+        postgresql_where=sa.text("status = 'available'")
+    )
+    op.add_column('borrowedbooks', sa.Column('copy_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'borrowedbooks_copy_id_fkey', 'borrowedbooks', 'bookcopies', ['copy_id'], ['id'], ondelete='SET NULL'
+    )
+    op.add_column('holds', sa.Column('copy_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'holds_copy_id_fkey', 'holds', 'bookcopies', ['copy_id'], ['id'], ondelete='SET NULL'
+    )
+    # The history index covers every column the history query projects, now including copy_id
+    op.drop_index('ix_borrowedbooks_reader_history', table_name='borrowedbooks')
+    op.create_index(
+        'ix_borrowedbooks_reader_history',
+        'borrowedbooks',
+        ['reader_id', sa.text('borrowed_date DESC'), sa.text('id DESC')],
+        postgresql_include=['book_id', 'librarian_id', 'copy_id', 'due_date', 'returned_date', 'renewal_count']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrowedbooks_reader_history', table_name='borrowedbooks')
+    op.create_index(
+        'ix_borrowedbooks_reader_history',
+        'borrowedbooks',
+        ['reader_id', sa.text('borrowed_date DESC'), sa.text('id DESC')],
+        postgresql_include=['book_id', 'librarian_id', 'due_date', 'returned_date', 'renewal_count']
+    )
+    op.drop_constraint('holds_copy_id_fkey', 'holds', type_='foreignkey')
+    op.drop_column('holds', 'copy_id')
+    op.drop_constraint('borrowedbooks_copy_id_fkey', 'borrowedbooks', type_='foreignkey')
+    op.drop_column('borrowedbooks', 'copy_id')
+    op.drop_index('ix_bookcopies_available', table_name='bookcopies')
+    op.drop_index('ix_bookcopies_book_id', table_name='bookcopies')
+    op.drop_table('bookcopies')
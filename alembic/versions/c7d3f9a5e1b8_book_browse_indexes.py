@@ -0,0 +1,46 @@
+"""indexes for filtered catalog browse
+
+Revision ID: c7d3f9a5e1b8
+Revises: a3c9e7b1d5f4
+Create Date: 2025-07-05 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3f9a5e1b8'
+down_revision: Union[str, None] = 'a3c9e7b1d5f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_books_author_year', 'books', ['author', 'year', 'id'])
+    op.create_index('ix_books_year', 'books', ['year', 'id'])
+    op.create_index('ix_books_name', 'books', ['name', 'id'])
+    op.create_index(
+        'ix_books_available',
+        'books',
+        ['id'],
+        postgresql_where=sa.text('number_of_copies > 0')
+    )
+    op.create_index(
+        'ix_books_isbn_pattern',
+        'books',
+        ['isbn'],
+        postgresql_ops={'isbn': 'varchar_pattern_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_isbn_pattern', table_name='books')
+    op.drop_index('ix_books_available', table_name='books')
+    op.drop_index('ix_books_name', table_name='books')
+    op.drop_index('ix_books_year', table_name='books')
+    op.drop_index('ix_books_author_year', table_name='books')
@@ -0,0 +1,34 @@
+"""hand the copy counter of titles with registered copies over to bookcopies
+
+Revision ID: d2f6b4a8c0e7
+Revises: b8e4a2c6f0d3
+Create Date: 2025-07-07 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b4a8c0e7'
+down_revision: Union[str, None] = 'b8e4a2c6f0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Their shelf count is now derived from the free copies, so the counter only holds
+    # unregistered copies
+    op.execute(
+        "UPDATE books SET number_of_copies = 0, version_id = version_id + 1 "
+        "WHERE number_of_copies <> 0 "
+        "AND EXISTS (SELECT 1 FROM bookcopies WHERE bookcopies.book_id = books.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
@@ -0,0 +1,73 @@
+"""circulation stats summary tables
+
+Revision ID: d5a9e3f1c6b2
+Revises: b27f04c8e6d1
+Create Date: 2025-06-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9e3f1c6b2'
+down_revision: Union[str, None] = 'b27f04c8e6d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list:
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'dailyloanstats',
+        *_base_columns(),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('loans', sa.Integer(), nullable=False),
+        sa.Column('returns', sa.Integer(), nullable=False),
+        sa.Column('active_readers', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day')
+    )
+    op.create_table(
+        'bookloanstats',
+        *_base_columns(),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('loans', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_bookloanstats_day_book_id', 'bookloanstats', ['day', 'book_id'], unique=True)
+    op.create_table(
+        'readerloanstats',
+        *_base_columns(),
+        sa.Column('reader_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('loans', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['reader_id'], ['readers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_readerloanstats_day_reader_id', 'readerloanstats', ['day', 'reader_id'], unique=True)
+    op.create_index('ix_borrowedbooks_borrowed_date', 'borrowedbooks', ['borrowed_date'])
+    op.create_index('ix_borrowedbooks_returned_date', 'borrowedbooks', ['returned_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrowedbooks_returned_date', table_name='borrowedbooks')
+    op.drop_index('ix_borrowedbooks_borrowed_date', table_name='borrowedbooks')
+    op.drop_index('ix_readerloanstats_day_reader_id', table_name='readerloanstats')
+    op.drop_table('readerloanstats')
+    op.drop_index('ix_bookloanstats_day_book_id', table_name='bookloanstats')
+    op.drop_table('bookloanstats')
+    op.drop_table('dailyloanstats')
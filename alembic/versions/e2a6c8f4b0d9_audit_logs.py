@@ -0,0 +1,45 @@
+"""audit logs
+
+Revision ID: e2a6c8f4b0d9
+Revises: d7f3b1c9e5a8
+Create Date: 2025-07-01 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c8f4b0d9'
+down_revision: Union[str, None] = 'd7f3b1c9e5a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'auditlogs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('action', sa.String(length=50), nullable=False),
+        sa.Column('entity_type', sa.String(length=30), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=True),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('occurred_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_auditlogs_entity', 'auditlogs', ['entity_type', 'entity_id', 'occurred_at'])
+    op.create_index('ix_auditlogs_actor', 'auditlogs', ['actor_id', 'occurred_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_auditlogs_actor', table_name='auditlogs')
+    op.drop_index('ix_auditlogs_entity', table_name='auditlogs')
+    op.drop_table('auditlogs')
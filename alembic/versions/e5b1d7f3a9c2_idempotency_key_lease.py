@@ -0,0 +1,32 @@
+"""lease for in-progress idempotency keys
+
+Revision ID: e5b1d7f3a9c2
+Revises: c7d3f9a5e1b8
+Create Date: 2025-07-06 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b1d7f3a9c2'
+down_revision: Union[str, None] = 'c7d3f9a5e1b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing in-progress keys get an already expired lease, so a retry can take them over
+    op.add_column(
+        'idempotencykeys',
+        sa.Column('locked_until', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotencykeys', 'locked_until')
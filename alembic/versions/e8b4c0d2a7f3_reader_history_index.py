@@ -0,0 +1,33 @@
+"""covering index for reader loan history
+
+Revision ID: e8b4c0d2a7f3
+Revises: d5a9e3f1c6b2
+Create Date: 2025-06-23 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4c0d2a7f3'
+down_revision: Union[str, None] = 'd5a9e3f1c6b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_borrowedbooks_reader_history',
+        'borrowedbooks',
+        ['reader_id', sa.text('borrowed_date DESC'), sa.text('id DESC')],
+        postgresql_include=['book_id', 'librarian_id', 'due_date', 'returned_date', 'renewal_count']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrowedbooks_reader_history', table_name='borrowedbooks')
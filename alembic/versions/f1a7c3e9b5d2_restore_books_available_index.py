@@ -0,0 +1,36 @@
+"""restore the partial index on books with copies on the shelf
+
+Revision ID: f1a7c3e9b5d2
+Revises: d2f6b4a8c0e7
+Create Date: 2025-07-07 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e9b5d2'
+down_revision: Union[str, None] = 'd2f6b4a8c0e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases upgraded while c7d3f9a5e1b8 briefly shipped without this index lack it
+    op.create_index(
+        'ix_books_available',
+        'books',
+        ['id'],
+        postgresql_where=sa.text('number_of_copies > 0'),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Owned by c7d3f9a5e1b8, which drops it
+    pass
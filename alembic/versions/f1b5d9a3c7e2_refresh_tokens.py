@@ -0,0 +1,45 @@
+"""refresh tokens
+
+Revision ID: f1b5d9a3c7e2
+Revises: e2a6c8f4b0d9
+Create Date: 2025-07-03 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b5d9a3c7e2'
+down_revision: Union[str, None] = 'e2a6c8f4b0d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'refreshtokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('librarian_id', sa.Integer(), nullable=False),
+        sa.Column('family_id', sa.String(length=32), nullable=False),
+        sa.Column('token_digest', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['librarian_id'], ['librarians.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_digest')
+    )
+    op.create_index('ix_refreshtokens_librarian_id', 'refreshtokens', ['librarian_id'])
+    op.create_index('ix_refreshtokens_family_id', 'refreshtokens', ['family_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refreshtokens_family_id', table_name='refreshtokens')
+    op.drop_index('ix_refreshtokens_librarian_id', table_name='refreshtokens')
+    op.drop_table('refreshtokens')
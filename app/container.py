@@ -0,0 +1,87 @@
+from typing import Optional
+
+from app.utils.audit_writer import AuditWriter
+from app.utils.cache import LocalCache
+from app.utils.cache_invalidation import BOOK_CACHE, PRINCIPAL_CACHE, InvalidationListener
+from app.utils.event_broadcaster import EventBroadcaster
+from app.utils.security import PasswordSecurity, PasswordSettings, SecuritySettings
+from app.utils.settings import (
+    AuditSettings, CacheSettings, EventStreamSettings, FineSettings, LoanSettings, StatsSettings,
+    TokenDenylistSettings
+)
+from app.utils.token_denylist import TokenDenylist
+from database import create_db_engine, create_session_factory
+
+
+class AppContainer:
+    """Everything that lives as long as the process: the engine, parsed settings, the password
+    hashing context, in-process caches and background workers.
+
+    Built once in the application lifespan and handed to request dependencies as singletons,
+    so no request pays for re-reading .env or rebuilding a CryptContext.
+    """
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.security_settings = SecuritySettings()
+        self.password_settings = PasswordSettings()
+        self.loan_settings = LoanSettings()
+        self.fine_settings = FineSettings()
+        self.stats_settings = StatsSettings()
+        self.event_stream_settings = EventStreamSettings()
+        self.audit_settings = AuditSettings()
+        self.denylist_settings = TokenDenylistSettings()
+        self.cache_settings = CacheSettings()
+
+        self.engine = create_db_engine(database_url)
+        self.session_factory = create_session_factory(self.engine)
+
+        self.password_security = PasswordSecurity(rounds=self.password_settings.bcrypt_rounds)
+
+        self.principal_cache = LocalCache(
+            max_size=self.cache_settings.principal_cache_size,
+            ttl_seconds=self.cache_settings.principal_cache_ttl_seconds
+        )
+        self.book_cache = LocalCache(
+            max_size=self.cache_settings.book_cache_size,
+            ttl_seconds=self.cache_settings.book_cache_ttl_seconds
+        )
+        # Writes in any worker NOTIFY the keys they touched; this evicts them here
+        self.invalidation_listener = InvalidationListener(
+            self._listener_connection,
+            {PRINCIPAL_CACHE: self.principal_cache, BOOK_CACHE: self.book_cache}
+        )
+        self.token_denylist = TokenDenylist(
+            capacity=self.denylist_settings.denylist_capacity,
+            error_rate=self.denylist_settings.denylist_error_rate,
+            refresh_interval=self.denylist_settings.denylist_refresh_seconds,
+        )
+
+        self.event_broadcaster = EventBroadcaster(
+            self.session_factory,
+            poll_interval=self.event_stream_settings.event_poll_interval,
+            queue_size=self.event_stream_settings.event_subscriber_queue_size,
+            retention_days=self.event_stream_settings.event_retention_days,
+        )
+        self.audit_writer = AuditWriter(
+            self.session_factory,
+            max_queue_size=self.audit_settings.audit_queue_size,
+            batch_size=self.audit_settings.audit_batch_size,
+            flush_interval=self.audit_settings.audit_flush_interval,
+        )
+
+    def start(self) -> None:
+        self.audit_writer.start()
+        self.invalidation_listener.start()
+
+    async def stop(self) -> None:
+        await self.event_broadcaster.stop()
+        self.invalidation_listener.stop()
+        # Blocks until every queued audit entry has been written, so it must run before the engine goes
+        self.audit_writer.stop()
+        self.engine.dispose()
+
+    def _listener_connection(self):
+        # LISTEN holds its connection for good, so it is taken out of the pool rather than borrowed
+        connection = self.engine.raw_connection()
+        connection.detach()
+        return connection.driver_connection
@@ -0,0 +1,150 @@
+import asyncio
+import json
+from typing import Dict, FrozenSet, NamedTuple, Optional, Sequence
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.metrics import REGISTRY
+
+ADMISSION_REJECTED = REGISTRY.counter(
+    "admission_rejected_total",
+    "Requests shed with 503 because their bulkhead stayed full past its deadline",
+    label_names=("bulkhead",)
+)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class Bulkhead(NamedTuple):
+    name: str
+    max_concurrent: int
+    # How long a request may wait for a slot before it is shed
+    max_wait: float
+    # Requests beyond this many already waiting are shed without waiting at all
+    max_queue: int
+    # Applied to every transaction of the request's session; None leaves the server default
+    statement_timeout_ms: Optional[int] = None
+
+
+class RouteRule(NamedTuple):
+    prefix: str
+    bulkhead: str
+    methods: Optional[FrozenSet[str]] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return path == self.prefix or path.startswith(self.prefix.rstrip("/") + "/")
+
+
+class _Limiter:
+    def __init__(self, bulkhead: Bulkhead):
+        self.bulkhead = bulkhead
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self) -> bool:
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self.waiting >= self.bulkhead.max_queue:
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.bulkhead.max_wait)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # A semaphore belongs to one event loop; a worker has one, test clients start fresh ones
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.bulkhead.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+
+class AdmissionMiddleware:
+    """Bulkheads per route class, so one slow kind of request cannot take every DB connection.
+
+    Each class of routes gets its own concurrency limit, sized so that together they fit the
+    connection pool. A request that cannot get a slot within its bulkhead's deadline, or that
+    finds too many requests already queued, is answered 503 with ``Retry-After`` straight away
+    instead of holding a thread while it waits for a pool connection. The bulkhead's
+    ``statement_timeout`` is passed on to ``get_db`` through the request state. Requests no rule
+    matches (event streams, metrics) pass through unlimited.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            bulkheads: Sequence[Bulkhead],
+            rules: Sequence[RouteRule],
+            retry_after: int = 1,
+    ):
+        self.app = app
+        self.limiters: Dict[str, _Limiter] = {bulkhead.name: _Limiter(bulkhead) for bulkhead in bulkheads}
+        self.rules = list(rules)
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self._classify(scope["method"], scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            ADMISSION_REJECTED.inc(bulkhead=limiter.bulkhead.name)
+            await self._send_overloaded(send)
+            return
+        try:
+            if limiter.bulkhead.statement_timeout_ms is not None:
+                scope.setdefault("state", {})["statement_timeout_ms"] = limiter.bulkhead.statement_timeout_ms
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    def _classify(self, method: str, path: str) -> Optional[_Limiter]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return self.limiters[rule.bulkhead]
+        return None
+
+    async def _send_overloaded(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is busy, please retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+DEFAULT_RULES = [
+    RouteRule("/auth", "auth"),
+    RouteRule("/borrowings", "checkout"),
+    RouteRule("/holds", "checkout"),
+    RouteRule("/stats", "export"),
+    RouteRule("/fines/accrue", "export"),
+    RouteRule("/books", "catalog", READ_METHODS),
+    RouteRule("/readers", "catalog", READ_METHODS),
+    RouteRule("/librarians", "catalog", READ_METHODS),
+    RouteRule("/fines", "catalog", READ_METHODS),
+    # Every other write, e.g. catalog and account changes; only reads such as /events/stream and
+    # /metrics run unlimited
+    RouteRule("/", "write", WRITE_METHODS),
+]
@@ -0,0 +1,210 @@
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=min(level, 11))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Server preference when the client rates several encodings equally
+ENCODERS: Dict[str, Callable[[int], object]] = {}
+if brotli is not None:
+    ENCODERS["br"] = _BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = _ZstdEncoder
+ENCODERS["gzip"] = _GzipEncoder
+
+
+def negotiate_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Pick the best available content coding for an Accept-Encoding header, or None for identity."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(coding, wildcard), -index, coding)
+        for index, coding in enumerate(available)
+    ]
+    quality, _, coding = max(candidates, default=(0.0, 0, None))
+    return coding if quality > 0 else None
+
+
+class CompressionMiddleware:
+    """Compress responses with gzip, and brotli/zstd when those packages are installed.
+
+    Buffered responses below `minimum_size` go out untouched. Compressed copies of buffered bodies
+    are kept in a small LRU keyed by encoding and body digest, so a hot catalog payload is compressed
+    once and then served from memory. Streaming responses are compressed chunk by chunk and flushed
+    after every chunk, so clients still receive data as soon as it is produced.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int = 1024,
+            compress_level: int = 6,
+            cache_size: int = 128,
+            cache_max_body_size: int = 1024 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compress_level = compress_level
+        self.cache_size = cache_size
+        self.cache_max_body_size = cache_max_body_size
+        self._cache: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), list(ENCODERS))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self, encoding, send).run(scope, receive)
+
+    def compress_body(self, encoding: str, body: bytes) -> bytes:
+        if len(body) > self.cache_max_body_size or self.cache_size <= 0:
+            return self._compress(encoding, body)
+
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self._cache.get(key)
+        if compressed is not None:
+            self._cache.move_to_end(key)
+            return compressed
+
+        compressed = self._compress(encoding, body)
+        self._cache[key] = compressed
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compressed
+
+    def create_encoder(self, encoding: str):
+        return ENCODERS[encoding](self.compress_level)
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        encoder = self.create_encoder(encoding)
+        return encoder.compress(body) + encoder.finish()
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.compress = True
+        self.encoder = None
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Headers are held back until the first body chunk shows whether compression is worth it
+            self.start_message = message
+            self.compress = "content-encoding" not in Headers(raw=message["headers"])
+            return
+
+        if message["type"] != "http.response.body" or not self.compress:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None and self.start_message is not None and not more_body:
+            # The whole body arrived in one message: compress it in one go, or not at all
+            if len(body) < self.middleware.minimum_size:
+                self.compress = False
+                await self._flush_start()
+                await self.send(message)
+                return
+            compressed = self.middleware.compress_body(self.encoding, body)
+            self._mark_compressed(content_length=len(compressed))
+            await self._flush_start()
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.encoder is None:
+            self.encoder = self.middleware.create_encoder(self.encoding)
+            self._mark_compressed(content_length=None)
+            await self._flush_start()
+
+        chunk = self.encoder.compress(body) if body else b""
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _mark_compressed(self, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Sequence
+
+from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.models import IdempotencyKey
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.security import SecuritySettings
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+# Their responses carry access and refresh tokens, which must never be written to the database
+EXCLUDED_PREFIXES = ("/auth",)
+# Describe the stored body as it was sent, not as it is replayed
+UNSTORED_HEADERS = frozenset({"content-length", "transfer-encoding"})
+
+
+class IdempotencyMiddleware:
+    """Honour the Idempotency-Key header on write requests.
+
+    The first request with a key reserves it and, if it succeeds, its status, headers (ETag,
+    Location, ...) and body are stored. A retry with the same key and the same request is answered
+    from the stored copy with one indexed lookup, without running the route again. Keys are scoped
+    to the authenticated librarian, not the token, so a retry sent with a refreshed access token
+    still finds its key; requests without a valid token are not deduplicated. A retry that arrives
+    while the first request is still running gets 409; reusing a key for a different request gets
+    422. Failed requests release the key, so the client may retry them for real. A key whose
+    request never finished (the worker died) is held for ``lock_seconds`` and can then be taken
+    over by a retry. Paths under ``excluded_prefixes`` bypass the middleware and their responses
+    are never stored.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            session_factory: Optional[Callable[[], Session]] = None,
+            ttl_hours: int = 24,
+            lock_seconds: int = 300,
+            repository_factory: Callable[[Session], IdempotencyRepository] = IdempotencyRepository,
+            excluded_prefixes: Sequence[str] = EXCLUDED_PREFIXES,
+            security_settings: Optional[SecuritySettings] = None,
+    ):
+        self.app = app
+        self.session_factory = session_factory
+        self.ttl = timedelta(hours=ttl_hours)
+        self.lock = timedelta(seconds=lock_seconds)
+        self.repository_factory = repository_factory
+        self.excluded_prefixes = tuple(excluded_prefixes)
+        self.security_settings = security_settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+                scope["type"] != "http"
+                or scope["method"] not in IDEMPOTENT_METHODS
+                or scope["path"].startswith(self.excluded_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters long")
+            return
+
+        caller = self._principal(scope, headers)
+        if caller is None:
+            # The route answers 401; there is nobody to scope a stored response to
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        request_hash = _digest(
+            scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body
+        )
+
+        # Without an explicit factory, use the one the application container built at startup
+        session_factory = self.session_factory or scope["app"].state.container.session_factory
+        now = datetime.now(timezone.utc)
+        try:
+            existing = await run_in_threadpool(
+                self._call, session_factory, "claim", caller, key, request_hash, now + self.ttl, now + self.lock
+            )
+        except ValueError as e:
+            await _send_error(send, 503, str(e))
+            return
+
+        if existing is not None:
+            if existing.request_hash != request_hash:
+                await _send_error(send, 422, "Idempotency-Key was already used for a different request")
+            elif existing.status_code is None:
+                await _send_error(send, 409, "A request with this Idempotency-Key is still being processed")
+            else:
+                await _send_stored(send, existing)
+            return
+
+        start_message: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, _replay_body(body, receive), capture)
+        except Exception:
+            await self._settle(session_factory, "release", caller, key)
+            raise
+
+        status_code = start_message["status"]
+        response_body = b"".join(chunks)
+        if 200 <= status_code < 300:
+            response_headers = Headers(raw=start_message["headers"])
+            stored_headers = [
+                [name, value] for name, value in response_headers.items() if name not in UNSTORED_HEADERS
+            ]
+            await self._settle(
+                session_factory, "complete", caller, key, status_code, response_headers.get("content-type"),
+                response_body, stored_headers
+            )
+        else:
+            await self._settle(session_factory, "release", caller, key)
+
+        await send(start_message)
+        await send({"type": "http.response.body", "body": response_body})
+
+    async def _settle(self, session_factory: Callable[[], Session], method: str, *args) -> None:
+        # The route has already committed its work, so a failure here must not turn it into an error
+        # response. At worst the key stays in progress until its lease runs out.
+        try:
+            await run_in_threadpool(self._call, session_factory, method, *args)
+        except Exception:
+            logger.exception("Failed to %s idempotency key", method)
+
+    def _principal(self, scope: Scope, headers: Headers) -> Optional[str]:
+        """The librarian the bearer token was issued to, or None without a validly signed one.
+
+        Revocation is left to the route: a revoked token gets 401 there, which releases the key.
+        """
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        settings = self.security_settings or scope["app"].state.container.security_settings
+        try:
+            payload = jwt.decode(token, settings.secret_key.get_secret_value(), algorithms=[settings.algorithm])
+        except JWTError:
+            return None
+        principal = payload.get("lid", payload.get("sub"))
+        return None if principal is None else _digest(str(principal).encode())
+
+    def _call(self, session_factory: Callable[[], Session], method: str, *args):
+        # Each step commits on its own: a claim has to be visible to concurrent retries at once
+        with UnitOfWork.begin(session_factory) as unit_of_work:
+            return getattr(self.repository_factory(unit_of_work.session), method)(*args)
+
+
+def _digest(*parts: bytes) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(len(part).to_bytes(8, "big"))
+        hasher.update(part)
+    return hasher.hexdigest()
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+async def _send_stored(send: Send, record: IdempotencyKey) -> None:
+    body = record.response_body
+    headers = [
+        (b"content-length", str(len(body)).encode()),
+        (b"idempotent-replayed", b"true"),
+    ]
+    if record.response_headers is not None:
+        headers.extend((name.encode("latin-1"), value.encode("latin-1")) for name, value in record.response_headers)
+    elif record.content_type:
+        # Stored before response headers were kept
+        headers.append((b"content-type", record.content_type.encode("latin-1")))
+    await send({"type": "http.response.start", "status": record.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_error(send: Send, status_code: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
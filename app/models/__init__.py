@@ -1,7 +1,22 @@
+from .audit_log_model import AuditLog
 from .base_model import Base
+from .book_copy_model import BookCopy
+from .book_loan_stat_model import BookLoanStat
 from .book_model import Book
+from .daily_loan_stat_model import DailyLoanStat
+from .fine_model import Fine
+from .hold_model import Hold
+from .idempotency_key_model import IdempotencyKey
+from .job_watermark_model import JobWatermark
 from .librarian_model import Librarian
+from .outbox_event_model import OutboxEvent
 from .person_model import Person
+from .reader_loan_stat_model import ReaderLoanStat
 from .reader_model import Reader
+from .refresh_token_model import RefreshToken
+from .revoked_token_model import RevokedToken
 
-__all__ = ["Base", "Book", "Librarian", "Person", "Reader"]
\ No newline at end of file
+__all__ = [
+    "AuditLog", "Base", "Book", "BookCopy", "BookLoanStat", "DailyLoanStat", "Fine", "Hold", "IdempotencyKey", "JobWatermark",
+    "Librarian", "OutboxEvent", "Person", "Reader", "ReaderLoanStat", "RefreshToken", "RevokedToken",
+]
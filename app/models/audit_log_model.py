@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Index, String, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class AuditLog(Base):
+    # No foreign keys: the trail must outlive the librarians and records it mentions
+    actor_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    action: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    entity_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    details: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # When the change happened; created_at is when the batch reached the database
+    occurred_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_auditlogs_entity", "entity_type", "entity_id", "occurred_at"),
+        Index("ix_auditlogs_actor", "actor_id", "occurred_at"),
+    )
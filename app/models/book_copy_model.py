@@ -0,0 +1,31 @@
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, String, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base_model import Base
+
+COPY_AVAILABLE = "available"
+COPY_ON_LOAN = "on_loan"
+COPY_ON_HOLD = "on_hold"
+COPY_LOST = "lost"
+
+
+class BookCopy(Base):
+    __tablename__ = "bookcopies"
+
+    book_id: Mapped[int] = mapped_column(ForeignKey('books.id', ondelete='CASCADE'), index=True, nullable=False)
+    barcode: Mapped[str] = mapped_column(String(32), unique=True, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=COPY_AVAILABLE)
+    location: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    book: Mapped["Book"] = relationship("Book")
+
+    __table_args__ = (
+        # Free copies of a title: checkout claims the first unlocked entry, availability counts them
+        Index(
+            "ix_bookcopies_available",
+            "book_id", "id",
+            postgresql_where=text("status = 'available'")
+        ),
+    )
@@ -0,0 +1,16 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class BookLoanStat(Base):
+    book_id: Mapped[int] = mapped_column(ForeignKey('books.id', ondelete='CASCADE'), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    loans: Mapped[int] = mapped_column(nullable=False)
+
+    __table_args__ = (
+        Index("ix_bookloanstats_day_book_id", "day", "book_id", unique=True),
+    )
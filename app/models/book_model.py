@@ -1,9 +1,13 @@
-from sqlalchemy import String
-from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy import Index, String, func, select, text
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship, validates
 
 from app.models.base_model import Base
+from app.models.book_copy_model import COPY_AVAILABLE, BookCopy
 from app.models.borrowed_book_model import BorrowedBook
 
+# Postgres' default name for the unique constraint on isbn
+ISBN_CONSTRAINT = "books_isbn_key"
+
 
 class Book(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -12,9 +16,24 @@ class Book(Base):
     isbn: Mapped[str] = mapped_column(String(17), unique=True, nullable=True)
     number_of_copies: Mapped[int] = mapped_column(default=1)
     description: Mapped[int] = mapped_column(String(300), nullable=True)
+    version_id: Mapped[int] = mapped_column(nullable=False, server_default="1")
 
     borrowings: Mapped[list["BorrowedBook"]] = relationship("BorrowedBook", back_populates="book")
 
+    # Every ORM flush of a book checks and bumps the version, so concurrent edits cannot silently overwrite
+    __mapper_args__ = {"version_id_col": version_id}
+
+    # Catalog browse (BookRepository.get_all with a BookFilter): each filter and sort is an index range scan
+    __table_args__ = (
+        Index("ix_books_author_year", "author", "year", "id"),
+        Index("ix_books_year", "year", "id"),
+        Index("ix_books_name", "name", "id"),
+        # Titles with unregistered copies on the shelf; the registered ones are found on ix_bookcopies_available
+        Index("ix_books_available", "id", postgresql_where=text("number_of_copies > 0")),
+        # LIKE 'prefix%' can only use a btree built with pattern ops under a non-C collation
+        Index("ix_books_isbn_pattern", "isbn", postgresql_ops={"isbn": "varchar_pattern_ops"}),
+    )
+
     @validates('number_of_copies')
     def validate_number_of_copies(self, key, value):
         if value < 0:
@@ -23,3 +42,14 @@ class Book(Base):
 
     def has_active_borrowings(self) -> bool:
         return any(b.returned_date is None for b in self.borrowings)
+
+
+# Copies on the shelf, derived so that checkouts never write to the title's row: the counter of
+# unregistered copies (0 once a title has registered copies) plus its free registered copies,
+# counted on ix_bookcopies_available
+Book.available_copies = column_property(
+    Book.number_of_copies + select(func.count())
+    .where(BookCopy.book_id == Book.id, BookCopy.status == COPY_AVAILABLE)
+    .correlate_except(BookCopy)
+    .scalar_subquery()
+)
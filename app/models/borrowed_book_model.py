@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, DateTime, TIMESTAMP, func
+from sqlalchemy import ForeignKey, DateTime, TIMESTAMP, func, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -11,17 +11,47 @@ class BorrowedBook(Base):
     book_id: Mapped[int] = mapped_column(ForeignKey('books.id'), nullable=False)
     reader_id: Mapped[int] = mapped_column(ForeignKey('readers.id'), nullable=False)
     librarian_id: Mapped[int] = mapped_column(ForeignKey('librarians.id'), nullable=False)
+    # NULL for titles whose stock is still tracked only by Book.number_of_copies
+    copy_id: Mapped[Optional[int]] = mapped_column(ForeignKey('bookcopies.id', ondelete='SET NULL'), nullable=True)
 
     borrowed_date: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         default=func.now(),
         nullable=False
     )
+    due_date: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False
+    )
     returned_date: Mapped[Optional[datetime]] = mapped_column(
         TIMESTAMP(timezone=True),
         nullable=True
     )
+    renewal_count: Mapped[int] = mapped_column(default=0, nullable=False)
 
     book: Mapped['Book'] = relationship("Book", back_populates="borrowings")
     reader: Mapped['Reader'] = relationship("Reader", back_populates="borrowings")
     librarian: Mapped['Librarian'] = relationship("Librarian", back_populates="borrowings")
+
+    __table_args__ = (
+        # Only open loans can become overdue, so the index stays as small as the set of books on hand
+        Index(
+            "ix_borrowedbooks_open_due_date",
+            "due_date", "id",
+            postgresql_where=text("returned_date IS NULL")
+        ),
+        # Batch jobs pick up loans changed since their last watermark
+        Index("ix_borrowedbooks_updated_at", "updated_at"),
+        # Circulation stats are rebuilt one day range at a time
+        Index("ix_borrowedbooks_borrowed_date", "borrowed_date"),
+        Index("ix_borrowedbooks_returned_date", "returned_date"),
+    )
+
+
+# Reader history pages walk this index backwards in time; the included columns are exactly what
+# the history query projects, so a page is served by an index-only scan
+Index(
+    "ix_borrowedbooks_reader_history",
+    BorrowedBook.reader_id, BorrowedBook.borrowed_date.desc(), BorrowedBook.id.desc(),
+    postgresql_include=["book_id", "librarian_id", "copy_id", "due_date", "returned_date", "renewal_count"]
+)
@@ -0,0 +1,13 @@
+from datetime import date
+
+from sqlalchemy import Date
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class DailyLoanStat(Base):
+    day: Mapped[date] = mapped_column(Date, unique=True, nullable=False)
+    loans: Mapped[int] = mapped_column(nullable=False)
+    returns: Mapped[int] = mapped_column(nullable=False)
+    active_readers: Mapped[int] = mapped_column(nullable=False)
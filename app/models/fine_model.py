@@ -0,0 +1,15 @@
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Numeric
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base_model import Base
+
+
+class Fine(Base):
+    borrowing_id: Mapped[int] = mapped_column(ForeignKey('borrowedbooks.id', ondelete='CASCADE'), unique=True, nullable=False)
+    reader_id: Mapped[int] = mapped_column(ForeignKey('readers.id', ondelete='CASCADE'), index=True, nullable=False)
+    days_overdue: Mapped[int] = mapped_column(nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+
+    borrowing: Mapped["BorrowedBook"] = relationship("BorrowedBook")
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, String, TIMESTAMP, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base_model import Base
+
+HOLD_WAITING = "waiting"
+HOLD_READY = "ready"
+HOLD_FULFILLED = "fulfilled"
+HOLD_CANCELLED = "cancelled"
+HOLD_EXPIRED = "expired"
+
+
+class Hold(Base):
+    book_id: Mapped[int] = mapped_column(ForeignKey('books.id', ondelete='CASCADE'), nullable=False)
+    reader_id: Mapped[int] = mapped_column(ForeignKey('readers.id', ondelete='CASCADE'), index=True, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=HOLD_WAITING)
+    copy_id: Mapped[Optional[int]] = mapped_column(ForeignKey('bookcopies.id', ondelete='SET NULL'), nullable=True)
+    # Set when a returned copy is set aside for the reader; the hold lapses if not picked up by then
+    ready_until: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+
+    book: Mapped["Book"] = relationship("Book")
+    reader: Mapped["Reader"] = relationship("Reader")
+
+    __table_args__ = (
+        # The queue itself: the next hold for a book is the first entry of this small index
+        Index(
+            "ix_holds_queue",
+            "book_id", "created_at",
+            postgresql_where=text("status = 'waiting'")
+        ),
+        Index(
+            "ux_holds_open_reader_book",
+            "book_id", "reader_id",
+            unique=True,
+            postgresql_where=text("status IN ('waiting', 'ready')")
+        ),
+        Index(
+            "ix_holds_ready_until",
+            "ready_until",
+            postgresql_where=text("status = 'ready'")
+        ),
+    )
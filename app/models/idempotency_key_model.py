@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import String, TIMESTAMP, LargeBinary, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class IdempotencyKey(Base):
+    # Hash of the authenticated librarian, so one client cannot replay another client's response
+    scope: Mapped[str] = mapped_column(String(64), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # NULL while the first request is still being processed
+    status_code: Mapped[Optional[int]] = mapped_column(nullable=True)
+    content_type: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    response_body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # [name, value] pairs the route set, e.g. etag and location; content-length is recomputed
+    response_headers: Mapped[Optional[List[List[str]]]] = mapped_column(JSONB, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    # Lease of the request in progress; once it passes, a retry may take the key over
+    locked_until: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotencykeys_scope_key"),
+    )
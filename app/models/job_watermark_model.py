@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from sqlalchemy import String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class JobWatermark(Base):
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    last_run_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
@@ -0,0 +1,18 @@
+from typing import Any, Dict
+
+from sqlalchemy import Index, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class OutboxEvent(Base):
+    # The primary key doubles as the stream position clients resume from with Last-Event-ID
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    __table_args__ = (
+        # Retention purges delete by age
+        Index("ix_outboxevents_created_at", "created_at"),
+    )
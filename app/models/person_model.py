@@ -2,12 +2,18 @@ from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base_model import Base
 
+# Postgres' default name for the unique constraint on email
+EMAIL_CONSTRAINT = "persons_email_key"
+
 
 class Person(Base):
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
     last_name: Mapped[str] = mapped_column(String(50), nullable=False)
     surname: Mapped[str] = mapped_column(String(50), nullable=True)
     email: Mapped[str] = mapped_column(String(254), unique=True, nullable=False)
+    version_id: Mapped[int] = mapped_column(nullable=False, server_default="1")
 
     librarian: Mapped["Librarian"] = relationship(back_populates="person", cascade="all, delete")
     reader: Mapped["Reader"] = relationship(back_populates="person", cascade="all, delete")
+
+    __mapper_args__ = {"version_id_col": version_id}
@@ -0,0 +1,16 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class ReaderLoanStat(Base):
+    reader_id: Mapped[int] = mapped_column(ForeignKey('readers.id', ondelete='CASCADE'), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    loans: Mapped[int] = mapped_column(nullable=False)
+
+    __table_args__ = (
+        Index("ix_readerloanstats_day_reader_id", "day", "reader_id", unique=True),
+    )
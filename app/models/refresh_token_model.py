@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class RefreshToken(Base):
+    librarian_id: Mapped[int] = mapped_column(ForeignKey('librarians.id', ondelete='CASCADE'), index=True, nullable=False)
+    # Every rotation of one login shares the family, so a replayed token can revoke the whole chain
+    family_id: Mapped[str] = mapped_column(String(32), index=True, nullable=False)
+    # HMAC-SHA256 of the token; the token itself is never stored
+    token_digest: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
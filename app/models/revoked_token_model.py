@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, String, TIMESTAMP, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base_model import Base
+
+
+class RevokedToken(Base):
+    # NULL revokes every access token of the librarian issued up to created_at
+    jti: Mapped[Optional[str]] = mapped_column(String(32), unique=True, nullable=True)
+    librarian_id: Mapped[int] = mapped_column(ForeignKey('librarians.id', ondelete='CASCADE'), nullable=False)
+    # Once every token this row covers has expired, the row can be dropped
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), index=True, nullable=False)
+
+    __table_args__ = (
+        # Incremental loads of the per-worker denylist filter
+        Index("ix_revokedtokens_created_at", "created_at"),
+        Index(
+            "ix_revokedtokens_librarian_all",
+            "librarian_id", "created_at",
+            postgresql_where=text("jti IS NULL")
+        ),
+    )
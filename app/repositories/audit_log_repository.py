@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import AuditLog
+
+
+class AuditLogRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> int:
+        try:
+            # A single INSERT ... VALUES (...), (...) for the whole batch
+            self.db.execute(insert(AuditLog).values(entries))
+            self.db.flush()
+            return len(entries)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when writing audit log: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Audit log write error: {str(e)}")
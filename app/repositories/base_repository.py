@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Generic, TypeVar
+from typing import Any, List, Generic, Sequence, Tuple, Type, TypeVar
 from pydantic import BaseModel
+from sqlalchemy import any_, exists, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 from app.models import Base
 
 ModelType = TypeVar('ModelType', bound=Base)
@@ -8,7 +11,63 @@ CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
 UpdateSchemaType = TypeVar('UpdateSchemaType', bound=BaseModel)
 
 
-class AbstractBaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+class BaseRepository(Generic[ModelType]):
+    """Existence, count and batch lookups that never load more than they return.
+
+    Filters are ``column=value`` equality pairs on ``model``. ``exists`` and ``count`` compile to
+    ``SELECT EXISTS(...)`` and ``SELECT count(*)``, so no row is transferred or added to the
+    identity map.
+    """
+
+    model: Type[ModelType]
+    db: Session
+
+    def exists(self, **filters: Any) -> bool:
+        try:
+            statement = select(exists().where(*self._where(filters)))
+            return self.db.execute(statement).scalar_one()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error when checking {self._entity} existence: {str(e)}")
+        except Exception as e:
+            raise ValueError(f"Unexpected error when checking {self._entity} existence: {str(e)}")
+
+    def count(self, **filters: Any) -> int:
+        try:
+            statement = select(func.count()).select_from(self.model).where(*self._where(filters))
+            return self.db.execute(statement).scalar_one()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error when counting {self._entity}s: {str(e)}")
+        except Exception as e:
+            raise ValueError(f"Unexpected error when counting {self._entity}s: {str(e)}")
+
+    def get_many(self, ids: Sequence[int]) -> Tuple[List[ModelType], List[int]]:
+        """Rows for ``ids`` in request order, plus the ids that were not found; one ``= ANY`` query."""
+        try:
+            statement = (
+                select(self.model)
+                .options(*self._get_many_options())
+                .where(self.model.id == any_(list(ids)))
+            )
+            found = {row.id: row for row in self.db.execute(statement).scalars()}
+            return [found[id] for id in ids if id in found], [id for id in ids if id not in found]
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error when getting {self._entity}s by ids: {str(e)}")
+        except Exception as e:
+            raise ValueError(f"Unexpected error when getting {self._entity}s by ids: {str(e)}")
+
+    def _get_many_options(self) -> Sequence[Any]:
+        """Loader options for ``get_many``, e.g. relationships every caller needs."""
+        return ()
+
+    def _where(self, filters: dict) -> List[Any]:
+        return [getattr(self.model, column) == value for column, value in filters.items()]
+
+    @property
+    def _entity(self) -> str:
+        return self.model.__name__.lower()
+
+
+class AbstractBaseRepository(BaseRepository[ModelType], ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     @abstractmethod
     def create(self, data: CreateSchemaType) -> ModelType:
         raise NotImplementedError
@@ -0,0 +1,112 @@
+from typing import List, Optional
+
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import BookCopy
+from app.models.book_copy_model import COPY_AVAILABLE, COPY_ON_LOAN
+from app.repositories.base_repository import BaseRepository
+from app.schemas.book_copy_schema import BookCopyCreate
+
+
+class BookCopyRepository(BaseRepository[BookCopy]):
+    """Per-copy stock.
+
+    `claim_available` and `set_status` run inside a borrow, return or hold change and are
+    committed by that operation's unit of work, so the copy's row lock lasts exactly as long as
+    the loan transaction.
+    """
+
+    model = BookCopy
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, book_id: int, data: BookCopyCreate) -> BookCopy:
+        try:
+            copy = BookCopy(book_id=book_id, **data.model_dump())
+            self.db.add(copy)
+            self.db.flush()
+            self.db.refresh(copy)
+            return copy
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Database integrity error when creating book copy: {str(e)}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when creating book copy: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book copy create error: {str(e)}")
+
+    def get_by_book(self, book_id: int) -> List[BookCopy]:
+        try:
+            statement = select(BookCopy).where(BookCopy.book_id == book_id).order_by(BookCopy.id)
+            return list(self.db.execute(statement).scalars().all())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting book copies: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book copy retrieval error: {str(e)}")
+
+    def exists_by_barcode(self, barcode: str) -> bool:
+        return self.exists(barcode=barcode)
+
+    def has_copies(self, book_id: int) -> bool:
+        try:
+            statement = select(exists().where(BookCopy.book_id == book_id))
+            return self.db.execute(statement).scalar_one()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when checking book copies: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book copy existence check error: {str(e)}")
+
+    def claim_available(self, book_id: int) -> Optional[int]:
+        """Mark one free copy of the title as on loan and return its id, or None if none is free.
+
+        SKIP LOCKED makes concurrent checkouts of the same title take different copies instead of
+        queueing on one row.
+        """
+        try:
+            free_copy = (
+                select(BookCopy.id)
+                .where(BookCopy.book_id == book_id, BookCopy.status == COPY_AVAILABLE)
+                .order_by(BookCopy.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            statement = (
+                update(BookCopy)
+                .where(BookCopy.id == free_copy)
+                .values(status=COPY_ON_LOAN)
+                .returning(BookCopy.id)
+                .execution_options(synchronize_session=False)
+            )
+            return self.db.execute(statement).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when claiming book copy: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book copy claim error: {str(e)}")
+
+    def set_status(self, copy_id: int, status: str) -> None:
+        try:
+            statement = (
+                update(BookCopy)
+                .where(BookCopy.id == copy_id)
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.execute(statement)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when updating book copy: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book copy update error: {str(e)}")
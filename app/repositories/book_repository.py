@@ -1,28 +1,61 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import CompoundSelect, Select, exists, func, lambda_stmt, or_, select, union, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.models import Book
+from app.models import Book, BookCopy
+from app.models.book_copy_model import COPY_AVAILABLE
+from app.models.book_model import ISBN_CONSTRAINT
 from app.models.borrowed_book_model import BorrowedBook
 from app.repositories.base_repository import AbstractBaseRepository
-from app.schemas.book_schema import BookCreate, BookUpdate
+from app.schemas.book_schema import BookCreate, BookFilter, BookUpdate
+from app.utils.cache import LocalCache, attach, detached_snapshot
+from app.utils.cache_invalidation import BOOK_CACHE, publish_invalidation
+from app.utils.exceptions import PreconditionFailedError, violated_constraint
+
+# Browse sort keys; the id tie-breaker keeps the order stable and matches the composite indexes
+BOOK_SORTS = {
+    "id": (Book.id,),
+    "name": (Book.name, Book.id),
+    "year": (Book.year, Book.id),
+    "-year": (Book.year.desc(), Book.id.desc()),
+}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _available_books() -> CompoundSelect:
+    # Shelf count > 0 (see Book.available_copies) as a set of ids: each branch scans one partial
+    # index, ix_books_available and ix_bookcopies_available
+    return union(
+        select(Book.id).where(Book.number_of_copies > 0),
+        select(BookCopy.book_id).where(BookCopy.status == COPY_AVAILABLE)
+    )
 
 
 class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
-    def __init__(self, db: Session):
+    model = Book
+
+    def __init__(self, db: Session, cache: Optional[LocalCache] = None):
         self.db = db
+        # Catalog reads by id; every write below evicts the book after flushing
+        self.cache = cache
 
     def create(self, data: BookCreate) -> Book:
         try:
             book = Book(**data.model_dump())
             self.db.add(book)
-            self.db.commit()
+            self.db.flush()
             self.db.refresh(book)
             return book
         except IntegrityError as e:
             self.db.rollback()
+            if violated_constraint(e) == ISBN_CONSTRAINT:
+                raise ValueError("Book with this ISBN already exists")
             raise ValueError(f"Database integrity error when creating book: {str(e)}")
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -31,7 +64,9 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
             self.db.rollback()
             raise ValueError(f"Book creation error: {str(e)}")
 
-    def update(self, id: int, data: BookUpdate) -> Book:
+    def update(self, id: int, data: BookUpdate, expected_version: Optional[int] = None) -> Book:
+        if expected_version is not None:
+            return self._update_if_version(id, data, expected_version)
         try:
             book = self.db.get(Book, id)
             if book is None:
@@ -44,9 +79,19 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
             for key, value in book_data.items():
                 setattr(book, key, value)
 
-            self.db.commit()
+            publish_invalidation(self.db, BOOK_CACHE, id)
+            self.db.flush()
+            self._evict(id)
             self.db.refresh(book)
             return book
+        except ValueError:
+            raise
+        except StaleDataError:
+            self.db.rollback()
+            raise PreconditionFailedError(f"Book with id {id} was modified by another request")
+        except IntegrityError as e:
+            self.db.rollback()
+            self._raise_integrity_error(e)
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ValueError(f"Database error when updating book: {str(e)}")
@@ -54,6 +99,50 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
             self.db.rollback()
             raise ValueError(f"Book update error: {str(e)}")
 
+    def _update_if_version(self, id: int, data: BookUpdate, expected_version: int) -> Book:
+        try:
+            book_data = data.model_dump(exclude_unset=True)
+            if book_data.get("number_of_copies") is not None and book_data["number_of_copies"] < 0:
+                raise ValueError(f"Number of copies {book_data['number_of_copies']} must be positive")
+
+            # One conditional statement: it either applies the edit or proves the client's copy is stale
+            statement = (
+                update(Book)
+                .where(Book.id == id, Book.version_id == expected_version)
+                .values(**book_data, version_id=Book.version_id + 1, updated_at=func.now())
+                .returning(Book)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            book = self.db.execute(statement).scalar_one_or_none()
+            if book is None:
+                self.db.rollback()
+                if self.db.get(Book, id) is None:
+                    raise ValueError(f"Book with id {id} not found")
+                raise PreconditionFailedError(f"Book with id {id} was modified by another request")
+
+            publish_invalidation(self.db, BOOK_CACHE, id)
+            self.db.flush()
+            self._evict(id)
+            return book
+        except ValueError:
+            raise
+        except IntegrityError as e:
+            self.db.rollback()
+            self._raise_integrity_error(e)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when updating book: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book update error: {str(e)}")
+
+    @staticmethod
+    def _raise_integrity_error(error: IntegrityError) -> None:
+        # The unique constraint is the ISBN check: no separate lookup before the write
+        if violated_constraint(error) == ISBN_CONSTRAINT:
+            raise ValueError("Another book with this ISBN already exists")
+        raise ValueError(f"Database integrity error when updating book: {str(error)}")
+
     def delete(self, id: int) -> bool:
         try:
             book = self.db.get(Book, id)
@@ -61,7 +150,9 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
                 return False
 
             self.db.delete(book)
-            self.db.commit()
+            publish_invalidation(self.db, BOOK_CACHE, id)
+            self.db.flush()
+            self._evict(id)
             return True
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -72,7 +163,8 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
 
     def get_by_id(self, id: int) -> Optional[Book]:
         try:
-            statement = select(Book).where(Book.id == id)
+            # Hot path: the lambda's statement is built and cache-keyed once, later calls only bind `id`
+            statement = lambda_stmt(lambda: select(Book).where(Book.id == id))
             return self.db.execute(statement).scalar_one_or_none()
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -81,9 +173,25 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
             self.db.rollback()
             raise ValueError(f"Book retrieval error: {str(e)}")
 
-    def get_all(self) -> List[Book]:
+    def get_cached_by_id(self, id: int) -> Optional[Book]:
+        """``get_by_id`` for read-only catalog lookups, answered from the cache when possible."""
+        if self.cache is not None:
+            cached = self.cache.get(id)
+            if cached is not None:
+                return attach(self.db, cached)
+
+        book = self.get_by_id(id)
+        if book is not None and self.cache is not None:
+            self.cache.set(id, detached_snapshot(book))
+        return book
+
+    def _evict(self, id: int) -> None:
+        if self.cache is not None:
+            self.cache.delete(id)
+
+    def get_all(self, filters: Optional[BookFilter] = None) -> List[Book]:
         try:
-            statement = select(Book)
+            statement = self._browse(select(Book), filters)
             return list(self.db.execute(statement).scalars().unique())
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -92,10 +200,57 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
             self.db.rollback()
             raise ValueError(f"Book retrieval error: {str(e)}")
 
+    def get_projected_by_id(self, id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        try:
+            statement = select(*(getattr(Book, field) for field in fields)).where(Book.id == id)
+            row = self.db.execute(statement).mappings().one_or_none()
+            return dict(row) if row is not None else None
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when retrieving book: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book retrieval error: {str(e)}")
+
+    def get_all_projected(self, fields: Sequence[str], filters: Optional[BookFilter] = None) -> List[Dict[str, Any]]:
+        try:
+            # A Core select of just the requested columns: no ORM identity map, no unused column I/O
+            statement = self._browse(select(*(getattr(Book, field) for field in fields)), filters)
+            return [dict(row) for row in self.db.execute(statement).mappings()]
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when retrieving books: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Book retrieval error: {str(e)}")
+
+    @staticmethod
+    def _browse(statement: Select, filters: Optional[BookFilter]) -> Select:
+        """Adds the catalog filters, sort and limit; each combination is served by an index on books."""
+        if filters is None:
+            return statement
+        if filters.author is not None:
+            statement = statement.where(Book.author == filters.author)
+        if filters.year_from is not None:
+            statement = statement.where(Book.year >= filters.year_from)
+        if filters.year_to is not None:
+            statement = statement.where(Book.year <= filters.year_to)
+        if filters.available is True:
+            statement = statement.where(Book.id.in_(_available_books()))
+        elif filters.available is False:
+            statement = statement.where(Book.id.not_in(_available_books()))
+        if filters.isbn_prefix:
+            statement = statement.where(Book.isbn.like(_escape_like(filters.isbn_prefix) + "%", escape="\\"))
+        statement = statement.order_by(*BOOK_SORTS[filters.sort])
+        if filters.limit is not None:
+            statement = statement.limit(filters.limit)
+        return statement
+
     def is_book_available(self, book_id: int) -> bool:
         try:
-            book = self.db.get(Book, book_id)
-            return book and book.number_of_copies > 0
+            has_free_copy = exists().where(BookCopy.book_id == book_id, BookCopy.status == COPY_AVAILABLE)
+            statement = select(or_(Book.number_of_copies > 0, has_free_copy)).where(Book.id == book_id)
+            return bool(self.db.execute(statement).scalar_one_or_none())
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ValueError(f"Database error when checking book: {str(e)}")
@@ -112,7 +267,9 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
                 raise ValueError("Cannot decrease copies - no copies available")
 
             book.number_of_copies -= 1
-            self.db.commit()
+            publish_invalidation(self.db, BOOK_CACHE, book_id)
+            self.db.flush()
+            self._evict(book_id)
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ValueError(f"Database error when decreasing book copies: {str(e)}")
@@ -127,7 +284,9 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
                 raise ValueError(f"Book with id {book_id} not found")
 
             book.number_of_copies += 1
-            self.db.commit()
+            publish_invalidation(self.db, BOOK_CACHE, book_id)
+            self.db.flush()
+            self._evict(book_id)
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ValueError(f"Database error when increasing book copies: {str(e)}")
@@ -135,46 +294,6 @@ class BookRepository(AbstractBaseRepository[Book, BookCreate, BookUpdate]):
             self.db.rollback()
             raise ValueError(f"Unexpected error when increasing book copies: {str(e)}")
 
-    def exists(self, id: int) -> bool:
-        try:
-            statement = select(Book).where(Book.id == id)
-            return self.db.execute(statement).scalar_one_or_none() is not None
-        except SQLAlchemyError as e:
-            self.db.rollback()
-            raise ValueError(f"Database error when checking book existence: {str(e)}")
-        except Exception as e:
-            self.db.rollback()
-            raise ValueError(f"Book existence check error: {str(e)}")
-
-    def exists_by_isbn(self, isbn: str) -> bool:
-        try:
-            statement = select(Book).where(Book.isbn == isbn)
-            return self.db.execute(statement).scalar_one_or_none() is not None
-        except SQLAlchemyError as e:
-            self.db.rollback()
-            raise ValueError(f"Database error when checking ISBN existence: {str(e)}")
-        except Exception as e:
-            self.db.rollback()
-            raise ValueError(f"ISBN existence check error: {str(e)}")
-
-    def isbn_exists_except_current(self, isbn: str, current_id: int) -> bool:
-        try:
-            statement = select(Book).where(Book.isbn == isbn, Book.id != current_id)
-            return self.db.execute(statement).scalar_one_or_none() is not None
-        except SQLAlchemyError as e:
-            self.db.rollback()
-            raise ValueError(f"Database error when checking ISBN existence: {str(e)}")
-        except Exception as e:
-            self.db.rollback()
-            raise ValueError(f"ISBN existence check error: {str(e)}")
-
     def author_exists(self, author: str) -> bool:
-        try:
-            statement = select(Book).where(Book.author == author).limit(1)
-            return self.db.execute(statement).scalar_one_or_none() is not None
-        except SQLAlchemyError as e:
-            self.db.rollback()
-            raise ValueError(f"Database error when checking author existence: {str(e)}")
-        except Exception as e:
-            self.db.rollback()
-            raise ValueError(f"Author existence check error: {str(e)}")
+        return self.exists(author=author)
+
@@ -1,23 +1,54 @@
-from typing import List, Optional
-from sqlalchemy import and_, select, func
+from datetime import datetime
+from typing import Collection, List, Optional, Tuple
+from sqlalchemy import Row, and_, lambda_stmt, select, func, tuple_
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, noload, selectinload
+from app.models import Librarian, Reader
 from app.models.borrowed_book_model import BorrowedBook
 
+RELATION_LOADERS = {
+    "book": lambda: selectinload(BorrowedBook.book),
+    "reader": lambda: selectinload(BorrowedBook.reader).joinedload(Reader.person),
+    "librarian": lambda: selectinload(BorrowedBook.librarian).joinedload(Librarian.person),
+}
+
+
+def _relation_options(include: Optional[Collection[str]]) -> list:
+    """Batch-load the requested relationships and leave the rest unloaded.
+
+    Each included relationship costs one extra SELECT ... WHERE id IN (...) for the whole result
+    instead of one query per row; excluded ones are never lazy-loaded by serialization.
+    """
+    if include is None:
+        return []
+    return [
+        loader() if name in include else noload(getattr(BorrowedBook, name))
+        for name, loader in RELATION_LOADERS.items()
+    ]
+
 
 class BorrowedBookRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, book_id: int, reader_id: int, librarian_id: int) -> BorrowedBook:
+    def create(
+            self,
+            book_id: int,
+            reader_id: int,
+            librarian_id: int,
+            due_date: datetime,
+            copy_id: Optional[int] = None
+    ) -> BorrowedBook:
         try:
             borrowed_book = BorrowedBook(
                 book_id=book_id,
                 reader_id=reader_id,
-                librarian_id=librarian_id
+                librarian_id=librarian_id,
+                copy_id=copy_id,
+                due_date=due_date
             )
             self.db.add(borrowed_book)
-            self.db.commit()
+            self.db.flush()
             self.db.refresh(borrowed_book)
             return borrowed_book
         except IntegrityError as e:
@@ -30,14 +61,28 @@ class BorrowedBookRepository:
             self.db.rollback()
             raise ValueError(f"Borrowed book create error: {str(e)}")
 
-    def get_active_borrowings(self, reader_id: int) -> List[BorrowedBook]:
+    def get_by_id(self, borrowing_id: int) -> Optional[BorrowedBook]:
+        try:
+            return self.db.get(BorrowedBook, borrowing_id)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting borrowed book: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Borrowed book get by id error: {str(e)}")
+
+    def get_active_borrowings(
+            self,
+            reader_id: int,
+            include: Optional[Collection[str]] = None
+    ) -> List[BorrowedBook]:
         try:
             stmt = select(BorrowedBook).where(
                 and_(
                     BorrowedBook.reader_id == reader_id,
                     BorrowedBook.returned_date.is_(None)
                 )
-            )
+            ).options(*_relation_options(include))
             return list(self.db.execute(stmt).scalars().all())
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -48,13 +93,13 @@ class BorrowedBookRepository:
 
     def get_active_borrowing(self, book_id: int, reader_id: int) -> Optional[BorrowedBook]:
         try:
-            stmt = select(BorrowedBook).where(
+            stmt = lambda_stmt(lambda: select(BorrowedBook).where(
                 and_(
                     BorrowedBook.book_id == book_id,
                     BorrowedBook.reader_id == reader_id,
                     BorrowedBook.returned_date.is_(None)
                 )
-            )
+            ))
             return self.db.execute(stmt).scalar_one_or_none()
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -63,9 +108,9 @@ class BorrowedBookRepository:
             self.db.rollback()
             raise ValueError(f"Borrowed book get active borrowing error: {str(e)}")
 
-    def get_all_borrowings(self) -> List[BorrowedBook]:
+    def get_all_borrowings(self, include: Optional[Collection[str]] = None) -> List[BorrowedBook]:
         try:
-            stmt = select(BorrowedBook)
+            stmt = select(BorrowedBook).options(*_relation_options(include))
             return self.db.execute(stmt).scalars().all()
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -79,7 +124,7 @@ class BorrowedBookRepository:
             borrowing = self.db.get(BorrowedBook, borrowing_id)
             if borrowing:
                 borrowing.returned_date = func.now()
-                self.db.commit()
+                self.db.flush()
                 self.db.refresh(borrowing)
             return borrowing
         except SQLAlchemyError as e:
@@ -89,6 +134,84 @@ class BorrowedBookRepository:
             self.db.rollback()
             raise ValueError(f"Borrowed book mark error: {str(e)}")
 
+    def renew(self, borrowing_id: int, due_date: datetime) -> BorrowedBook:
+        try:
+            borrowing = self.db.get(BorrowedBook, borrowing_id)
+            if borrowing is None:
+                raise ValueError(f"Borrowing with id {borrowing_id} not found")
+
+            borrowing.due_date = due_date
+            borrowing.renewal_count += 1
+            self.db.flush()
+            self.db.refresh(borrowing)
+            return borrowing
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when renewing borrowed book: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Borrowed book renew error: {str(e)}")
+
+    def get_overdue(
+            self,
+            now: datetime,
+            limit: int,
+            after: Optional[Tuple[datetime, int]] = None
+    ) -> List[BorrowedBook]:
+        try:
+            # Matches ix_borrowedbooks_open_due_date: the predicate and the (due_date, id) order come
+            # straight from the partial index, so each page is a bounded index range scan
+            stmt = select(BorrowedBook).where(
+                BorrowedBook.returned_date.is_(None),
+                BorrowedBook.due_date < now
+            )
+            if after is not None:
+                stmt = stmt.where(tuple_(BorrowedBook.due_date, BorrowedBook.id) > tuple_(*after))
+            stmt = stmt.order_by(BorrowedBook.due_date, BorrowedBook.id).limit(limit)
+            return list(self.db.execute(stmt).scalars().all())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting overdue borrowed books: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Borrowed book get overdue error: {str(e)}")
+
+    def get_reader_history(
+            self,
+            reader_id: int,
+            limit: int,
+            after: Optional[Tuple[datetime, int]] = None,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None
+    ) -> List[Row]:
+        try:
+            # Only columns stored in ix_borrowedbooks_reader_history are projected, newest first
+            stmt = select(
+                BorrowedBook.id,
+                BorrowedBook.book_id,
+                BorrowedBook.reader_id,
+                BorrowedBook.librarian_id,
+                BorrowedBook.copy_id,
+                BorrowedBook.borrowed_date,
+                BorrowedBook.due_date,
+                BorrowedBook.returned_date,
+                BorrowedBook.renewal_count
+            ).where(BorrowedBook.reader_id == reader_id)
+            if date_from is not None:
+                stmt = stmt.where(BorrowedBook.borrowed_date >= date_from)
+            if date_to is not None:
+                stmt = stmt.where(BorrowedBook.borrowed_date < date_to)
+            if after is not None:
+                stmt = stmt.where(tuple_(BorrowedBook.borrowed_date, BorrowedBook.id) < tuple_(*after))
+            stmt = stmt.order_by(BorrowedBook.borrowed_date.desc(), BorrowedBook.id.desc()).limit(limit)
+            return list(self.db.execute(stmt).all())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting reader history: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Borrowed book get reader history error: {str(e)}")
+
     def has_active_borrows_for_book(self, book_id: int) -> bool:
         try:
             statement = select(BorrowedBook).where(
@@ -0,0 +1,76 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import Integer, and_, cast, extract, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import Fine
+from app.models.borrowed_book_model import BorrowedBook
+
+
+class FineRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def accrue(self, now: datetime, since: Optional[datetime], fine_per_day: Decimal, max_fine: Decimal) -> int:
+        """Upsert fines for every overdue loan in one INSERT ... SELECT ... ON CONFLICT statement.
+
+        Open overdue loans are always recomputed because their fine grows every day; returned loans
+        are only revisited when they changed after `since`. Running it twice for the same `now`
+        leaves the table unchanged, so a failed run can simply be repeated.
+        """
+        try:
+            end_date = func.coalesce(BorrowedBook.returned_date, now)
+            days_overdue = cast(func.floor(extract('epoch', end_date - BorrowedBook.due_date) / 86400), Integer)
+            amount = func.least(days_overdue * literal(fine_per_day), literal(max_fine))
+
+            changed = and_(BorrowedBook.returned_date.is_(None), BorrowedBook.due_date < now)
+            if since is not None:
+                changed = or_(changed, BorrowedBook.updated_at > since)
+
+            source = select(
+                BorrowedBook.id,
+                BorrowedBook.reader_id,
+                days_overdue,
+                amount
+            ).where(changed, days_overdue > 0)
+
+            statement = insert(Fine).from_select(
+                ["borrowing_id", "reader_id", "days_overdue", "amount"],
+                source
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[Fine.borrowing_id],
+                set_={
+                    "days_overdue": statement.excluded.days_overdue,
+                    "amount": statement.excluded.amount,
+                    "updated_at": statement.excluded.updated_at,
+                },
+                # days_overdue keeps counting after the amount reaches max_fine
+                where=tuple_(Fine.amount, Fine.days_overdue).is_distinct_from(
+                    tuple_(statement.excluded.amount, statement.excluded.days_overdue)
+                )
+            )
+            result = self.db.execute(statement)
+            self.db.flush()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when accruing fines: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Fine accrual error: {str(e)}")
+
+    def get_by_reader(self, reader_id: int) -> List[Fine]:
+        try:
+            statement = select(Fine).where(Fine.reader_id == reader_id).order_by(Fine.id)
+            return list(self.db.execute(statement).scalars().all())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting fines: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Fine get by reader error: {str(e)}")
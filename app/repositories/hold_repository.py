@@ -0,0 +1,185 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import Hold
+from app.models.hold_model import HOLD_READY, HOLD_WAITING
+
+
+class HoldRepository:
+    """Hold queue storage.
+
+    Like every repository it only flushes: a return, borrow, cancel or expiry is committed by the
+    unit of work it runs in.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, book_id: int, reader_id: int) -> Hold:
+        try:
+            hold = Hold(book_id=book_id, reader_id=reader_id, status=HOLD_WAITING)
+            self.db.add(hold)
+            self.db.flush()
+            self.db.refresh(hold)
+            return hold
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Database integrity error when creating hold: {str(e)}")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when creating hold: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold create error: {str(e)}")
+
+    def get_by_id(self, hold_id: int) -> Optional[Hold]:
+        try:
+            return self.db.get(Hold, hold_id)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting hold: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold get by id error: {str(e)}")
+
+    def get_open_hold(self, book_id: int, reader_id: int) -> Optional[Hold]:
+        try:
+            statement = select(Hold).where(
+                Hold.book_id == book_id,
+                Hold.reader_id == reader_id,
+                Hold.status.in_((HOLD_WAITING, HOLD_READY))
+            )
+            return self.db.execute(statement).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting hold: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold retrieval error: {str(e)}")
+
+    def get_by_reader_with_positions(self, reader_id: int) -> List[Tuple[Hold, Optional[int]]]:
+        """The reader's open holds, each with its 1-based queue position (None once ready).
+
+        One statement: a ``row_number()`` window over the waiting holds of the books the reader is
+        queued for, read along the queue index, instead of a ``get_position`` query per hold.
+        """
+        try:
+            queued_books = select(Hold.book_id).where(Hold.reader_id == reader_id, Hold.status == HOLD_WAITING)
+            queue = (
+                select(
+                    Hold.id,
+                    func.row_number().over(
+                        partition_by=Hold.book_id,
+                        order_by=(Hold.created_at, Hold.id)
+                    ).label("position")
+                )
+                .where(Hold.status == HOLD_WAITING, Hold.book_id.in_(queued_books))
+                .subquery()
+            )
+            statement = (
+                select(Hold, queue.c.position)
+                .outerjoin(queue, queue.c.id == Hold.id)
+                .where(Hold.reader_id == reader_id, Hold.status.in_((HOLD_WAITING, HOLD_READY)))
+                .order_by(Hold.created_at)
+            )
+            return [(hold, position) for hold, position in self.db.execute(statement).all()]
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting reader holds: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold retrieval error: {str(e)}")
+
+    def get_position(self, hold: Hold) -> int:
+        """1-based place of a waiting hold in its book's queue, counted on the queue index."""
+        try:
+            statement = select(func.count()).select_from(Hold).where(
+                Hold.book_id == hold.book_id,
+                Hold.status == HOLD_WAITING,
+                or_(
+                    Hold.created_at < hold.created_at,
+                    and_(Hold.created_at == hold.created_at, Hold.id < hold.id)
+                )
+            )
+            return self.db.execute(statement).scalar_one() + 1
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting hold position: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold position error: {str(e)}")
+
+    def allocate_next(self, book_id: int, ready_until: datetime, copy_id: Optional[int] = None) -> Optional[Hold]:
+        try:
+            # SKIP LOCKED: a concurrent return of the same title takes the next hold instead of waiting
+            statement = (
+                select(Hold)
+                .where(Hold.book_id == book_id, Hold.status == HOLD_WAITING)
+                .order_by(Hold.created_at, Hold.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            hold = self.db.execute(statement).scalar_one_or_none()
+            if hold is None:
+                return None
+
+            hold.status = HOLD_READY
+            hold.ready_until = ready_until
+            hold.copy_id = copy_id
+            self.db.flush()
+            return hold
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when allocating hold: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold allocation error: {str(e)}")
+
+    def get_ready_hold(self, book_id: int, reader_id: int, now: datetime) -> Optional[Hold]:
+        try:
+            statement = select(Hold).where(
+                Hold.book_id == book_id,
+                Hold.reader_id == reader_id,
+                Hold.status == HOLD_READY,
+                Hold.ready_until >= now
+            ).with_for_update()
+            return self.db.execute(statement).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting ready hold: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold retrieval error: {str(e)}")
+
+    def get_next_expired_ready(self, now: datetime) -> Optional[Hold]:
+        try:
+            statement = (
+                select(Hold)
+                .where(Hold.status == HOLD_READY, Hold.ready_until < now)
+                .order_by(Hold.ready_until)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            return self.db.execute(statement).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting expired holds: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold retrieval error: {str(e)}")
+
+    def set_status(self, hold: Hold, status: str) -> Hold:
+        try:
+            hold.status = status
+            self.db.flush()
+            return hold
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when updating hold: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Hold update error: {str(e)}")
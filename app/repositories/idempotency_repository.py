@@ -0,0 +1,106 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import IdempotencyKey
+
+
+class IdempotencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(
+            self,
+            scope: str,
+            key: str,
+            request_hash: str,
+            expires_at: datetime,
+            locked_until: datetime
+    ) -> Optional[IdempotencyKey]:
+        """Reserve a key for a new request.
+
+        Returns None when the caller now owns the key (it was unused, had expired, or was left in
+        progress past ``locked_until`` by a worker that died), otherwise the existing record, which
+        is either finished and replayable or still in progress.
+        """
+        try:
+            statement = insert(IdempotencyKey).values(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                expires_at=expires_at,
+                locked_until=locked_until
+            )
+            statement = statement.on_conflict_do_update(
+                constraint="uq_idempotencykeys_scope_key",
+                set_={
+                    "request_hash": statement.excluded.request_hash,
+                    "status_code": None,
+                    "content_type": None,
+                    "response_body": None,
+                    "response_headers": None,
+                    "expires_at": statement.excluded.expires_at,
+                    "locked_until": statement.excluded.locked_until,
+                    "updated_at": func.now(),
+                },
+                where=or_(
+                    IdempotencyKey.expires_at < func.now(),
+                    and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_until < func.now())
+                )
+            ).returning(IdempotencyKey.id)
+            claimed = self.db.execute(statement).scalar_one_or_none()
+            self.db.flush()
+            if claimed is not None:
+                return None
+
+            statement = select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            return self.db.execute(statement).scalar_one()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when claiming idempotency key: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Idempotency key claim error: {str(e)}")
+
+    def complete(
+            self,
+            scope: str,
+            key: str,
+            status_code: int,
+            content_type: Optional[str],
+            body: bytes,
+            headers: Optional[List[List[str]]] = None
+    ) -> None:
+        try:
+            statement = update(IdempotencyKey).where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key
+            ).values(status_code=status_code, content_type=content_type, response_body=body, response_headers=headers)
+            self.db.execute(statement)
+            self.db.flush()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when storing idempotent response: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Idempotency key complete error: {str(e)}")
+
+    def release(self, scope: str, key: str) -> None:
+        try:
+            statement = delete(IdempotencyKey).where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None)
+            )
+            self.db.execute(statement)
+            self.db.flush()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when releasing idempotency key: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Idempotency key release error: {str(e)}")
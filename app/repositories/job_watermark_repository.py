@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import JobWatermark
+
+
+class JobWatermarkRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str) -> Optional[datetime]:
+        try:
+            statement = select(JobWatermark.last_run_at).where(JobWatermark.name == name)
+            return self.db.execute(statement).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting job watermark: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Job watermark get error: {str(e)}")
+
+    def set(self, name: str, last_run_at: datetime) -> None:
+        try:
+            statement = insert(JobWatermark).values(name=name, last_run_at=last_run_at)
+            statement = statement.on_conflict_do_update(
+                index_elements=[JobWatermark.name],
+                set_={"last_run_at": statement.excluded.last_run_at, "updated_at": statement.excluded.updated_at}
+            )
+            self.db.execute(statement)
+            self.db.flush()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when setting job watermark: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Job watermark set error: {str(e)}")
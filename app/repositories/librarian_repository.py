@@ -1,18 +1,25 @@
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select, update
 from sqlalchemy.orm import Session
 
 from app.models.librarian_model import Librarian
-from app.models.person_model import Person
+from app.models.person_model import EMAIL_CONSTRAINT, Person
 from app.repositories.base_repository import AbstractBaseRepository
 from app.schemas.librarian_schema import LibrarianRepoCreate, LibrarianRepoUpdate
+from app.utils.cache import LocalCache, attach, detached_snapshot
+from app.utils.cache_invalidation import PRINCIPAL_CACHE, publish_invalidation
+from app.utils.exceptions import violated_constraint
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 
 class LibrarianRepository(AbstractBaseRepository[Librarian, LibrarianRepoCreate, LibrarianRepoUpdate]):
-    def __init__(self, db: Session):
+    model = Librarian
+
+    def __init__(self, db: Session, cache: Optional[LocalCache] = None):
         self.db = db
+        # Principals for authentication, keyed by librarian id
+        self.cache = cache
 
     def create(self, data: LibrarianRepoCreate) -> Librarian:
         try:
@@ -24,11 +31,13 @@ class LibrarianRepository(AbstractBaseRepository[Librarian, LibrarianRepoCreate,
             )
 
             self.db.add(librarian)
-            self.db.commit()
+            self.db.flush()
             self.db.refresh(librarian)
             return librarian
         except IntegrityError as e:
             self.db.rollback()
+            if violated_constraint(e) == EMAIL_CONSTRAINT:
+                raise ValueError("Email already in use")
             raise ValueError(f"Database integrity error when creating librarian: {str(e)}")
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -48,9 +57,16 @@ class LibrarianRepository(AbstractBaseRepository[Librarian, LibrarianRepoCreate,
                 for key, value in person_data.items():
                     setattr(librarian.person, key, value)
 
-            self.db.commit()
+            publish_invalidation(self.db, PRINCIPAL_CACHE, id)
+            self.db.flush()
+            self._evict(id)
             self.db.refresh(librarian)
             return librarian
+        except IntegrityError as e:
+            self.db.rollback()
+            if violated_constraint(e) == EMAIL_CONSTRAINT:
+                raise ValueError("New email already in use")
+            raise ValueError(f"Database integrity error when updating librarian: {str(e)}")
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ValueError(f"Database error when updating librarian: {str(e)}")
@@ -66,7 +82,9 @@ class LibrarianRepository(AbstractBaseRepository[Librarian, LibrarianRepoCreate,
 
             self.db.delete(librarian.person)
             self.db.delete(librarian)
-            self.db.commit()
+            publish_invalidation(self.db, PRINCIPAL_CACHE, id)
+            self.db.flush()
+            self._evict(id)
             return True
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -82,7 +100,9 @@ class LibrarianRepository(AbstractBaseRepository[Librarian, LibrarianRepoCreate,
                 raise ValueError(f"Librarian with id {id} not found")
 
             librarian.hash_password = hashed_password
-            self.db.commit()
+            publish_invalidation(self.db, PRINCIPAL_CACHE, id)
+            self.db.flush()
+            self._evict(id)
             self.db.refresh(librarian)
             return librarian
         except SQLAlchemyError as e:
@@ -92,18 +112,55 @@ class LibrarianRepository(AbstractBaseRepository[Librarian, LibrarianRepoCreate,
             self.db.rollback()
             raise ValueError(f"Librarian change password error: {str(e)}")
 
+    def update_password_hash(self, id: int, current_hash: str, new_hash: str) -> bool:
+        """Swaps the stored hash only if it is still ``current_hash``, so a rehash
+        never overwrites a password changed in the meantime."""
+        try:
+            statement = (
+                update(Librarian)
+                .where(Librarian.id == id, Librarian.hash_password == current_hash)
+                .values(hash_password=new_hash)
+            )
+            updated = self.db.execute(statement).rowcount
+            publish_invalidation(self.db, PRINCIPAL_CACHE, id)
+            self.db.flush()
+            self._evict(id)
+            return updated == 1
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when updating password hash for librarian: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Librarian update password hash error: {str(e)}")
+
     def get_by_id(self, id: int) -> Optional[Librarian]:
         try:
-            statement = select(Librarian).join(Person).where(Librarian.id == id)
+            statement = lambda_stmt(lambda: select(Librarian).join(Person).where(Librarian.id == id))
             return self.db.execute(statement).scalar_one_or_none()
         except SQLAlchemyError as e:
             raise SQLAlchemyError(f"Database error when getting librarian: {str(e)}") from e
         except Exception as e:
             raise Exception(f"Unexpected error getting librarian: {str(e)}") from e
 
+    def get_principal(self, id: int) -> Optional[Librarian]:
+        """``get_by_id`` for authenticating a request, answered from the cache when possible."""
+        if self.cache is not None:
+            cached = self.cache.get(id)
+            if cached is not None:
+                return attach(self.db, cached)
+
+        librarian = self.get_by_id(id)
+        if librarian is not None and self.cache is not None:
+            self.cache.set(id, detached_snapshot(librarian, "person"))
+        return librarian
+
+    def _evict(self, id: int) -> None:
+        if self.cache is not None:
+            self.cache.delete(id)
+
     def get_by_email(self, email: str) -> Optional[Librarian]:
         try:
-            statement = select(Librarian).join(Person).where(Person.email == email)
+            statement = lambda_stmt(lambda: select(Librarian).join(Person).where(Person.email == email))
             librarian = self.db.execute(statement).scalar_one_or_none()
             if librarian:
                 return librarian
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import OutboxEvent
+
+
+class OutboxRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+        """Record a circulation event.
+
+        The event is only flushed and becomes visible together with the change it describes, when
+        the unit of work commits.
+        """
+        try:
+            event = OutboxEvent(event_type=event_type, payload=payload)
+            self.db.add(event)
+            self.db.flush()
+            return event
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when writing outbox event: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Outbox event write error: {str(e)}")
+
+    def get_after(self, last_id: int, limit: int) -> List[OutboxEvent]:
+        try:
+            statement = (
+                select(OutboxEvent)
+                .where(OutboxEvent.id > last_id)
+                .order_by(OutboxEvent.id)
+                .limit(limit)
+            )
+            return list(self.db.execute(statement).scalars().all())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when reading outbox events: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Outbox event read error: {str(e)}")
+
+    def get_last_id(self) -> int:
+        try:
+            return self.db.execute(select(func.coalesce(func.max(OutboxEvent.id), 0))).scalar_one()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when reading outbox position: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Outbox position read error: {str(e)}")
+
+    def purge_before(self, cutoff: datetime) -> int:
+        try:
+            result = self.db.execute(delete(OutboxEvent).where(OutboxEvent.created_at < cutoff))
+            self.db.flush()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when purging outbox events: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Outbox purge error: {str(e)}")
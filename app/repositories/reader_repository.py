@@ -1,16 +1,20 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import exists, lambda_stmt, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.models import Reader
-from app.models.person_model import Person
+from app.models.person_model import EMAIL_CONSTRAINT, Person
 from app.repositories.base_repository import AbstractBaseRepository
 from app.schemas.reader_schema import ReaderUpdate, ReaderCreate
+from app.utils.exceptions import PreconditionFailedError, violated_constraint
 
 
 class ReaderRepository(AbstractBaseRepository[Reader, ReaderCreate, ReaderUpdate]):
+    model = Reader
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -23,11 +27,13 @@ class ReaderRepository(AbstractBaseRepository[Reader, ReaderCreate, ReaderUpdate
             )
 
             self.db.add(reader)
-            self.db.commit()
+            self.db.flush()
             self.db.refresh(reader)
             return reader
         except IntegrityError as e:
             self.db.rollback()
+            if violated_constraint(e) == EMAIL_CONSTRAINT:
+                raise ValueError("Email already in use")
             raise ValueError(f"Database integrity error when creating reader: {str(e)}")
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -36,20 +42,35 @@ class ReaderRepository(AbstractBaseRepository[Reader, ReaderCreate, ReaderUpdate
             self.db.rollback()
             raise ValueError(f"Unexpected error when creating reader: {str(e)}")
 
-    def update(self, id: int, data: ReaderUpdate) -> Reader:
+    def update(self, id: int, data: ReaderUpdate, expected_version: Optional[int] = None) -> Reader:
         try:
             reader = self.db.get(Reader, id)
             if reader is None:
                 raise ValueError(f"Reader with id {id} not found")
 
+            if expected_version is not None and reader.person.version_id != expected_version:
+                raise PreconditionFailedError(f"Reader with id {id} was modified by another request")
+
             if data.person:
                 person_data = data.person.model_dump(exclude_unset=True)
                 for key, value in person_data.items():
                     setattr(reader.person, key, value)
 
-            self.db.commit()
+            self.db.flush()
             self.db.refresh(reader)
             return reader
+        except PreconditionFailedError:
+            self.db.rollback()
+            raise
+        except StaleDataError:
+            # The versioned UPDATE matched no row: someone else saved the person after we loaded it
+            self.db.rollback()
+            raise PreconditionFailedError(f"Reader with id {id} was modified by another request")
+        except IntegrityError as e:
+            self.db.rollback()
+            if violated_constraint(e) == EMAIL_CONSTRAINT:
+                raise ValueError("New email already in use")
+            raise ValueError(f"Database integrity error when updating reader: {str(e)}")
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ValueError(f"Database error when updating reader: {str(e)}")
@@ -73,7 +94,7 @@ class ReaderRepository(AbstractBaseRepository[Reader, ReaderCreate, ReaderUpdate
 
             self.db.delete(reader.person)
             self.db.delete(reader)
-            self.db.commit()
+            self.db.flush()
             return True
         except ValueError as e:
             self.db.rollback()
@@ -87,7 +108,7 @@ class ReaderRepository(AbstractBaseRepository[Reader, ReaderCreate, ReaderUpdate
 
     def get_by_id(self, id: int) -> Optional[Reader]:
         try:
-            statement = select(Reader).join(Person).where(Reader.id == id)
+            statement = lambda_stmt(lambda: select(Reader).join(Person).where(Reader.id == id))
             return self.db.execute(statement).scalar_one_or_none()
         except SQLAlchemyError as e:
             raise ValueError(f"Database error when getting reader by id: {str(e)}")
@@ -96,7 +117,7 @@ class ReaderRepository(AbstractBaseRepository[Reader, ReaderCreate, ReaderUpdate
 
     def get_by_email(self, email: str) -> Optional[Reader]:
         try:
-            statement = select(Reader).join(Person).where(Person.email == email)
+            statement = lambda_stmt(lambda: select(Reader).join(Person).where(Person.email == email))
             return self.db.execute(statement).scalar_one_or_none()
         except SQLAlchemyError as e:
             raise ValueError(f"Database error when getting reader by email: {str(e)}")
@@ -112,9 +133,14 @@ class ReaderRepository(AbstractBaseRepository[Reader, ReaderCreate, ReaderUpdate
         except Exception as e:
             raise ValueError(f"Unexpected error when getting all readers: {str(e)}")
 
+    def _get_many_options(self) -> Sequence[Any]:
+        return (joinedload(Reader.person),)
+
     def reader_exists(self, reader_id: int) -> bool:
+        # Checked by every borrow and hold, so a cached statement rather than the generic exists()
         try:
-            return self.db.get(Reader, reader_id) is not None
+            statement = lambda_stmt(lambda: select(exists().where(Reader.id == reader_id)))
+            return self.db.execute(statement).scalar_one()
         except SQLAlchemyError as e:
             raise ValueError(f"Database error when checking reader existence: {str(e)}")
         except Exception as e:
@@ -0,0 +1,106 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import Librarian, Person, RefreshToken
+
+
+class ConsumedRefreshToken(NamedTuple):
+    librarian_id: int
+    family_id: str
+    email: str
+
+
+class RefreshTokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, librarian_id: int, family_id: str, token_digest: str, expires_at: datetime) -> RefreshToken:
+        try:
+            token = RefreshToken(
+                librarian_id=librarian_id,
+                family_id=family_id,
+                token_digest=token_digest,
+                expires_at=expires_at
+            )
+            self.db.add(token)
+            self.db.flush()
+            return token
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when creating refresh token: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Refresh token creation error: {str(e)}")
+
+    def consume(self, token_digest: str) -> Optional[ConsumedRefreshToken]:
+        """Revokes a live token and returns its owner in one statement.
+
+        The replacement token is inserted and committed in the same unit of work, so a
+        concurrent refresh with the same token finds it already revoked.
+        """
+        try:
+            statement = (
+                update(RefreshToken)
+                .where(
+                    RefreshToken.token_digest == token_digest,
+                    RefreshToken.revoked_at.is_(None),
+                    RefreshToken.expires_at > func.now(),
+                    Librarian.id == RefreshToken.librarian_id,
+                    Person.id == Librarian.person_id
+                )
+                .values(revoked_at=func.now())
+                .returning(RefreshToken.librarian_id, RefreshToken.family_id, Person.email)
+            )
+            row = self.db.execute(statement).one_or_none()
+            return ConsumedRefreshToken(*row) if row else None
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when consuming refresh token: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Refresh token consume error: {str(e)}")
+
+    def get_by_digest(self, token_digest: str) -> Optional[RefreshToken]:
+        try:
+            statement = select(RefreshToken).where(RefreshToken.token_digest == token_digest)
+            return self.db.execute(statement).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error when getting refresh token: {str(e)}")
+
+    def revoke_family(self, family_id: str) -> int:
+        try:
+            statement = (
+                update(RefreshToken)
+                .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=func.now())
+            )
+            revoked = self.db.execute(statement).rowcount
+            self.db.flush()
+            return revoked
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when revoking refresh tokens: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Refresh token revoke error: {str(e)}")
+
+    def revoke_for_librarian(self, librarian_id: int) -> int:
+        try:
+            statement = (
+                update(RefreshToken)
+                .where(RefreshToken.librarian_id == librarian_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=func.now())
+            )
+            revoked = self.db.execute(statement).rowcount
+            self.db.flush()
+            return revoked
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when revoking refresh tokens: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Refresh token revoke error: {str(e)}")
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, exists, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import RevokedToken
+from app.utils.token_denylist import Revocation
+
+
+class RevokedTokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, librarian_id: int, expires_at: datetime, jti: Optional[str] = None) -> None:
+        try:
+            statement = insert(RevokedToken).values(jti=jti, librarian_id=librarian_id, expires_at=expires_at)
+            if jti is not None:
+                # Logging out twice with the same token is not an error
+                statement = statement.on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            self.db.execute(statement)
+            self.db.flush()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when revoking token: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Token revoke error: {str(e)}")
+
+    def get_since(self, since: Optional[datetime]) -> List[Revocation]:
+        try:
+            statement = (
+                select(RevokedToken.jti, RevokedToken.librarian_id, RevokedToken.created_at)
+                .where(RevokedToken.expires_at > func.now())
+                .order_by(RevokedToken.created_at)
+            )
+            if since is not None:
+                statement = statement.where(RevokedToken.created_at > since)
+            return [tuple(row) for row in self.db.execute(statement)]
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error when loading revoked tokens: {str(e)}")
+
+    def is_revoked(self, jti: Optional[str], librarian_id: Optional[int], issued_at: Optional[datetime]) -> bool:
+        try:
+            conditions = []
+            if jti is not None:
+                conditions.append(RevokedToken.jti == jti)
+            if librarian_id is not None and issued_at is not None:
+                conditions.append(and_(
+                    RevokedToken.jti.is_(None),
+                    RevokedToken.librarian_id == librarian_id,
+                    RevokedToken.created_at >= issued_at
+                ))
+            if not conditions:
+                return False
+            return self.db.execute(select(exists().where(or_(*conditions)))).scalar()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Database error when checking token revocation: {str(e)}")
+
+    def purge_expired(self) -> int:
+        try:
+            deleted = self.db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= func.now())).rowcount
+            self.db.flush()
+            return deleted
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when purging revoked tokens: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Revoked token purge error: {str(e)}")
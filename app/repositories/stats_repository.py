@@ -0,0 +1,149 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import Date, and_, cast, delete, func, literal, null, or_, select, union, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import Book, BookLoanStat, DailyLoanStat, ReaderLoanStat
+from app.models.borrowed_book_model import BorrowedBook
+
+
+def _day(column):
+    return cast(func.timezone('UTC', column), Date)
+
+
+def _on_days(column, days: Optional[List[date]]):
+    """Restrict a timestamp column to whole UTC days, as index-friendly range predicates."""
+    if days is None:
+        return column.is_not(None)
+    return or_(*(
+        and_(
+            column >= datetime.combine(day, time.min, tzinfo=timezone.utc),
+            column < datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        )
+        for day in days
+    ))
+
+
+class StatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_touched_days(self, since: datetime) -> List[date]:
+        """Days whose aggregates may have changed because a loan was created or updated after `since`."""
+        try:
+            changed = BorrowedBook.updated_at > since
+            statement = union(
+                select(_day(BorrowedBook.borrowed_date)).where(changed),
+                select(_day(BorrowedBook.returned_date)).where(changed, BorrowedBook.returned_date.is_not(None))
+            )
+            return sorted(self.db.execute(statement).scalars().all())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting changed stats days: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Stats changed days error: {str(e)}")
+
+    def refresh_days(self, days: Optional[List[date]]) -> None:
+        """Rebuild the summary rows of the given days from the loan table; None rebuilds everything.
+
+        Each day is deleted and re-aggregated as a whole, so refreshing a day twice is harmless.
+        """
+        try:
+            for model in (DailyLoanStat, BookLoanStat, ReaderLoanStat):
+                statement = delete(model)
+                if days is not None:
+                    statement = statement.where(model.day.in_(days))
+                self.db.execute(statement)
+
+            borrowed_on_days = _on_days(BorrowedBook.borrowed_date, days)
+            loan_day = _day(BorrowedBook.borrowed_date)
+
+            for model, key in ((BookLoanStat, BorrowedBook.book_id), (ReaderLoanStat, BorrowedBook.reader_id)):
+                source = select(key, loan_day, func.count()).where(borrowed_on_days).group_by(key, loan_day)
+                self.db.execute(model.__table__.insert().from_select([key.key, "day", "loans"], source))
+
+            events = union_all(
+                select(
+                    loan_day.label("day"),
+                    literal(1).label("loans"),
+                    literal(0).label("returns"),
+                    BorrowedBook.reader_id.label("reader_id")
+                ).where(borrowed_on_days),
+                select(
+                    _day(BorrowedBook.returned_date).label("day"),
+                    literal(0).label("loans"),
+                    literal(1).label("returns"),
+                    null().label("reader_id")
+                ).where(_on_days(BorrowedBook.returned_date, days))
+            ).subquery()
+            source = select(
+                events.c.day,
+                func.sum(events.c.loans),
+                func.sum(events.c.returns),
+                func.count(events.c.reader_id.distinct())
+            ).group_by(events.c.day)
+            self.db.execute(
+                DailyLoanStat.__table__.insert().from_select(["day", "loans", "returns", "active_readers"], source)
+            )
+            self.db.flush()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when refreshing stats: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Stats refresh error: {str(e)}")
+
+    def get_top_books(self, date_from: date, date_to: date, limit: int) -> List[dict]:
+        try:
+            loans = func.sum(BookLoanStat.loans).label("loans")
+            top = (
+                select(BookLoanStat.book_id, loans)
+                .where(BookLoanStat.day.between(date_from, date_to))
+                .group_by(BookLoanStat.book_id)
+                .order_by(loans.desc(), BookLoanStat.book_id)
+                .limit(limit)
+                .subquery()
+            )
+            statement = (
+                select(top.c.book_id, Book.name, Book.author, top.c.loans)
+                .join(Book, Book.id == top.c.book_id)
+                .order_by(top.c.loans.desc(), top.c.book_id)
+            )
+            return [dict(row) for row in self.db.execute(statement).mappings()]
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting top books: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Stats top books error: {str(e)}")
+
+    def count_active_readers(self, date_from: date, date_to: date) -> int:
+        try:
+            statement = select(func.count(ReaderLoanStat.reader_id.distinct())).where(
+                ReaderLoanStat.day.between(date_from, date_to)
+            )
+            return self.db.execute(statement).scalar_one()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when counting active readers: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Stats active readers error: {str(e)}")
+
+    def get_loans_per_day(self, date_from: date, date_to: date) -> List[DailyLoanStat]:
+        try:
+            statement = (
+                select(DailyLoanStat)
+                .where(DailyLoanStat.day.between(date_from, date_to))
+                .order_by(DailyLoanStat.day)
+            )
+            return list(self.db.execute(statement).scalars().all())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error when getting loans per day: {str(e)}")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Stats loans per day error: {str(e)}")
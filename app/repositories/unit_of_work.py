@@ -0,0 +1,42 @@
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    """Owns the transaction boundary of one business operation.
+
+    Repositories sharing ``session`` only flush; the unit of work commits once when the
+    operation succeeds and rolls everything back when it fails, so a failure halfway
+    through never leaves half-applied state behind. In the API the unit of work spans a
+    request (see ``database.get_unit_of_work``); background jobs open their own.
+    """
+
+    def __init__(self, session: Session, close: bool = False):
+        self.session = session
+        self._close = close
+
+    @classmethod
+    def begin(cls, session_factory: Callable[[], Session]) -> "UnitOfWork":
+        """A unit of work over a fresh session, closed when the ``with`` block exits."""
+        return cls(session_factory(), close=True)
+
+    def commit(self) -> None:
+        self.session.commit()
+
+    def rollback(self) -> None:
+        self.session.rollback()
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> Optional[bool]:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            if self._close:
+                self.session.close()
+        return None
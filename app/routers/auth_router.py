@@ -1,22 +1,30 @@
-from fastapi import Depends, HTTPException, APIRouter
+from typing import Optional
+
+from fastapi import BackgroundTasks, Depends, HTTPException, APIRouter
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import SecretStr
 from starlette import status
 
 from app.models import Librarian
-from app.schemas.auth_schema import Token, ChangePasswordRequest
+from app.schemas.auth_schema import Token, ChangePasswordRequest, LogoutRequest, RefreshRequest, \
+    RevocationPurgeResponse
 from app.services.auth_service import AuthService
-from dependencies import get_auth_service, get_current_user
+from dependencies import get_auth_service, get_current_user, oauth2_scheme
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post('/login', response_model=Token)
 def login_for_access_token(
+        background_tasks: BackgroundTasks,
         form_data: OAuth2PasswordRequestForm = Depends(),
         auth_service: AuthService = Depends(get_auth_service)
 ):
-    librarian = auth_service.authenticate(form_data.username, SecretStr(form_data.password))
+    librarian = auth_service.authenticate(
+        form_data.username,
+        SecretStr(form_data.password),
+        schedule_rehash=background_tasks.add_task
+    )
     if not librarian:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -25,9 +33,61 @@ def login_for_access_token(
         )
 
     access_token = auth_service.create_access_token(
-        data={'sub': librarian.person.email}
+        data={'sub': librarian.person.email, 'lid': librarian.id}
     )
-    return {'access_token': access_token, 'token_type': 'bearer'}
+    refresh_token = auth_service.create_refresh_token(librarian.id)
+    return {'access_token': access_token, 'token_type': 'bearer', 'refresh_token': refresh_token}
+
+
+@router.post('/refresh', response_model=Token)
+def refresh_access_token(
+        data: RefreshRequest,
+        auth_service: AuthService = Depends(get_auth_service)
+):
+    try:
+        access_token, refresh_token = auth_service.refresh(data.refresh_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={'WWW-Authenticate': 'Bearer'}
+        )
+    return {'access_token': access_token, 'token_type': 'bearer', 'refresh_token': refresh_token}
+
+
+@router.post('/logout', status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+        data: Optional[LogoutRequest] = None,
+        token: str = Depends(oauth2_scheme),
+        auth_service: AuthService = Depends(get_auth_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        auth_service.logout(current_user, auth_service.verify_token(token), data.refresh_token if data else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post('/revoke-all', status_code=status.HTTP_204_NO_CONTENT)
+def revoke_all_sessions(
+        auth_service: AuthService = Depends(get_auth_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        auth_service.revoke_all_sessions(current_user.id, actor_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post('/revocations/purge', response_model=RevocationPurgeResponse)
+def purge_expired_revocations(
+        auth_service: AuthService = Depends(get_auth_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return RevocationPurgeResponse(purged=auth_service.purge_expired_revocations())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.patch('/change-password', status_code=status.HTTP_204_NO_CONTENT)
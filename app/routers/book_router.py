@@ -1,12 +1,19 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Header, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from starlette import status
 
 from app.models import Librarian
-from app.schemas.book_schema import BookCreate, BookResponse, BookUpdate
+from app.schemas.base_schema import BatchResponse
+from app.schemas.book_copy_schema import BookCopyCreate, BookCopyResponse
+from app.schemas.book_schema import BookCreate, BookFilter, BookResponse, BookSort, BookUpdate
+from app.services.book_copy_service import BookCopyService
 from app.services.book_service import BookService
-from dependencies import get_book_service, get_current_user
+from app.utils.etag import make_etag, parse_if_match
+from app.utils.exceptions import PreconditionFailedError
+from dependencies import get_book_service, get_current_user, get_book_copy_service
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
@@ -14,10 +21,11 @@ router = APIRouter(prefix="/books", tags=["Books"])
 @router.post("/", response_model=BookResponse)
 def create(
         data: BookCreate,
-        service: BookService = Depends(get_book_service)
+        service: BookService = Depends(get_book_service),
+        current_user: Librarian = Depends(get_current_user)
 ):
     try:
-        return service.create(data)
+        return service.create(data, actor_id=current_user.id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -26,11 +34,17 @@ def create(
 def update(
         id: int,
         data: BookUpdate,
+        response: Response,
+        if_match: Optional[str] = Header(None),
         service: BookService = Depends(get_book_service),
         current_user: Librarian = Depends(get_current_user)
 ):
     try:
-        return service.update(id, data)
+        book = service.update(id, data, expected_version=parse_if_match(if_match), actor_id=current_user.id)
+        response.headers["ETag"] = make_etag(book.version_id)
+        return book
+    except PreconditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -41,28 +55,104 @@ def delete(
         service: BookService = Depends(get_book_service),
         current_user: Librarian = Depends(get_current_user)
 ):
-    if not service.delete(id):
+    if not service.delete(id, actor_id=current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
 
+@router.post("/{id}/copies", response_model=BookCopyResponse)
+def add_copy(
+        id: int,
+        data: BookCopyCreate,
+        service: BookCopyService = Depends(get_book_copy_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.add_copy(id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{id}/copies", response_model=List[BookCopyResponse])
+def get_copies(
+        id: int,
+        service: BookCopyService = Depends(get_book_copy_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.get_copies(id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def parse_fields(
+        fields: Optional[str] = Query(None, description="Comma-separated subset of BookResponse fields to return")
+) -> Optional[List[str]]:
+    try:
+        return BookService.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/by-id/{id}", response_model=BookResponse)
 def get_by_id(
         id: int,
+        response: Response,
+        fields: Optional[List[str]] = Depends(parse_fields),
         service: BookService = Depends(get_book_service),
         current_user: Librarian = Depends(get_current_user)
 ):
-    book = service.get_by_id(id)
+    book = service.get_by_id(id, fields)
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    if fields:
+        # Partial objects cannot satisfy BookResponse, so they bypass response_model validation
+        headers = {"ETag": make_etag(book["version_id"])} if "version_id" in book else None
+        return JSONResponse(jsonable_encoder(book), headers=headers)
+    response.headers["ETag"] = make_etag(book.version_id)
     return book
 
 
+@router.get("/batch", response_model=BatchResponse[BookResponse])
+def get_many(
+        ids: List[int] = Query(...),
+        service: BookService = Depends(get_book_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        books, missing = service.get_many(ids)
+        return {"items": books, "missing": missing}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def parse_filters(
+        author: Optional[str] = Query(None, max_length=255),
+        year_from: Optional[int] = Query(None, gt=0),
+        year_to: Optional[int] = Query(None, gt=0),
+        available: Optional[bool] = Query(None, description="Only titles with copies on the shelf (or none)"),
+        isbn_prefix: Optional[str] = Query(None, max_length=17),
+        sort: BookSort = Query("id"),
+        limit: Optional[int] = Query(None, ge=1, le=500)
+) -> BookFilter:
+    return BookFilter(
+        author=author, year_from=year_from, year_to=year_to, available=available,
+        isbn_prefix=isbn_prefix, sort=sort, limit=limit
+    )
+
+
 @router.get('/', response_model=List[BookResponse])
 def get_all(
+        fields: Optional[List[str]] = Depends(parse_fields),
+        filters: BookFilter = Depends(parse_filters),
         service: BookService = Depends(get_book_service),
         # current_user: Librarian = Depends(get_current_user)
 ):
-    books = service.get_all()
+    try:
+        books = service.get_all(fields, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if not books:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No books")
+    if fields:
+        return JSONResponse(jsonable_encoder(books))
     return books
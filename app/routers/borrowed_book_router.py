@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from starlette import status
 
-from app.schemas.borrowed_book_schema import BorrowedBookResponse
+from app.schemas.base_schema import Page
+from app.schemas.borrowed_book_schema import BorrowedBookResponse, BorrowedBookExpandedResponse
 from app.services.borrow_book_service import BorrowedBookService
 from dependencies import get_borrowed_book_service, get_current_user
 from app.models import Librarian
@@ -39,7 +40,7 @@ def return_book(
         current_user: Librarian = Depends(get_current_user)
 ):
     try:
-        return service.return_book(book_id, reader_id)
+        return service.return_book(book_id, reader_id, actor_id=current_user.id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -47,27 +48,61 @@ def return_book(
         )
 
 
-@router.get("/reader/{reader_id}", response_model=List[BorrowedBookResponse])
+@router.patch("/{borrowing_id}/renew", response_model=BorrowedBookResponse)
+def renew_borrowing(
+        borrowing_id: int,
+        service: BorrowedBookService = Depends(get_borrowed_book_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.renew_borrowing(borrowing_id, actor_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/overdue", response_model=Page[BorrowedBookResponse])
+def get_overdue_borrowings(
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=500),
+        service: BorrowedBookService = Depends(get_borrowed_book_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        borrowings, next_cursor = service.get_overdue_borrowings(cursor, limit)
+        return {"items": borrowings, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/reader/{reader_id}", response_model=List[BorrowedBookExpandedResponse])
 def get_reader_borrowings(
         reader_id: int,
+        include: Optional[str] = Query(None, description="Comma-separated relations: book,reader,librarian"),
         service: BorrowedBookService = Depends(get_borrowed_book_service),
         current_user: Librarian = Depends(get_current_user)
 ):
     try:
-        return service.get_active_borrowings(reader_id)
+        return service.get_active_borrowings(reader_id, include)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-@router.get("/", response_model=List[BorrowedBookResponse])
+@router.get("/", response_model=List[BorrowedBookExpandedResponse])
 def get_all_borrowings(
+        include: Optional[str] = Query(None, description="Comma-separated relations: book,reader,librarian"),
         service: BorrowedBookService = Depends(get_borrowed_book_service),
         current_user: Librarian = Depends(get_current_user)
 ):
     try:
-        return service.get_all_active_borrowings()
+        return service.get_all_active_borrowings(include)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,56 @@
+import asyncio
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette import status
+
+from app.models import Librarian
+from app.utils.event_broadcaster import EventBroadcaster
+from app.utils.settings import EventStreamSettings
+from dependencies import get_current_user, get_event_broadcaster, get_event_stream_settings
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+@router.get("/stream")
+async def stream_events(
+        request: Request,
+        last_event_id: Optional[str] = Header(None),
+        broadcaster: EventBroadcaster = Depends(get_event_broadcaster),
+        settings: EventStreamSettings = Depends(get_event_stream_settings),
+        current_user: Librarian = Depends(get_current_user)
+):
+    if last_event_id is not None and not last_event_id.isdigit():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Last-Event-ID must be an event id")
+
+    async def events() -> AsyncIterator[str]:
+        # Subscribe before replaying, so nothing published during the replay is missed
+        subscription = await broadcaster.subscribe()
+        try:
+            last_id = int(last_event_id) if last_event_id is not None else None
+            if last_id is not None:
+                async for event in broadcaster.replay(last_id):
+                    last_id = event.id
+                    yield event.to_sse()
+
+            while not (subscription.closed and subscription.queue.empty()):
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), settings.event_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if last_id is not None and event.id <= last_id:
+                    continue
+                last_id = event.id
+                yield event.to_sse()
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,34 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from starlette import status
+
+from app.models import Librarian
+from app.schemas.fine_schema import FineAccrualResponse, FineResponse
+from app.services.fine_service import FineService
+from dependencies import get_current_user, get_fine_service
+
+router = APIRouter(prefix="/fines", tags=["Fines"])
+
+
+@router.post("/accrue", response_model=FineAccrualResponse)
+def accrue_fines(
+        service: FineService = Depends(get_fine_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.accrue_fines()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/reader/{reader_id}", response_model=List[FineResponse])
+def get_reader_fines(
+        reader_id: int,
+        service: FineService = Depends(get_fine_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.get_reader_fines(reader_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
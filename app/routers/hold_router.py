@@ -0,0 +1,63 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from starlette import status
+
+from app.models import Librarian
+from app.schemas.hold_schema import HoldExpiryResponse, HoldResponse
+from app.services.hold_service import HoldService
+from dependencies import get_current_user, get_hold_service
+
+router = APIRouter(prefix="/holds", tags=["Holds"])
+
+
+@router.post("/", response_model=HoldResponse)
+def place_hold(
+        book_id: int,
+        reader_id: int,
+        service: HoldService = Depends(get_hold_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        hold, position = service.place_hold(book_id, reader_id)
+        return HoldResponse.model_validate(hold).model_copy(update={"position": position})
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/{hold_id}/cancel", response_model=HoldResponse)
+def cancel_hold(
+        hold_id: int,
+        service: HoldService = Depends(get_hold_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.cancel_hold(hold_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/expire", response_model=HoldExpiryResponse)
+def expire_holds(
+        service: HoldService = Depends(get_hold_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return HoldExpiryResponse(expired=service.expire_ready_holds())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/reader/{reader_id}", response_model=List[HoldResponse])
+def get_reader_holds(
+        reader_id: int,
+        service: HoldService = Depends(get_hold_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return [
+            HoldResponse.model_validate(hold).model_copy(update={"position": position})
+            for hold, position in service.get_reader_holds(reader_id)
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -32,7 +32,7 @@ def update(
     try:
         if current_user.id != id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
-        return service.update(id, data)
+        return service.update(id, data, actor_id=current_user.id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -46,7 +46,7 @@ def delete(
     if current_user.id != id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
-    if not service.delete(id):
+    if not service.delete(id, actor_id=current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
 
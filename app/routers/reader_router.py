@@ -1,13 +1,19 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
 # from sqlalchemy.testing.pickleable import User
 from starlette import status
 
 from app.models import Reader, Librarian
+from app.schemas.base_schema import BatchResponse, Page
+from app.schemas.borrowed_book_schema import BorrowedBookResponse
 from app.schemas.reader_schema import ReaderResponse, ReaderUpdate, ReaderCreate
+from app.services.borrow_book_service import BorrowedBookService
 from app.services.reader_service import ReaderService
-from dependencies import get_reader_service, get_current_user
+from app.utils.etag import make_etag, parse_if_match
+from app.utils.exceptions import PreconditionFailedError
+from dependencies import get_reader_service, get_current_user, get_borrowed_book_service
 
 router = APIRouter(prefix="/readers", tags=["Readers"])
 
@@ -15,10 +21,11 @@ router = APIRouter(prefix="/readers", tags=["Readers"])
 @router.post("/", response_model=ReaderResponse)
 def create(
         data: ReaderCreate,
-        service: ReaderService = Depends(get_reader_service)
+        service: ReaderService = Depends(get_reader_service),
+        current_user: Librarian = Depends(get_current_user)
 ):
     try:
-        return service.create(data)
+        return service.create(data, actor_id=current_user.id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -27,11 +34,17 @@ def create(
 def update(
         id: int,
         data: ReaderUpdate,
+        response: Response,
+        if_match: Optional[str] = Header(None),
         service: ReaderService = Depends(get_reader_service),
         current_user: Librarian = Depends(get_current_user)
 ):
     try:
-        return service.update(id, data)
+        reader = service.update(id, data, expected_version=parse_if_match(if_match), actor_id=current_user.id)
+        response.headers["ETag"] = make_etag(reader.person.version_id)
+        return reader
+    except PreconditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -42,22 +55,54 @@ def delete(
         service: ReaderService = Depends(get_reader_service),
         current_user: Librarian = Depends(get_current_user)
 ):
-    if not service.delete(id):
+    if not service.delete(id, actor_id=current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
 
 @router.get("/by-id/{id}", response_model=ReaderResponse)
 def get_by_id(
         id: int,
+        response: Response,
         service: ReaderService = Depends(get_reader_service),
         current_user: Librarian = Depends(get_current_user)
 ):
     reader = service.get_by_id(id)
     if not reader:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reader not found")
+    response.headers["ETag"] = make_etag(reader.person.version_id)
     return reader
 
 
+@router.get("/batch", response_model=BatchResponse[ReaderResponse])
+def get_many(
+        ids: List[int] = Query(...),
+        service: ReaderService = Depends(get_reader_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        readers, missing = service.get_many(ids)
+        return {"items": readers, "missing": missing}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{id}/history", response_model=Page[BorrowedBookResponse])
+def get_history(
+        id: int,
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=500),
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        service: BorrowedBookService = Depends(get_borrowed_book_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        history, next_cursor = service.get_reader_history(id, cursor, limit, date_from, date_to)
+        return {"items": history, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get('/by-email/{email}', response_model=ReaderResponse)
 def get_by_email(
         email: str,
@@ -0,0 +1,71 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from starlette import status
+
+from app.models import Librarian
+from app.schemas.stats_schema import (
+    ActiveReadersResponse, DailyLoanStatResponse, StatsRefreshResponse, TopBookResponse
+)
+from app.services.stats_service import StatsService
+from app.utils.settings import StatsSettings
+from dependencies import get_current_user, get_stats_service, get_stats_settings
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+def cache_headers(response: Response, settings: StatsSettings = Depends(get_stats_settings)) -> None:
+    # Aggregates only move when the refresh job runs, so dashboards may reuse a response for a while
+    response.headers["Cache-Control"] = f"private, max-age={settings.stats_cache_max_age}"
+
+
+@router.get("/top-books", response_model=List[TopBookResponse], dependencies=[Depends(cache_headers)])
+def get_top_books(
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = Query(10, ge=1, le=100),
+        service: StatsService = Depends(get_stats_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.get_top_books(date_from, date_to, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/active-readers", response_model=ActiveReadersResponse, dependencies=[Depends(cache_headers)])
+def get_active_readers(
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        service: StatsService = Depends(get_stats_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.get_active_readers(date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/loans-per-day", response_model=List[DailyLoanStatResponse], dependencies=[Depends(cache_headers)])
+def get_loans_per_day(
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        service: StatsService = Depends(get_stats_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.get_loans_per_day(date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/refresh", response_model=StatsRefreshResponse)
+def refresh_stats(
+        service: StatsService = Depends(get_stats_service),
+        current_user: Librarian = Depends(get_current_user)
+):
+    try:
+        return service.refresh()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -6,6 +6,19 @@ from pydantic import BaseModel, EmailStr, Field, SecretStr
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=256)
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = Field(None, max_length=256)
+
+
+class RevocationPurgeResponse(BaseModel):
+    purged: int
 
 
 class TokenData(BaseModel):
@@ -1,6 +1,20 @@
+from typing import Generic, List, Optional, TypeVar
+
 from pydantic import BaseModel
 
+ItemType = TypeVar('ItemType')
+
 
 class BaseSchema(BaseModel):
     class Config:
         from_attributes = True
+
+
+class Page(BaseSchema, Generic[ItemType]):
+    items: List[ItemType]
+    next_cursor: Optional[str] = None
+
+
+class BatchResponse(BaseSchema, Generic[ItemType]):
+    items: List[ItemType]
+    missing: List[int]
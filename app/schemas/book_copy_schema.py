@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field
+
+from app.schemas.base_schema import BaseSchema
+
+
+class BookCopyCreate(BaseSchema):
+    barcode: str = Field(..., max_length=32)
+    location: Optional[str] = Field(None, max_length=100)
+
+
+class BookCopyResponse(BookCopyCreate):
+    id: int
+    book_id: int
+    status: str
+    created_at: datetime
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 
@@ -29,5 +29,22 @@ class BookUpdate(BaseSchema):
 class BookResponse(BookBase):
     id: int
     author: str
+    # Copies on the shelf; for titles with registered copies, the free ones
+    available_copies: int
+    version_id: int
     created_at: datetime
     updated_at: datetime
+
+
+BookSort = Literal["id", "name", "year", "-year"]
+
+
+class BookFilter(BaseSchema):
+    """Catalog browse parameters; the filters that are set combine with AND."""
+    author: Optional[str] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    available: Optional[bool] = None
+    isbn_prefix: Optional[str] = None
+    sort: BookSort = "id"
+    limit: Optional[int] = None
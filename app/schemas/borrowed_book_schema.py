@@ -2,6 +2,9 @@ from datetime import datetime
 from typing import Optional
 
 from app.schemas.base_schema import BaseSchema
+from app.schemas.book_schema import BookResponse
+from app.schemas.librarian_schema import LibrarianResponse
+from app.schemas.reader_schema import ReaderResponse
 
 
 class BorrowedBookBase(BaseSchema):
@@ -16,5 +19,14 @@ class BorrowedBookCreate(BorrowedBookBase):
 
 class BorrowedBookResponse(BorrowedBookBase):
     id: int
+    copy_id: Optional[int] = None
     borrowed_date: datetime
+    due_date: datetime
     returned_date: Optional[datetime]
+    renewal_count: int
+
+
+class BorrowedBookExpandedResponse(BorrowedBookResponse):
+    book: Optional[BookResponse] = None
+    reader: Optional[ReaderResponse] = None
+    librarian: Optional[LibrarianResponse] = None
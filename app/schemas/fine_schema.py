@@ -0,0 +1,18 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.schemas.base_schema import BaseSchema
+
+
+class FineResponse(BaseSchema):
+    id: int
+    borrowing_id: int
+    reader_id: int
+    days_overdue: int
+    amount: Decimal
+    updated_at: datetime
+
+
+class FineAccrualResponse(BaseSchema):
+    processed: int
+    watermark: datetime
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+from app.schemas.base_schema import BaseSchema
+
+
+class HoldResponse(BaseSchema):
+    id: int
+    book_id: int
+    reader_id: int
+    status: str
+    copy_id: Optional[int] = None
+    # Place in the book's queue while waiting; None once a copy is set aside or the hold is closed
+    position: Optional[int] = None
+    ready_until: Optional[datetime] = None
+    created_at: datetime
+
+
+class HoldExpiryResponse(BaseSchema):
+    expired: int
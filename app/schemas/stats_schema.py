@@ -0,0 +1,29 @@
+from datetime import date, datetime
+from typing import Optional
+
+from app.schemas.base_schema import BaseSchema
+
+
+class TopBookResponse(BaseSchema):
+    book_id: int
+    name: str
+    author: str
+    loans: int
+
+
+class ActiveReadersResponse(BaseSchema):
+    date_from: date
+    date_to: date
+    active_readers: int
+
+
+class DailyLoanStatResponse(BaseSchema):
+    day: date
+    loans: int
+    returns: int
+    active_readers: int
+
+
+class StatsRefreshResponse(BaseSchema):
+    refreshed_days: Optional[int]
+    watermark: datetime
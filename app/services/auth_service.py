@@ -1,13 +1,25 @@
+import hashlib
+import hmac
+import logging
 import os
+import secrets
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, List, Optional, Tuple
 
 from jose import jwt, JWTError
 from pydantic import SecretStr
 
 from app.models import Librarian
 from app.repositories.librarian_repository import LibrarianRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.audit_writer import TransactionAudit
 from app.utils.security import SecuritySettings, PasswordSecurity
+from app.utils.token_denylist import Revocation, TokenDenylist
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -15,13 +27,30 @@ class AuthService:
             self,
             repository: LibrarianRepository,
             password_security: PasswordSecurity,
-            security_settings: SecuritySettings
+            security_settings: SecuritySettings,
+            refresh_token_repository: Optional[RefreshTokenRepository] = None,
+            revoked_token_repository: Optional[RevokedTokenRepository] = None,
+            denylist: Optional[TokenDenylist] = None,
+            audit: Optional[TransactionAudit] = None,
+            unit_of_work: Optional[UnitOfWork] = None
     ):
         self.repository = repository
         self.password_security = password_security
         self.security_settings = security_settings
+        self.refresh_token_repository = refresh_token_repository
+        self.revoked_token_repository = revoked_token_repository
+        self.denylist = denylist
+        self.audit = audit
+        self.unit_of_work = unit_of_work
 
-    def authenticate(self, email: str, password: SecretStr) -> Optional[Librarian]:
+    def authenticate(
+            self,
+            email: str,
+            password: SecretStr,
+            schedule_rehash: Optional[Callable[..., Any]] = None
+    ) -> Optional[Librarian]:
+        """``schedule_rehash(func, *args)`` defers the upgrade of a hash whose cost is off
+        policy (e.g. ``BackgroundTasks.add_task``); without it the hash is left as is."""
         try:
             librarian = self.repository.get_by_email(email)
 
@@ -31,24 +60,103 @@ class AuthService:
             if not self.password_security.verify_password(password, librarian.hash_password):
                 raise ValueError("Invalid email or password")
 
+            if schedule_rehash and self.password_security.needs_rehash(librarian.hash_password):
+                schedule_rehash(self.rehash_password, librarian.id, librarian.hash_password, password)
+
             return librarian
         except ValueError as e:
             raise
         except Exception as e:
             raise ValueError(f"Authentication failed: {str(e)}") from e
 
+    def rehash_password(self, librarian_id: int, current_hash: str, password: SecretStr) -> bool:
+        try:
+            new_hash = self.password_security.get_password_hash(password)
+            updated = self.repository.update_password_hash(librarian_id, current_hash, new_hash)
+            # The request's unit of work has already committed by the time background tasks run
+            if self.unit_of_work:
+                self.unit_of_work.commit()
+            return updated
+        except Exception:
+            # Runs after the response: the old hash still verifies, so just retry on next login
+            logger.exception("Failed to rehash password for librarian %s", librarian_id)
+            return False
+
+    def get_principal(self, email: str, librarian_id: Optional[int] = None) -> Optional[Librarian]:
+        """Resolves the librarian a verified token belongs to."""
+        if librarian_id is None:
+            return self.repository.get_by_email(email)
+        librarian = self.repository.get_principal(librarian_id)
+        # A token issued before an email change must stop working, as it did with lookups by email
+        if librarian is None or librarian.person.email != email:
+            return None
+        return librarian
+
     def create_access_token(self, data: dict) -> str:
         try:
             to_encode = data.copy()
-            expire = (datetime.now(timezone.utc).replace(tzinfo=None)
+            now = datetime.now(timezone.utc)
+            expire = (now.replace(tzinfo=None)
                       + timedelta(minutes=self.security_settings.access_token_expire_minutes))
 
-            to_encode.update({"exp": expire})
+            to_encode.update({"exp": expire, "iat": int(now.timestamp()), "jti": uuid.uuid4().hex})
             return jwt.encode(to_encode, self.security_settings.secret_key.get_secret_value(),
                               algorithm=self.security_settings.algorithm)
         except Exception as e:
             raise ValueError(f"Failed to create access token: {str(e)}") from e
 
+    def create_refresh_token(self, librarian_id: int, family_id: Optional[str] = None) -> str:
+        try:
+            token = secrets.token_urlsafe(32)
+            expires_at = (datetime.now(timezone.utc)
+                          + timedelta(days=self.security_settings.refresh_token_expire_days))
+            self.refresh_token_repository.create(
+                librarian_id,
+                family_id or uuid.uuid4().hex,
+                self._digest_refresh_token(token),
+                expires_at
+            )
+            return token
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to create refresh token: {str(e)}") from e
+
+    def refresh(self, refresh_token: str) -> Tuple[str, str]:
+        """Rotates a refresh token and returns ``(access_token, refresh_token)``.
+
+        Costs one indexed UPDATE plus an HMAC, no password verification. Presenting a token that
+        was already rotated means it leaked, so the whole login it belongs to is revoked.
+        """
+        try:
+            digest = self._digest_refresh_token(refresh_token)
+            consumed = self.refresh_token_repository.consume(digest)
+            if consumed is None:
+                existing = self.refresh_token_repository.get_by_digest(digest)
+                if existing is not None and existing.revoked_at is not None:
+                    self.refresh_token_repository.revoke_family(existing.family_id)
+                    if self.audit:
+                        self.audit.record(
+                            "librarian.refresh_token_reused", "librarian", existing.librarian_id,
+                            existing.librarian_id
+                        )
+                    # Kept, with its audit entry, even though the request fails and would roll it back
+                    if self.unit_of_work:
+                        self.unit_of_work.commit()
+                raise ValueError("Invalid refresh token")
+
+            new_refresh_token = self.create_refresh_token(consumed.librarian_id, consumed.family_id)
+            access_token = self.create_access_token(data={"sub": consumed.email, "lid": consumed.librarian_id})
+            return access_token, new_refresh_token
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to refresh token: {str(e)}") from e
+
+    def _digest_refresh_token(self, token: str) -> str:
+        key = self.security_settings.secret_key.get_secret_value().encode()
+        return hmac.new(key, token.encode(), hashlib.sha256).hexdigest()
+
     def verify_token(self, token: str) -> dict:
         try:
             payload = jwt.decode(
@@ -65,6 +173,77 @@ class AuthService:
         except Exception as e:
             raise ValueError("Token verification failed") from e
 
+    def is_token_revoked(self, payload: dict) -> bool:
+        """Answers from the in-memory filter; only a filter hit, or a filter not loaded yet, costs a
+        database lookup."""
+        if self.denylist is None or self.revoked_token_repository is None:
+            return False
+        try:
+            self.denylist.refresh(self._load_revocations)
+        except ValueError:
+            logger.warning("Failed to refresh the token denylist, using the last loaded one", exc_info=True)
+
+        jti = payload.get("jti")
+        librarian_id = payload.get("lid")
+        # Until this worker has loaded the table once (failed, or another request is loading it),
+        # a miss proves nothing, so the table answers instead
+        if self.denylist.loaded and not self.denylist.might_be_revoked(jti, librarian_id):
+            return False
+        issued_at = datetime.fromtimestamp(payload["iat"], timezone.utc) if "iat" in payload else None
+        return self.revoked_token_repository.is_revoked(jti, librarian_id, issued_at)
+
+    def logout(self, librarian: Librarian, payload: dict, refresh_token: Optional[str] = None) -> None:
+        try:
+            jti = payload.get("jti")
+            if jti is not None:
+                expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+                self.revoked_token_repository.add(librarian.id, expires_at, jti=jti)
+                if self.denylist:
+                    self.denylist.add(jti, librarian.id)
+
+            if refresh_token:
+                existing = self.refresh_token_repository.get_by_digest(self._digest_refresh_token(refresh_token))
+                if existing is not None and existing.librarian_id == librarian.id:
+                    self.refresh_token_repository.revoke_family(existing.family_id)
+
+            if self.audit:
+                self.audit.record("librarian.logged_out", "librarian", librarian.id, librarian.id)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to log out: {str(e)}") from e
+
+    def revoke_all_sessions(self, librarian_id: int, actor_id: Optional[int] = None) -> None:
+        """Invalidates every access and refresh token issued to the librarian so far."""
+        try:
+            # Access tokens issued before now are all expired after one lifetime, so the row can go then
+            expires_at = (datetime.now(timezone.utc)
+                          + timedelta(minutes=self.security_settings.access_token_expire_minutes))
+            self.revoked_token_repository.add(librarian_id, expires_at)
+            if self.denylist:
+                self.denylist.add(None, librarian_id)
+            self.refresh_token_repository.revoke_for_librarian(librarian_id)
+
+            if self.audit:
+                self.audit.record("librarian.sessions_revoked", "librarian", librarian_id, actor_id)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to revoke sessions: {str(e)}") from e
+
+    def purge_expired_revocations(self) -> int:
+        """Maintenance job: deletes revocations whose tokens have expired anyway."""
+        try:
+            return self.revoked_token_repository.purge_expired()
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to purge revoked tokens: {str(e)}") from e
+
+    def _load_revocations(self, since: Optional[datetime]) -> List[Revocation]:
+        # Runs inside whichever request triggers the refresh, so it only reads
+        return self.revoked_token_repository.get_since(since)
+
     def change_password(self, current_password: SecretStr, new_password: SecretStr, librarian: Librarian) -> Librarian:
         try:
             if not self.password_security.verify_password(current_password, librarian.hash_password):
@@ -72,7 +251,10 @@ class AuthService:
 
             hashed_password = self.password_security.get_password_hash(new_password)
 
-            return self.repository.change_password(librarian.id, hashed_password)
+            updated_librarian = self.repository.change_password(librarian.id, hashed_password)
+            if self.audit:
+                self.audit.record("librarian.password_changed", "librarian", librarian.id, librarian.id)
+            return updated_librarian
         except ValueError as e:
             raise
         except Exception as e:
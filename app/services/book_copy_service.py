@@ -0,0 +1,42 @@
+from typing import List
+
+from app.models import BookCopy
+from app.repositories.book_copy_repository import BookCopyRepository
+from app.repositories.book_repository import BookRepository
+from app.schemas.book_copy_schema import BookCopyCreate
+from app.schemas.book_schema import BookUpdate
+
+
+class BookCopyService:
+    def __init__(self, copy_repo: BookCopyRepository, book_repo: BookRepository):
+        self.copy_repo = copy_repo
+        self.book_repo = book_repo
+
+    def add_copy(self, book_id: int, data: BookCopyCreate) -> BookCopy:
+        try:
+            if not self.book_repo.exists(id=book_id):
+                raise ValueError("Book not found")
+
+            if self.copy_repo.exists_by_barcode(data.barcode):
+                raise ValueError("Copy with this barcode already exists")
+
+            first_copy = not self.copy_repo.has_copies(book_id)
+            copy = self.copy_repo.create(book_id, data)
+            if first_copy:
+                # From now on the title's shelf count comes from its copies, not its counter
+                self.book_repo.update(book_id, BookUpdate(number_of_copies=0))
+            return copy
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to add book copy: {str(e)}") from e
+
+    def get_copies(self, book_id: int) -> List[BookCopy]:
+        try:
+            if not self.book_repo.exists(id=book_id):
+                raise ValueError("Book not found")
+            return self.copy_repo.get_by_book(book_id)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get book copies: {str(e)}") from e
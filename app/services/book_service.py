@@ -1,43 +1,78 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Sequence, Tuple, Union
 
 from app.models import Book
 from app.repositories.book_repository import BookRepository
-from app.schemas.book_schema import BookCreate, BookUpdate
+from app.repositories.outbox_repository import OutboxRepository
+from app.schemas.book_schema import BookCreate, BookFilter, BookUpdate, BookResponse
+from app.utils.audit_writer import TransactionAudit
+
+MAX_BATCH_SIZE = 100
+BOOK_FIELDS = tuple(BookResponse.model_fields)
+
+
+def _book_payload(book: Book) -> Dict[str, Any]:
+    return {
+        "id": book.id,
+        "name": book.name,
+        "author": book.author,
+        "year": book.year,
+        "isbn": book.isbn,
+        "number_of_copies": book.number_of_copies,
+    }
 
 
 class BookService:
-    def __init__(self, repository: BookRepository):
+    def __init__(
+            self,
+            repository: BookRepository,
+            outbox_repo: OutboxRepository,
+            audit: Optional[TransactionAudit] = None
+    ):
         self.repository = repository
+        self.outbox_repo = outbox_repo
+        self.audit = audit
 
-    def create(self, data: BookCreate) -> Book:
+    def create(self, data: BookCreate, actor_id: Optional[int] = None) -> Book:
         try:
-            if self.repository.exists_by_isbn(data.isbn):
-                raise ValueError("Book with this ISBN already exists")
-
             if not self.repository.author_exists(data.author):
                 raise ValueError("Author does not exist in our database")
 
-            return self.repository.create(data)
+            # A duplicate ISBN is reported by the insert itself (unique constraint on books.isbn)
+            book = self.repository.create(data)
+            self.outbox_repo.add("book.created", _book_payload(book))
+            if self.audit:
+                self.audit.record("book.created", "book", book.id, actor_id)
+            return book
         except ValueError as e:
             raise e
         except Exception as e:
             raise ValueError(f"Failed to create librarian: {str(e)}") from e
 
-    def update(self, id: int, data: BookUpdate) -> Book:
+    def update(
+            self,
+            id: int,
+            data: BookUpdate,
+            expected_version: Optional[int] = None,
+            actor_id: Optional[int] = None
+    ) -> Book:
         try:
-            if not self.repository.exists(id):
-                raise ValueError("Book not found")
-
-            if data.isbn and self.repository.isbn_exists_except_current(data.isbn, id):
-                raise ValueError("Another book with this ISBN already exists")
-
-            return self.repository.update(id, data)
+            # The update reports a missing book and a duplicate ISBN itself, so nothing is pre-read
+            if expected_version is not None:
+                book = self.repository.update(id, data, expected_version=expected_version)
+            else:
+                book = self.repository.update(id, data)
+            self.outbox_repo.add("book.updated", _book_payload(book))
+            if self.audit:
+                self.audit.record(
+                    "book.updated", "book", id, actor_id, {"changes": data.model_dump(exclude_unset=True)}
+                )
+            return book
         except ValueError as e:
             raise e
         except Exception as e:
             raise ValueError(f"Failed to update librarian: {str(e)}") from e
 
-    def delete(self, id: int) -> bool:
+    def delete(self, id: int, actor_id: Optional[int] = None) -> bool:
         try:
             book = self.repository.get_by_id(id)
             if not book:
@@ -46,15 +81,23 @@ class BookService:
             if book.has_active_borrowings():
                 raise ValueError("Cannot delete book with active borrowings")
 
-            return self.repository.delete(id)
+            deleted = self.repository.delete(id)
+            if deleted:
+                self.outbox_repo.add("book.deleted", {"id": id})
+                if self.audit:
+                    self.audit.record("book.deleted", "book", id, actor_id)
+            return deleted
         except ValueError as e:
             raise e
         except Exception as e:
             raise ValueError(f"Failed to delete librarian: {str(e)}") from e
 
-    def get_by_id(self, id: int) -> Optional[Book]:
+    def get_by_id(self, id: int, fields: Optional[List[str]] = None) -> Union[Book, Dict[str, Any], None]:
         try:
-            book = self.repository.get_by_id(id)
+            if fields:
+                book = self.repository.get_projected_by_id(id, fields)
+            else:
+                book = self.repository.get_cached_by_id(id)
             if not book:
                 raise ValueError("Book not found")
             return book
@@ -63,10 +106,41 @@ class BookService:
         except Exception as e:
             raise ValueError(f"Failed to get librarian: {str(e)}") from e
 
-    def get_all(self) -> List[Book]:
+    def get_many(self, ids: Sequence[int]) -> Tuple[List[Book], List[int]]:
+        try:
+            ids = list(dict.fromkeys(ids))
+            if len(ids) > MAX_BATCH_SIZE:
+                raise ValueError(f"Cannot request more than {MAX_BATCH_SIZE} books at once")
+            return self.repository.get_many(ids)
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise ValueError(f"Failed to get books: {str(e)}") from e
+
+    def get_all(
+            self,
+            fields: Optional[List[str]] = None,
+            filters: Optional[BookFilter] = None
+    ) -> Union[List[Book], List[Dict[str, Any]]]:
         try:
-            return self.repository.get_all()
+            if filters and filters.year_from is not None and filters.year_to is not None \
+                    and filters.year_from > filters.year_to:
+                raise ValueError("year_from must not be greater than year_to")
+            if fields:
+                return self.repository.get_all_projected(fields, filters)
+            return self.repository.get_all(filters)
         except ValueError as e:
             raise e
         except Exception as e:
             raise ValueError(f"Failed to get librarian: {str(e)}") from e
+
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+        if not fields:
+            return None
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = set(requested) - set(BOOK_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        # The id is always returned so that partial objects can still be told apart
+        return list(dict.fromkeys(["id", *requested]))
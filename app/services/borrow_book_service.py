@@ -1,9 +1,21 @@
-from typing import List
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import Row
 
 from app.models.borrowed_book_model import BorrowedBook
+from app.models.book_copy_model import COPY_ON_LOAN
+from app.models.hold_model import HOLD_FULFILLED
+from app.repositories.book_copy_repository import BookCopyRepository
 from app.repositories.book_repository import BookRepository
-from app.repositories.borrowed_book_repository import BorrowedBookRepository
+from app.repositories.borrowed_book_repository import BorrowedBookRepository, RELATION_LOADERS
+from app.repositories.hold_repository import HoldRepository
+from app.repositories.outbox_repository import OutboxRepository
 from app.repositories.reader_repository import ReaderRepository
+from app.services.hold_service import release_copy
+from app.utils.audit_writer import TransactionAudit
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.settings import LoanSettings
 
 
 class BorrowedBookService:
@@ -12,56 +24,210 @@ class BorrowedBookService:
             book_repo: BookRepository,
             borrow_repo: BorrowedBookRepository,
             reader_repo: ReaderRepository,
+            loan_settings: LoanSettings,
+            hold_repo: HoldRepository,
+            copy_repo: BookCopyRepository,
+            outbox_repo: OutboxRepository,
+            audit: Optional[TransactionAudit] = None,
     ):
         self.book_repo = book_repo
         self.borrow_repo = borrow_repo
         self.reader_repo = reader_repo
+        self.loan_settings = loan_settings
+        self.hold_repo = hold_repo
+        self.copy_repo = copy_repo
+        self.outbox_repo = outbox_repo
+        self.audit = audit
 
     def borrow_book(self, book_id: int, reader_id: int, librarian_id: int) -> BorrowedBook:
         try:
             if not self.reader_repo.reader_exists(reader_id):
                 raise ValueError(f"Reader with ID {reader_id} not found")
 
-            if not self.book_repo.is_book_available(book_id):
-                raise ValueError("Book is not available for borrowing")
+            # A copy set aside for this reader's hold is already off the shelf count
+            ready_hold = self.hold_repo.get_ready_hold(book_id, reader_id, datetime.now(timezone.utc))
+
+            if ready_hold is not None:
+                copy_id = ready_hold.copy_id
+            else:
+                # Claiming a physical copy never waits on another desk's checkout of the same title;
+                # titles without registered copies fall back to the counter below
+                copy_id = self.copy_repo.claim_available(book_id)
+                if copy_id is None and (
+                        self.copy_repo.has_copies(book_id) or not self.book_repo.is_book_available(book_id)
+                ):
+                    raise ValueError("Book is not available for borrowing")
 
             if len(self.borrow_repo.get_active_borrowings(reader_id)) >= 3:
                 raise ValueError("Reader has reached the maximum number of borrowed books")
 
-            self.book_repo.decrease_book_copies(book_id)
+            if ready_hold is not None:
+                self.hold_repo.set_status(ready_hold, HOLD_FULFILLED)
+                if copy_id is not None:
+                    self.copy_repo.set_status(copy_id, COPY_ON_LOAN)
+            elif copy_id is None:
+                self.book_repo.decrease_book_copies(book_id)
 
-            return self.borrow_repo.create(book_id, reader_id, librarian_id)
+            due_date = datetime.now(timezone.utc) + timedelta(days=self.loan_settings.loan_period_days)
+            borrowing = self.borrow_repo.create(book_id, reader_id, librarian_id, due_date=due_date, copy_id=copy_id)
+            self.outbox_repo.add("borrowing.created", {
+                "borrowing_id": borrowing.id,
+                "book_id": book_id,
+                "reader_id": reader_id,
+                "librarian_id": librarian_id,
+                "copy_id": copy_id,
+                "due_date": due_date.isoformat(),
+            })
+            if self.audit:
+                self.audit.record(
+                    "borrowing.created", "borrowing", borrowing.id, librarian_id,
+                    {"book_id": book_id, "reader_id": reader_id, "copy_id": copy_id}
+                )
+            return borrowing
         except ValueError as e:
             raise
         except Exception as e:
             raise ValueError(f"Failed to borrow book {str(e)}") from e
 
-    def return_book(self, book_id: int, reader_id: int) -> BorrowedBook:
+    def return_book(self, book_id: int, reader_id: int, actor_id: Optional[int] = None) -> BorrowedBook:
         try:
             borrowing = self.borrow_repo.get_active_borrowing(book_id, reader_id)
             if not borrowing:
                 raise ValueError("No active borrowing record found")
 
-            self.book_repo.increase_book_copies(book_id)
+            # Either reserved for the next hold or put back on the shelf; committed with the return
+            hold = release_copy(
+                self.hold_repo, self.book_repo, self.copy_repo, book_id, self.loan_settings,
+                copy_id=borrowing.copy_id
+            )
+            self.outbox_repo.add("borrowing.returned", {
+                "borrowing_id": borrowing.id,
+                "book_id": book_id,
+                "reader_id": reader_id,
+                "copy_id": borrowing.copy_id,
+                "hold_id": hold.id if hold is not None else None,
+            })
 
-            return self.borrow_repo.mark_returned(borrowing.id)
+            returned = self.borrow_repo.mark_returned(borrowing.id)
+            if self.audit:
+                self.audit.record(
+                    "borrowing.returned", "borrowing", borrowing.id, actor_id,
+                    {"book_id": book_id, "reader_id": reader_id}
+                )
+            return returned
         except ValueError as e:
             raise
         except Exception as e:
             raise ValueError(f"Failed to borrow book {str(e)}") from e
 
-    def get_active_borrowings(self, reader_id: int) -> List[BorrowedBook]:
+    def renew_borrowing(self, borrowing_id: int, actor_id: Optional[int] = None) -> BorrowedBook:
         try:
+            borrowing = self.borrow_repo.get_by_id(borrowing_id)
+            if not borrowing:
+                raise ValueError("Borrowing not found")
+
+            if borrowing.returned_date is not None:
+                raise ValueError("Cannot renew a returned book")
+
+            if borrowing.due_date < datetime.now(timezone.utc):
+                raise ValueError("Cannot renew an overdue borrowing")
+
+            if borrowing.renewal_count >= self.loan_settings.max_renewals:
+                raise ValueError("Borrowing has reached the maximum number of renewals")
+
+            due_date = borrowing.due_date + timedelta(days=self.loan_settings.loan_period_days)
+            renewed = self.borrow_repo.renew(borrowing.id, due_date)
+            if self.audit:
+                self.audit.record(
+                    "borrowing.renewed", "borrowing", borrowing.id, actor_id, {"due_date": due_date.isoformat()}
+                )
+            return renewed
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to renew borrowing: {str(e)}") from e
+
+    def get_overdue_borrowings(
+            self,
+            cursor: Optional[str] = None,
+            limit: int = 50
+    ) -> Tuple[List[BorrowedBook], Optional[str]]:
+        try:
+            after = decode_cursor(cursor, datetime, int)
+            # One extra row tells whether another page exists without a separate count query
+            borrowings = self.borrow_repo.get_overdue(datetime.now(timezone.utc), limit + 1, after)
+
+            next_cursor = None
+            if len(borrowings) > limit:
+                borrowings = borrowings[:limit]
+                last = borrowings[-1]
+                next_cursor = encode_cursor(last.due_date, last.id)
+            return borrowings, next_cursor
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get overdue borrowings: {str(e)}") from e
+
+    def get_reader_history(
+            self,
+            reader_id: int,
+            cursor: Optional[str] = None,
+            limit: int = 50,
+            date_from: Optional[date] = None,
+            date_to: Optional[date] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        try:
+            if date_from and date_to and date_from > date_to:
+                raise ValueError("date_from must not be after date_to")
+
+            if not self.reader_repo.reader_exists(reader_id):
+                raise ValueError(f"Reader with ID {reader_id} not found")
+
+            history = self.borrow_repo.get_reader_history(
+                reader_id,
+                limit + 1,
+                after=decode_cursor(cursor, datetime, int),
+                date_from=datetime.combine(date_from, time.min, tzinfo=timezone.utc) if date_from else None,
+                date_to=datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+                if date_to else None
+            )
+
+            next_cursor = None
+            if len(history) > limit:
+                history = history[:limit]
+                last = history[-1]
+                next_cursor = encode_cursor(last.borrowed_date, last.id)
+            return history, next_cursor
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get reader history: {str(e)}") from e
+
+    def get_active_borrowings(self, reader_id: int, include: Optional[str] = None) -> List[BorrowedBook]:
+        try:
+            relations = self.parse_include(include)
             if not self.reader_repo.reader_exists(reader_id):
                 raise ValueError(f"Reader with ID {reader_id} not found")
-            return self.borrow_repo.get_active_borrowings(reader_id)
+            return self.borrow_repo.get_active_borrowings(reader_id, include=relations)
         except ValueError as e:
             raise
         except Exception as e:
             raise ValueError(f"Failed to borrow book: {str(e)}") from e
 
-    def get_all_active_borrowings(self) -> List[BorrowedBook]:
+    def get_all_active_borrowings(self, include: Optional[str] = None) -> List[BorrowedBook]:
         try:
-            return self.borrow_repo.get_all_borrowings()
+            return self.borrow_repo.get_all_borrowings(include=self.parse_include(include))
+        except ValueError as e:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to get all active borrowings: {str(e)}") from e
+
+    @staticmethod
+    def parse_include(include: Optional[str]) -> Set[str]:
+        relations = {name.strip() for name in (include or "").split(",") if name.strip()}
+        unknown = relations - RELATION_LOADERS.keys()
+        if unknown:
+            raise ValueError(
+                f"Cannot include {', '.join(sorted(unknown))}; expected any of {', '.join(RELATION_LOADERS)}"
+            )
+        return relations
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from typing import List
+
+from app.models import Fine
+from app.repositories.fine_repository import FineRepository
+from app.repositories.job_watermark_repository import JobWatermarkRepository
+from app.schemas.fine_schema import FineAccrualResponse
+from app.utils.settings import FineSettings
+
+FINE_ACCRUAL_JOB = "fine_accrual"
+
+
+class FineService:
+    def __init__(
+            self,
+            fine_repo: FineRepository,
+            watermark_repo: JobWatermarkRepository,
+            fine_settings: FineSettings,
+    ):
+        self.fine_repo = fine_repo
+        self.watermark_repo = watermark_repo
+        self.fine_settings = fine_settings
+
+    def accrue_fines(self) -> FineAccrualResponse:
+        try:
+            # The watermark is the start of the run: loans returned while it runs are caught next time
+            now = datetime.now(timezone.utc)
+            since = self.watermark_repo.get(FINE_ACCRUAL_JOB)
+
+            processed = self.fine_repo.accrue(
+                now=now,
+                since=since,
+                fine_per_day=self.fine_settings.fine_per_day,
+                max_fine=self.fine_settings.max_fine
+            )
+            self.watermark_repo.set(FINE_ACCRUAL_JOB, now)
+            return FineAccrualResponse(processed=processed, watermark=now)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to accrue fines: {str(e)}") from e
+
+    def get_reader_fines(self, reader_id: int) -> List[Fine]:
+        try:
+            return self.fine_repo.get_by_reader(reader_id)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get reader fines: {str(e)}") from e
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from app.models import Hold
+from app.models.hold_model import HOLD_CANCELLED, HOLD_EXPIRED, HOLD_READY, HOLD_WAITING
+from app.models.book_copy_model import COPY_AVAILABLE, COPY_ON_HOLD
+from app.repositories.book_copy_repository import BookCopyRepository
+from app.repositories.book_repository import BookRepository
+from app.repositories.hold_repository import HoldRepository
+from app.repositories.reader_repository import ReaderRepository
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.settings import LoanSettings
+
+EXPIRE_BATCH_SIZE = 500
+
+
+def release_copy(
+        hold_repo: HoldRepository,
+        book_repo: BookRepository,
+        copy_repo: BookCopyRepository,
+        book_id: int,
+        loan_settings: LoanSettings,
+        copy_id: Optional[int] = None
+) -> Optional[Hold]:
+    """Hand a copy that just came back to the first waiting hold, or return it to the shelf.
+
+    `copy_id` is the physical copy for titles with per-copy stock; without it the title's counter
+    is used instead.
+    """
+    ready_until = datetime.now(timezone.utc) + timedelta(days=loan_settings.hold_pickup_days)
+    hold = hold_repo.allocate_next(book_id, ready_until, copy_id=copy_id)
+    if copy_id is not None:
+        copy_repo.set_status(copy_id, COPY_AVAILABLE if hold is None else COPY_ON_HOLD)
+    elif hold is None:
+        book_repo.increase_book_copies(book_id)
+    return hold
+
+
+class HoldService:
+    def __init__(
+            self,
+            hold_repo: HoldRepository,
+            book_repo: BookRepository,
+            reader_repo: ReaderRepository,
+            loan_settings: LoanSettings,
+            copy_repo: BookCopyRepository,
+            unit_of_work: Optional[UnitOfWork] = None,
+    ):
+        self.hold_repo = hold_repo
+        self.book_repo = book_repo
+        self.reader_repo = reader_repo
+        self.loan_settings = loan_settings
+        self.copy_repo = copy_repo
+        self.unit_of_work = unit_of_work
+
+    def place_hold(self, book_id: int, reader_id: int) -> Tuple[Hold, int]:
+        try:
+            if not self.reader_repo.reader_exists(reader_id):
+                raise ValueError(f"Reader with ID {reader_id} not found")
+
+            if not self.book_repo.exists(id=book_id):
+                raise ValueError("Book not found")
+
+            if self.book_repo.is_book_available(book_id):
+                raise ValueError("Book is available, borrow it instead of placing a hold")
+
+            if self.hold_repo.get_open_hold(book_id, reader_id):
+                raise ValueError("Reader already has a hold on this book")
+
+            hold = self.hold_repo.create(book_id, reader_id)
+            return hold, self.hold_repo.get_position(hold)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to place hold: {str(e)}") from e
+
+    def cancel_hold(self, hold_id: int) -> Hold:
+        try:
+            hold = self.hold_repo.get_by_id(hold_id)
+            if not hold:
+                raise ValueError("Hold not found")
+
+            if hold.status not in (HOLD_WAITING, HOLD_READY):
+                raise ValueError(f"Cannot cancel a {hold.status} hold")
+
+            was_ready = hold.status == HOLD_READY
+            self.hold_repo.set_status(hold, HOLD_CANCELLED)
+            if was_ready:
+                # The copy set aside for this reader goes to the next in line
+                release_copy(
+                    self.hold_repo, self.book_repo, self.copy_repo, hold.book_id, self.loan_settings,
+                    copy_id=hold.copy_id
+                )
+            return hold
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to cancel hold: {str(e)}") from e
+
+    def expire_ready_holds(self) -> int:
+        try:
+            now = datetime.now(timezone.utc)
+            expired = 0
+            # One hold per transaction, so the row lock covers both the expiry and the hand-over
+            while expired < EXPIRE_BATCH_SIZE:
+                hold = self.hold_repo.get_next_expired_ready(now)
+                if hold is None:
+                    break
+                self.hold_repo.set_status(hold, HOLD_EXPIRED)
+                release_copy(
+                    self.hold_repo, self.book_repo, self.copy_repo, hold.book_id, self.loan_settings,
+                    copy_id=hold.copy_id
+                )
+                if self.unit_of_work:
+                    self.unit_of_work.commit()
+                expired += 1
+            return expired
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to expire holds: {str(e)}") from e
+
+    def get_reader_holds(self, reader_id: int) -> List[Tuple[Hold, Optional[int]]]:
+        try:
+            if not self.reader_repo.reader_exists(reader_id):
+                raise ValueError(f"Reader with ID {reader_id} not found")
+            return self.hold_repo.get_by_reader_with_positions(reader_id)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get reader holds: {str(e)}") from e
@@ -5,52 +5,62 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.models import Librarian
 from app.repositories.librarian_repository import LibrarianRepository
 from app.schemas.librarian_schema import LibrarianCreate, LibrarianUpdate, LibrarianRepoCreate, LibrarianRepoUpdate
+from app.utils.audit_writer import TransactionAudit
 from app.utils.security import PasswordSecurity
 
 class LibrarianService:
-    def __init__(self, repository: LibrarianRepository, password_security: PasswordSecurity):
+    def __init__(
+            self,
+            repository: LibrarianRepository,
+            password_security: PasswordSecurity,
+            audit: Optional[TransactionAudit] = None
+    ):
         self.repository = repository
         self.password_security = password_security
+        self.audit = audit
 
     def create(self, data: LibrarianCreate) -> Librarian:
         try:
-            if self.repository.get_by_email(data.person.email):
-                raise ValueError("Email already in use")
-
             hashed_password = self.password_security.get_password_hash(data.password)
             repo_data = LibrarianRepoCreate(
                 person=data.person,
                 hashed_password=hashed_password
             )
-            return self.repository.create(repo_data)
+            librarian = self.repository.create(repo_data)
+            if self.audit:
+                self.audit.record("librarian.created", "librarian", librarian.id, librarian.id)
+            return librarian
         except ValueError as e:
             raise
         except Exception as e:
             raise ValueError(f"Failed to create librarian: {str(e)}") from e
 
 
-    def update(self, id: int, data: LibrarianUpdate) -> Librarian:
+    def update(self, id: int, data: LibrarianUpdate, actor_id: Optional[int] = None) -> Librarian:
         try:
             existing_librarian = self.repository.get_by_id(id)
             if not existing_librarian:
                 raise ValueError("Librarian not found")
 
-            if data.person and data.person.email and data.person.email != existing_librarian.person.email:
-                if self.repository.get_by_email(data.person.email):
-                    raise ValueError("New email already in use")
-
             repo_update_data = LibrarianRepoUpdate(person=data.person)
-            return self.repository.update(id, repo_update_data)
+            librarian = self.repository.update(id, repo_update_data)
+            if self.audit:
+                fields = sorted(data.person.model_dump(exclude_unset=True)) if data.person else []
+                self.audit.record("librarian.updated", "librarian", id, actor_id, {"fields": fields})
+            return librarian
         except Exception as e:
             raise ValueError(f"Failed to update librarian: {str(e)}") from e
 
-    def delete(self, id: int) -> bool:
+    def delete(self, id: int, actor_id: Optional[int] = None) -> bool:
         try:
             librarian = self.repository.get_by_id(id)
             if not librarian:
                 raise ValueError("Librarian not found")
 
-            return self.repository.delete(id)
+            deleted = self.repository.delete(id)
+            if deleted and self.audit:
+                self.audit.record("librarian.deleted", "librarian", id, actor_id)
+            return deleted
         except Exception as e:
             raise ValueError(f"Failed to delete librarian: {str(e)}") from e
 
@@ -1,48 +1,69 @@
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
 
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models import Reader
 from app.repositories.reader_repository import ReaderRepository
 from app.schemas.reader_schema import ReaderCreate, ReaderUpdate
+from app.utils.audit_writer import TransactionAudit
+from app.utils.exceptions import PreconditionFailedError
+
+
+MAX_BATCH_SIZE = 100
 
 
 class ReaderService:
-    def __init__(self, repository: ReaderRepository):
+    def __init__(self, repository: ReaderRepository, audit: Optional[TransactionAudit] = None):
         self.repository = repository
+        self.audit = audit
 
-    def create(self, data: ReaderCreate) -> Reader:
+    def create(self, data: ReaderCreate, actor_id: Optional[int] = None) -> Reader:
         try:
-            if self.repository.get_by_email(data.person.email):
-                raise ValueError("Email already in use")
-
-            return self.repository.create(data)
+            reader = self.repository.create(data)
+            if self.audit:
+                self.audit.record("reader.created", "reader", reader.id, actor_id)
+            return reader
         except ValueError as e:
             raise
         except Exception as e:
             raise ValueError(f"Failed to create reader: {str(e)}") from e
 
-    def update(self, id: int, data: ReaderUpdate) -> Reader:
+    def update(
+            self,
+            id: int,
+            data: ReaderUpdate,
+            expected_version: Optional[int] = None,
+            actor_id: Optional[int] = None
+    ) -> Reader:
         try:
             existing_reader = self.repository.get_by_id(id)
             if not existing_reader:
                 raise ValueError("Reader not found")
 
-            if data.person and data.person.email and data.person.email != existing_reader.person.email:
-                if self.repository.get_by_email(data.person.email):
-                    raise ValueError("New email already in use")
-
-            return self.repository.update(id, data)
+            if expected_version is not None:
+                reader = self.repository.update(id, data, expected_version=expected_version)
+            else:
+                reader = self.repository.update(id, data)
+            if self.audit:
+                # Field names only: the trail should not become a second copy of personal data
+                fields = sorted(data.person.model_dump(exclude_unset=True)) if data.person else []
+                self.audit.record("reader.updated", "reader", id, actor_id, {"fields": fields})
+            return reader
+        except PreconditionFailedError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to update reader: {str(e)}") from e
 
-    def delete(self, id: int) -> bool:
+    def delete(self, id: int, actor_id: Optional[int] = None) -> bool:
         try:
             reader = self.repository.get_by_id(id)
             if not reader:
                 raise ValueError("Reader not found")
 
-            return self.repository.delete(id)
+            deleted = self.repository.delete(id)
+            if deleted and self.audit:
+                self.audit.record("reader.deleted", "reader", id, actor_id)
+            return deleted
         except ValueError as e:
             if "Cannot delete reader with borrowed books" in str(e):
                 raise ValueError(
@@ -80,6 +101,17 @@ class ReaderService:
         except Exception as e:
             raise ValueError(f"Failed to get reader: {str(e)}") from e
 
+    def get_many(self, ids: Sequence[int]) -> Tuple[List[Reader], List[int]]:
+        try:
+            ids = list(dict.fromkeys(ids))
+            if len(ids) > MAX_BATCH_SIZE:
+                raise ValueError(f"Cannot request more than {MAX_BATCH_SIZE} readers at once")
+            return self.repository.get_many(ids)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get readers: {str(e)}") from e
+
     def get_all(self) -> List[Reader]:
         try:
             readers = self.repository.get_all()
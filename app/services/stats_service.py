@@ -0,0 +1,77 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from app.models import DailyLoanStat
+from app.repositories.job_watermark_repository import JobWatermarkRepository
+from app.repositories.stats_repository import StatsRepository
+from app.schemas.stats_schema import ActiveReadersResponse, StatsRefreshResponse
+from app.utils.settings import StatsSettings
+
+STATS_REFRESH_JOB = "circulation_stats"
+
+
+class StatsService:
+    def __init__(
+            self,
+            stats_repo: StatsRepository,
+            watermark_repo: JobWatermarkRepository,
+            stats_settings: StatsSettings,
+    ):
+        self.stats_repo = stats_repo
+        self.watermark_repo = watermark_repo
+        self.stats_settings = stats_settings
+
+    def refresh(self) -> StatsRefreshResponse:
+        try:
+            now = datetime.now(timezone.utc)
+            since = self.watermark_repo.get(STATS_REFRESH_JOB)
+
+            # Without a watermark there is nothing to be incremental about, so rebuild every day
+            days = None if since is None else self.stats_repo.get_touched_days(since)
+            if days is None or days:
+                self.stats_repo.refresh_days(days)
+
+            self.watermark_repo.set(STATS_REFRESH_JOB, now)
+            return StatsRefreshResponse(refreshed_days=None if days is None else len(days), watermark=now)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to refresh stats: {str(e)}") from e
+
+    def get_top_books(self, date_from: Optional[date], date_to: Optional[date], limit: int) -> List[dict]:
+        try:
+            date_from, date_to = self._period(date_from, date_to)
+            return self.stats_repo.get_top_books(date_from, date_to, limit)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get top books: {str(e)}") from e
+
+    def get_active_readers(self, date_from: Optional[date], date_to: Optional[date]) -> ActiveReadersResponse:
+        try:
+            date_from, date_to = self._period(date_from, date_to)
+            return ActiveReadersResponse(
+                date_from=date_from,
+                date_to=date_to,
+                active_readers=self.stats_repo.count_active_readers(date_from, date_to)
+            )
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get active readers: {str(e)}") from e
+
+    def get_loans_per_day(self, date_from: Optional[date], date_to: Optional[date]) -> List[DailyLoanStat]:
+        try:
+            date_from, date_to = self._period(date_from, date_to)
+            return self.stats_repo.get_loans_per_day(date_from, date_to)
+        except ValueError as e:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to get loans per day: {str(e)}") from e
+
+    def _period(self, date_from: Optional[date], date_to: Optional[date]) -> Tuple[date, date]:
+        date_to = date_to or datetime.now(timezone.utc).date()
+        date_from = date_from or date_to - timedelta(days=self.stats_settings.stats_default_period_days - 1)
+        if date_from > date_to:
+            raise ValueError("date_from must not be after date_to")
+        return date_from, date_to
@@ -0,0 +1,147 @@
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.repositories.audit_log_repository import AuditLogRepository
+from app.repositories.unit_of_work import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Write audit entries from a background thread in multi-row batches.
+
+    `record` only enqueues, so a request pays for a queue put rather than an extra commit. The
+    writer takes everything already waiting, up to `batch_size` entries, and inserts it with one
+    statement; under load batches fill up, when idle it wakes every `flush_interval` seconds.
+    The queue is bounded: when the database falls behind, producers block for at most
+    `enqueue_timeout` seconds and the entry is then dropped and counted rather than letting
+    memory grow or stalling requests indefinitely. `stop` drains the queue before returning.
+    """
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session],
+            max_queue_size: int = 10000,
+            batch_size: int = 200,
+            flush_interval: float = 1.0,
+            enqueue_timeout: float = 0.05,
+            repository_factory: Callable[[Session], AuditLogRepository] = AuditLogRepository,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.repository_factory = repository_factory
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def record(
+            self,
+            action: str,
+            entity_type: str,
+            entity_id: Optional[int] = None,
+            actor_id: Optional[int] = None,
+            details: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        entry = {
+            "actor_id": actor_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details,
+            "occurred_at": datetime.now(timezone.utc),
+        }
+        try:
+            self._queue.put(entry, timeout=self.enqueue_timeout)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning("Audit queue is full, dropped %s entry for %s %s", action, entity_type, entity_id)
+            return False
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                # Take whatever else is already waiting, up to a full batch, without blocking
+                while not stopping and len(batch) < self.batch_size:
+                    item = self._queue.get_nowait()
+                    if item is _STOP:
+                        stopping = True
+                    else:
+                        batch.append(item)
+            except queue.Empty:
+                pass
+
+            if batch:
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with UnitOfWork.begin(self.session_factory) as unit_of_work:
+                self.repository_factory(unit_of_work.session).add_many(batch)
+        except Exception:
+            logger.exception("Failed to write %d audit entries", len(batch))
+
+
+class TransactionAudit:
+    """Audit entries of one session's transactions, handed to `writer` only once they commit.
+
+    Entries recorded during a request wait until its unit of work commits and are dropped if it
+    rolls back, so a failed commit never leaves an audit row for an operation that did not happen.
+    """
+
+    def __init__(self, writer: AuditWriter, session: Session):
+        self.writer = writer
+        self._pending: List[Tuple[Any, ...]] = []
+        event.listen(session, "after_commit", self._release)
+        event.listen(session, "after_rollback", self._discard)
+
+    def record(
+            self,
+            action: str,
+            entity_type: str,
+            entity_id: Optional[int] = None,
+            actor_id: Optional[int] = None,
+            details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._pending.append((action, entity_type, entity_id, actor_id, details))
+
+    def _release(self, session: Session) -> None:
+        pending, self._pending = self._pending, []
+        for entry in pending:
+            self.writer.record(*entry)
+
+    def _discard(self, session: Session) -> None:
+        self._pending = []
@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+T = TypeVar("T")
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with a per-entry time to live."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def detached_snapshot(instance: T, *relationships: str) -> T:
+    """Copies the loaded columns (and the named to-one relationships) of an ORM object into a
+    detached instance that belongs to no session, so it can be shared between requests."""
+    snapshot = _copy_columns(instance)
+    related_snapshots = []
+    for name in relationships:
+        related = getattr(instance, name)
+        if related is not None:
+            related_snapshots.append(_copy_columns(related))
+            setattr(snapshot, name, related_snapshots[-1])
+    # Only after wiring: detaching resets attribute history, so the copies do not look modified
+    for related in related_snapshots:
+        make_transient_to_detached(related)
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def _copy_columns(instance: T) -> T:
+    mapper = inspect(instance).mapper
+    return mapper.class_(**{attr.key: getattr(instance, attr.key) for attr in mapper.column_attrs})
+
+
+def attach(db: Session, snapshot: T) -> T:
+    """Returns a copy of a cached snapshot that is persistent in ``db``, without emitting SQL;
+    lazy loads and writes through it work as on a freshly queried object."""
+    return db.merge(snapshot, load=False)
@@ -0,0 +1,105 @@
+import logging
+import select as select_module
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.utils.cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+BOOK_CACHE = "book"
+PRINCIPAL_CACHE = "librarian"
+
+
+def publish_invalidation(db: Session, cache_name: str, key: Hashable) -> None:
+    """Queues ``NOTIFY`` in the session's current transaction.
+
+    Postgres delivers it to every listening worker when the transaction commits and drops it
+    on rollback, so other workers never evict for a write that did not happen.
+    """
+    db.execute(select(func.pg_notify(CHANNEL, f"{cache_name}:{key}")))
+
+
+class InvalidationListener:
+    """Evicts cache entries named in ``NOTIFY`` messages sent by any worker.
+
+    Runs on its own thread with a dedicated autocommit connection. Messages sent while the
+    connection is down are lost, so after a reconnect every cache is cleared rather than
+    trusted.
+    """
+
+    def __init__(
+            self,
+            connection_factory: Callable[[], Any],
+            caches: Dict[str, LocalCache],
+            channel: str = CHANNEL,
+            poll_timeout: float = 1.0,
+            reconnect_delay: float = 1.0,
+    ):
+        self.connection_factory = connection_factory
+        self.caches = caches
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def handle(self, payload: str) -> None:
+        cache_name, _, key = payload.partition(":")
+        cache = self.caches.get(cache_name)
+        if cache is None:
+            return
+        cache.delete(int(key) if key.isdigit() else key)
+
+    def clear_all(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+
+    def _run(self) -> None:
+        connected_before = False
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = self.connection_factory()
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                if connected_before:
+                    self.clear_all()
+                connected_before = True
+                self._listen(connection)
+            except Exception:
+                logger.exception("Cache invalidation listener lost its connection, clearing caches")
+                self.clear_all()
+                self._stopping.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _listen(self, connection: Any) -> None:
+        while not self._stopping.is_set():
+            readable, _, _ = select_module.select([connection], [], [], self.poll_timeout)
+            if not readable:
+                continue
+            connection.poll()
+            while connection.notifies:
+                self.handle(connection.notifies.pop(0).payload)
@@ -0,0 +1,19 @@
+from typing import Optional
+
+
+def make_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(header: Optional[str]) -> Optional[int]:
+    """Return the version named by an If-Match header, or None when the update is unconditional.
+
+    Only a single strong validator is accepted: weak tags cannot be used for If-Match, and a list
+    of tags has no use when every representation of a resource shares one version counter.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    tag = header.strip()
+    if len(tag) < 3 or not (tag.startswith('"') and tag.endswith('"')) or not tag[1:-1].isdigit():
+        raise ValueError("If-Match must be a single ETag previously returned by the API")
+    return int(tag[1:-1])
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Set
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.unit_of_work import UnitOfWork
+
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class StreamEvent(NamedTuple):
+    id: int
+    event_type: str
+    payload: Dict[str, Any]
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.event_type}\ndata: {json.dumps(self.payload)}\n\n"
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: "asyncio.Queue[StreamEvent]" = asyncio.Queue(maxsize=queue_size)
+        # Set when the subscriber fell too far behind; it drains what it has and must reconnect
+        self.closed = False
+
+
+class EventBroadcaster:
+    """Fan outbox events out to every SSE subscriber from a single poller per process.
+
+    However many dashboards are connected, the outbox is read by one query per poll interval. The
+    poller starts with the first subscriber and stops with the last. Outbox ids are allocated
+    before commit, so a lower id can become visible after a higher one; the poller waits up to
+    `gap_timeout` seconds for such a gap to fill before moving past it (it may be a rolled-back
+    insert), which keeps delivery in id order without losing late commits.
+    """
+
+    def __init__(
+            self,
+            session_factory: Callable[[], Session],
+            poll_interval: float = 1.0,
+            queue_size: int = 1000,
+            batch_size: int = 500,
+            gap_timeout: float = 5.0,
+            retention_days: int = 7,
+            repository_factory: Callable[[Session], OutboxRepository] = OutboxRepository,
+    ):
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.gap_timeout = gap_timeout
+        self.retention = timedelta(days=retention_days)
+        self._subscribers: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_id: Optional[int] = None
+        self._gap_since: Optional[float] = None
+        self._last_purge = 0.0
+
+    async def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        if self._task is None or self._task.done():
+            if self._last_id is None:
+                self._last_id = await run_in_threadpool(self._call, "get_last_id")
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def replay(self, last_id: int) -> AsyncIterator[StreamEvent]:
+        """Events after `last_id` that the poller has already published, for Last-Event-ID replay.
+
+        Stops at the poller's position, which is past any gap it waited on; a late commit below
+        that position has been given `gap_timeout` to appear. Everything after it reaches a
+        subscriber through its queue in id order, so subscribe before replaying.
+        """
+        published_id = self._last_id
+        while published_id is not None and last_id < published_id:
+            backlog = await self.read_after(last_id)
+            for event in backlog:
+                if event.id > published_id:
+                    return
+                last_id = event.id
+                yield event
+            if len(backlog) < self.batch_size:
+                return
+
+    async def read_after(self, last_id: int) -> List[StreamEvent]:
+        """Committed events after `last_id`, straight from the outbox."""
+        events = await run_in_threadpool(self._call, "get_after", last_id, self.batch_size)
+        return [StreamEvent(event.id, event.event_type, event.payload) for event in events]
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll()
+            except ValueError:
+                # A failed poll is retried on the next tick; subscribers just see a late event
+                pass
+
+    async def _poll(self) -> None:
+        for event in await self.read_after(self._last_id):
+            if event.id != self._last_id + 1:
+                now = time.monotonic()
+                if self._gap_since is None:
+                    self._gap_since = now
+                if now - self._gap_since < self.gap_timeout:
+                    break
+            self._gap_since = None
+            self._last_id = event.id
+            self._publish(event)
+
+        if time.monotonic() - self._last_purge > PURGE_INTERVAL_SECONDS:
+            self._last_purge = time.monotonic()
+            await run_in_threadpool(self._call, "purge_before", datetime.now(timezone.utc) - self.retention)
+
+    def _publish(self, event: StreamEvent) -> None:
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.closed = True
+                self._subscribers.discard(subscription)
+
+    def _call(self, method: str, *args):
+        with UnitOfWork.begin(self.session_factory) as unit_of_work:
+            return getattr(self.repository_factory(unit_of_work.session), method)(*args)
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+
+class PreconditionFailedError(ValueError):
+    """The resource changed since the client read it (its If-Match no longer holds)."""
+
+
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    """Name of the constraint Postgres reports for an integrity error, if any."""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
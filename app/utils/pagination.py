@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last row of a page into an opaque keyset cursor."""
+    raw = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str], *types: type) -> Optional[Tuple[Any, ...]]:
+    """Unpack a cursor produced by encode_cursor, converting each value to the given type."""
+    if not cursor:
+        return None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(raw) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if value_type is datetime else value_type(value)
+            for value, value_type in zip(raw, types)
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
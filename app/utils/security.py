@@ -1,12 +1,34 @@
+import time
+from typing import Optional
+
 from passlib.context import CryptContext
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
+from app.utils.metrics import REGISTRY
+
+PASSWORD_VERIFY_SECONDS = REGISTRY.histogram(
+    "password_verify_seconds",
+    "Time spent verifying a password hash, by bcrypt cost factor",
+    label_names=("cost",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 3.2)
+)
+
 
 class SecuritySettings(BaseSettings):
     secret_key: SecretStr
     algorithm: str
     access_token_expire_minutes: int
+    refresh_token_expire_days: int = 30
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class PasswordSettings(BaseSettings):
+    bcrypt_rounds: int = 12
 
     class Config:
         env_file = ".env"
@@ -15,8 +37,16 @@ class SecuritySettings(BaseSettings):
 
 
 class PasswordSecurity:
-    def __init__(self):
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def __init__(self, rounds: int = 12):
+        # Pinning min and max to the policy makes any stored hash with a different
+        # cost "need update", so lowering the cost is rolled out the same way as raising it.
+        self._pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds
+        )
         self._min_password_length = 8
 
     def get_password_hash(self, password: SecretStr) -> str:
@@ -24,7 +54,26 @@ class PasswordSecurity:
 
     def verify_password(self, password: SecretStr, hashed_password: str) -> bool:
         self._validate_password(password)
-        return self._pwd_context.verify(password.get_secret_value(), hashed_password)
+        started = time.perf_counter()
+        try:
+            return self._pwd_context.verify(password.get_secret_value(), hashed_password)
+        finally:
+            PASSWORD_VERIFY_SECONDS.observe(time.perf_counter() - started, cost=self._cost_label(hashed_password))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self._pwd_context.needs_update(hashed_password)
+
+    @staticmethod
+    def get_cost(hashed_password: str) -> Optional[int]:
+        # Modular crypt format: $2b$<cost>$<salt+checksum>
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    def _cost_label(self, hashed_password: str) -> str:
+        cost = self.get_cost(hashed_password)
+        return str(cost) if cost is not None else "unknown"
 
     def _validate_password(self, password: SecretStr) -> None:
         if len(password.get_secret_value()) < self._min_password_length:
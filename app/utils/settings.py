@@ -0,0 +1,124 @@
+from decimal import Decimal
+
+from pydantic_settings import BaseSettings
+
+
+class LoanSettings(BaseSettings):
+    loan_period_days: int = 14
+    max_renewals: int = 2
+    hold_pickup_days: int = 3
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class FineSettings(BaseSettings):
+    fine_per_day: Decimal = Decimal("10.00")
+    max_fine: Decimal = Decimal("500.00")
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class StatsSettings(BaseSettings):
+    stats_cache_max_age: int = 300
+    stats_default_period_days: int = 30
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class CompressionSettings(BaseSettings):
+    compression_minimum_size: int = 1024
+    compression_level: int = 6
+    compression_cache_size: int = 128
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class IdempotencySettings(BaseSettings):
+    idempotency_ttl_hours: int = 24
+    # Longer than any request may run, so a live request is never taken over by its retry
+    idempotency_lock_seconds: int = 300
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class EventStreamSettings(BaseSettings):
+    event_poll_interval: float = 1.0
+    event_heartbeat_seconds: int = 15
+    event_subscriber_queue_size: int = 1000
+    event_retention_days: int = 7
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class AuditSettings(BaseSettings):
+    audit_queue_size: int = 10000
+    audit_batch_size: int = 200
+    audit_flush_interval: float = 1.0
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class TokenDenylistSettings(BaseSettings):
+    denylist_capacity: int = 100000
+    denylist_error_rate: float = 0.001
+    denylist_refresh_seconds: float = 5.0
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class CacheSettings(BaseSettings):
+    principal_cache_size: int = 1024
+    principal_cache_ttl_seconds: float = 60.0
+    book_cache_size: int = 4096
+    book_cache_ttl_seconds: float = 30.0
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+class AdmissionSettings(BaseSettings):
+    # Defaults add up to the engine's default pool (5 connections plus 10 overflow)
+    admission_auth_concurrency: int = 4
+    admission_auth_statement_timeout_ms: int = 2000
+    admission_checkout_concurrency: int = 4
+    admission_checkout_statement_timeout_ms: int = 3000
+    admission_catalog_concurrency: int = 4
+    admission_catalog_statement_timeout_ms: int = 2000
+    admission_write_concurrency: int = 2
+    admission_write_statement_timeout_ms: int = 3000
+    admission_export_concurrency: int = 1
+    admission_export_statement_timeout_ms: int = 30000
+    admission_max_wait_seconds: float = 0.5
+    admission_max_queue: int = 50
+    admission_retry_after_seconds: int = 1
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
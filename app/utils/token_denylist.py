@@ -0,0 +1,95 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional, Tuple
+
+from app.utils.bloom_filter import BloomFilter
+
+# (jti, librarian_id, created_at) of a revocation; jti is None when every session of the librarian was revoked
+Revocation = Tuple[Optional[str], int, datetime]
+RevocationLoader = Callable[[Optional[datetime]], Iterable[Revocation]]
+
+
+def jti_key(jti: str) -> str:
+    return f"jti:{jti}"
+
+
+def librarian_key(librarian_id: int) -> str:
+    return f"lid:{librarian_id}"
+
+
+class TokenDenylist:
+    """Per-worker Bloom filter over the revoked tokens table.
+
+    A miss means "not revoked" and needs no database access; a hit still has to be confirmed
+    against the table. The filter is topped up with rows newer than the last load every
+    ``refresh_interval`` seconds, so a revocation made by another worker is seen within that window.
+    """
+
+    def __init__(
+            self,
+            capacity: int = 100_000,
+            error_rate: float = 0.001,
+            refresh_interval: float = 5.0,
+            overlap: timedelta = timedelta(seconds=30)
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        # Rows are re-read this far behind the watermark, so one committed late is not skipped
+        self.overlap = overlap
+        self._filter = BloomFilter(capacity, error_rate)
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """False until the first full load succeeds; an empty filter must not be trusted before then."""
+        return self._loaded
+
+    def might_be_revoked(self, jti: Optional[str], librarian_id: Optional[int]) -> bool:
+        bloom = self._filter
+        return (jti is not None and jti_key(jti) in bloom) or (
+            librarian_id is not None and librarian_key(librarian_id) in bloom
+        )
+
+    def add(self, jti: Optional[str], librarian_id: int) -> None:
+        self._add(self._filter, jti_key(jti) if jti else librarian_key(librarian_id))
+
+    def refresh(self, loader: RevocationLoader, force: bool = False) -> bool:
+        """Loads new revocations if the interval has passed. Returns False if nothing was done,
+        including when another request is already refreshing."""
+        if not force and time.monotonic() < self._next_refresh:
+            return False
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if not self._loaded or self._filter.is_saturated():
+                # Full rebuild: the loader only returns unexpired rows, so this also drops expired ones
+                bloom = BloomFilter(self.capacity, self.error_rate)
+                self._watermark = self._load_into(bloom, loader(None), None)
+                self._filter = bloom
+                self._loaded = True
+            else:
+                since = self._watermark - self.overlap if self._watermark else None
+                self._watermark = self._load_into(self._filter, loader(since), self._watermark)
+            self._next_refresh = time.monotonic() + self.refresh_interval
+            return True
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _load_into(bloom: BloomFilter, rows: Iterable[Revocation], watermark: Optional[datetime]) -> Optional[datetime]:
+        for jti, librarian_id, created_at in rows:
+            TokenDenylist._add(bloom, jti_key(jti) if jti else librarian_key(librarian_id))
+            if watermark is None or created_at > watermark:
+                watermark = created_at
+        return watermark
+
+    @staticmethod
+    def _add(bloom: BloomFilter, key: str) -> None:
+        # The overlap re-reads rows; skipping known keys keeps them from counting towards capacity twice
+        if key not in bloom:
+            bloom.add(key)
@@ -0,0 +1,57 @@
+"""Per-call Python overhead of the hot repository queries, plain ``select()`` vs ``lambda_stmt``.
+
+Runs against an in-memory SQLite database so only SQLAlchemy's own work is measured:
+building the statement, generating its cache key, looking up the compiled form and
+binding parameters. Both variants run the same three statements through the same
+``db.execute(...).scalar_one_or_none()`` call, so the construct is the only difference;
+the database round trip is identical either way.
+
+    python -m benchmarks.statement_cache [iterations]
+"""
+import sys
+import timeit
+
+from sqlalchemy import and_, create_engine, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.models import Book, BookCopy, Person, Reader
+from app.models.borrowed_book_model import BorrowedBook
+
+ITERATIONS = 20000
+
+
+def plain_queries(db: Session, id: int) -> None:
+    db.execute(select(Book).where(Book.id == id)).scalar_one_or_none()
+    db.execute(select(Reader).join(Person).where(Reader.id == id)).scalar_one_or_none()
+    db.execute(select(BorrowedBook).where(and_(
+        BorrowedBook.book_id == id,
+        BorrowedBook.reader_id == id,
+        BorrowedBook.returned_date.is_(None)
+    ))).scalar_one_or_none()
+
+
+def cached_queries(db: Session, id: int) -> None:
+    # The same statements as the repositories' get_by_id and get_active_borrowing, wrapped in lambda_stmt
+    db.execute(lambda_stmt(lambda: select(Book).where(Book.id == id))).scalar_one_or_none()
+    db.execute(lambda_stmt(lambda: select(Reader).join(Person).where(Reader.id == id))).scalar_one_or_none()
+    db.execute(lambda_stmt(lambda: select(BorrowedBook).where(and_(
+        BorrowedBook.book_id == id,
+        BorrowedBook.reader_id == id,
+        BorrowedBook.returned_date.is_(None)
+    )))).scalar_one_or_none()
+
+
+def main(iterations: int = ITERATIONS) -> None:
+    engine = create_engine("sqlite://")
+    tables = [model.__table__ for model in (Book, BookCopy, Person, Reader, BorrowedBook)]
+    Book.metadata.create_all(engine, tables=tables)
+
+    with Session(engine) as db:
+        for name, queries in (("select()", plain_queries), ("lambda_stmt", cached_queries)):
+            queries(db, 0)  # warm the compiled cache
+            seconds = timeit.timeit(lambda: queries(db, 1), number=iterations)
+            print(f"{name:12} {seconds / iterations / 3 * 1e6:8.1f} us per query")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS)
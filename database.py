@@ -1,21 +1,73 @@
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.metrics import REGISTRY
+
 load_dotenv()
 SQLALCHEMY_DATABASE_URL = os.getenv('DATABASE_URL')
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+STATEMENT_CACHE = REGISTRY.counter(
+    "sql_compiled_cache_total", "Statements executed, by outcome of the compiled-statement cache lookup",
+    ["result"]
+)
+_CACHE_RESULTS = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+    CacheStats.CACHING_DISABLED: "disabled",
+    CacheStats.NO_CACHE_KEY: "uncacheable",
+    CacheStats.NO_DIALECT_SUPPORT: "unsupported",
+}
+
+
+def create_db_engine(url: Optional[str] = None) -> Engine:
+    engine = create_engine(url or SQLALCHEMY_DATABASE_URL)
+    record_statement_cache(engine)
+    return engine
+
+
+def record_statement_cache(engine: Engine) -> None:
+    """Counts compiled-cache hits and misses per executed statement, for ``GET /metrics``."""
+    @event.listens_for(engine, "after_cursor_execute")
+    def count_cache_lookup(connection, cursor, statement, parameters, context, executemany):
+        STATEMENT_CACHE.inc(result=_CACHE_RESULTS.get(context.cache_hit, "uncacheable"))
+
+
+def create_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def apply_statement_timeout(db: Session, timeout_ms: int) -> None:
+    """Sets ``statement_timeout`` for every transaction the session begins.
+
+    Transaction-local (``SET LOCAL``), so the pooled connection goes back with the server default.
+    """
+    @event.listens_for(db, "after_begin")
+    def set_statement_timeout(session, transaction, connection):
+        connection.execute(select(func.set_config("statement_timeout", str(timeout_ms), True)))
+
+
+def get_unit_of_work(request: Request):
+    # The engine and session factory belong to the application container built at startup
+    db = request.app.state.container.session_factory()
+    # Set by AdmissionMiddleware from the bulkhead the route belongs to
+    timeout_ms = getattr(request.state, "statement_timeout_ms", None)
+    if timeout_ms is not None:
+        apply_statement_timeout(db, timeout_ms)
+    # One transaction per request: committed once the endpoint returns, rolled back if it raises
+    with UnitOfWork(db, close=True) as unit_of_work:
+        yield unit_of_work
+
+
+def get_db(unit_of_work: UnitOfWork = Depends(get_unit_of_work)) -> Session:
+    return unit_of_work.session
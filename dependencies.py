@@ -1,21 +1,39 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from starlette import status
 
+from app.container import AppContainer
 from app.models import Librarian
 from app.models.borrowed_book_model import BorrowedBook
+from app.repositories.book_copy_repository import BookCopyRepository
 from app.repositories.book_repository import BookRepository
 from app.repositories.borrowed_book_repository import BorrowedBookRepository
+from app.repositories.fine_repository import FineRepository
+from app.repositories.hold_repository import HoldRepository
+from app.repositories.job_watermark_repository import JobWatermarkRepository
 from app.repositories.librarian_repository import LibrarianRepository
+from app.repositories.outbox_repository import OutboxRepository
 from app.repositories.reader_repository import ReaderRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.repositories.stats_repository import StatsRepository
+from app.repositories.unit_of_work import UnitOfWork
 from app.services.auth_service import AuthService
+from app.services.book_copy_service import BookCopyService
 from app.services.book_service import BookService
 from app.services.borrow_book_service import BorrowedBookService
+from app.services.fine_service import FineService
+from app.services.hold_service import HoldService
 from app.services.librarian_service import LibrarianService
 from app.services.reader_service import ReaderService
-from app.utils.security import PasswordSecurity, SecuritySettings
-from database import get_db
+from app.services.stats_service import StatsService
+from app.utils.security import PasswordSecurity, PasswordSettings, SecuritySettings
+from app.utils.audit_writer import TransactionAudit
+from app.utils.event_broadcaster import EventBroadcaster
+from app.utils.settings import EventStreamSettings, FineSettings, LoanSettings, StatsSettings
+from app.utils.token_denylist import TokenDenylist
+from database import get_db, get_unit_of_work
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -24,32 +42,75 @@ def get_db_session(db: Session = Depends(get_db)):
     return db
 
 
-def get_librarian_repository(db: Session = Depends(get_db)) -> LibrarianRepository:
-    return LibrarianRepository(db)
+def get_container(request: Request) -> AppContainer:
+    return request.app.state.container
 
 
-def get_password_security() -> PasswordSecurity:
-    return PasswordSecurity()
+def get_audit_writer(
+        container: AppContainer = Depends(get_container),
+        db: Session = Depends(get_db)
+) -> TransactionAudit:
+    # Entries reach the writer only when the request's unit of work commits
+    return TransactionAudit(container.audit_writer, db)
+
+
+def get_librarian_repository(
+        db: Session = Depends(get_db),
+        container: AppContainer = Depends(get_container)
+) -> LibrarianRepository:
+    return LibrarianRepository(db, cache=container.principal_cache)
+
+
+def get_password_settings(container: AppContainer = Depends(get_container)) -> PasswordSettings:
+    return container.password_settings
+
+
+def get_password_security(container: AppContainer = Depends(get_container)) -> PasswordSecurity:
+    return container.password_security
 
 
 def get_librarian_service(
     librarian_repo: LibrarianRepository = Depends(get_librarian_repository),
-    password_security: PasswordSecurity = Depends(get_password_security)
+    password_security: PasswordSecurity = Depends(get_password_security),
+    audit: TransactionAudit = Depends(get_audit_writer)
 ) -> LibrarianService:
-    return LibrarianService(librarian_repo, password_security)
+    return LibrarianService(librarian_repo, password_security, audit)
+
+def get_security_settings(container: AppContainer = Depends(get_container)) -> SecuritySettings:
+    return container.security_settings
+
+
+def get_refresh_token_repository(db: Session = Depends(get_db)) -> RefreshTokenRepository:
+    return RefreshTokenRepository(db)
+
+
+def get_revoked_token_repository(db: Session = Depends(get_db)) -> RevokedTokenRepository:
+    return RevokedTokenRepository(db)
+
+
+def get_token_denylist(container: AppContainer = Depends(get_container)) -> TokenDenylist:
+    return container.token_denylist
 
-def get_security_settings() -> SecuritySettings:
-    return SecuritySettings()
 
 def get_auth_service(
     librarian_repo: LibrarianRepository = Depends(get_librarian_repository),
     password_security: PasswordSecurity = Depends(get_password_security),
-    security_settings: SecuritySettings = Depends(get_security_settings)
+    security_settings: SecuritySettings = Depends(get_security_settings),
+    refresh_token_repo: RefreshTokenRepository = Depends(get_refresh_token_repository),
+    revoked_token_repo: RevokedTokenRepository = Depends(get_revoked_token_repository),
+    denylist: TokenDenylist = Depends(get_token_denylist),
+    audit: TransactionAudit = Depends(get_audit_writer),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work)
 ) -> AuthService:
     return AuthService(
         repository=librarian_repo,
         password_security=password_security,
-        security_settings=security_settings
+        security_settings=security_settings,
+        refresh_token_repository=refresh_token_repo,
+        revoked_token_repository=revoked_token_repo,
+        denylist=denylist,
+        audit=audit,
+        unit_of_work=unit_of_work
     )
 
 
@@ -64,8 +125,14 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
+    if auth_service.is_token_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-    librarian = auth_service.repository.get_by_email(email)
+    librarian = auth_service.get_principal(email, payload.get("lid"))
     if librarian is None:
         raise HTTPException(status_code=404, detail="User not found")
     return librarian
@@ -75,23 +142,118 @@ def get_reader_repository(db: Session = Depends(get_db)) -> ReaderRepository:
     return ReaderRepository(db)
 
 
-def get_reader_service(reader_repo: ReaderRepository = Depends(get_reader_repository)) -> ReaderService:
-    return ReaderService(reader_repo)
+def get_reader_service(
+        reader_repo: ReaderRepository = Depends(get_reader_repository),
+        audit: TransactionAudit = Depends(get_audit_writer)
+) -> ReaderService:
+    return ReaderService(reader_repo, audit)
 
 
-def get_book_repository(db: Session = Depends(get_db)) -> BookRepository:
-    return BookRepository(db)
+def get_book_repository(
+        db: Session = Depends(get_db),
+        container: AppContainer = Depends(get_container)
+) -> BookRepository:
+    return BookRepository(db, cache=container.book_cache)
 
 def get_borrowed_book_repository(db: Session = Depends(get_db)) -> BorrowedBookRepository:
     return BorrowedBookRepository(db)
 
-def get_book_service(book_repo: BookRepository = Depends(get_book_repository)) -> BookService:
-    return BookService(book_repo)
+def get_outbox_repository(db: Session = Depends(get_db)) -> OutboxRepository:
+    return OutboxRepository(db)
+
+
+def get_book_service(
+        book_repo: BookRepository = Depends(get_book_repository),
+        outbox_repo: OutboxRepository = Depends(get_outbox_repository),
+        audit: TransactionAudit = Depends(get_audit_writer)
+) -> BookService:
+    return BookService(book_repo, outbox_repo, audit)
+
+
+def get_loan_settings(container: AppContainer = Depends(get_container)) -> LoanSettings:
+    return container.loan_settings
+
+
+def get_hold_repository(db: Session = Depends(get_db)) -> HoldRepository:
+    return HoldRepository(db)
+
+
+def get_book_copy_repository(db: Session = Depends(get_db)) -> BookCopyRepository:
+    return BookCopyRepository(db)
+
+
+def get_book_copy_service(
+        copy_repo: BookCopyRepository = Depends(get_book_copy_repository),
+        book_repo: BookRepository = Depends(get_book_repository)
+) -> BookCopyService:
+    return BookCopyService(copy_repo, book_repo)
 
 
 def get_borrowed_book_service(
         borrowed_book_repo: BorrowedBookRepository = Depends(get_borrowed_book_repository),
         book_repo: BookRepository = Depends(get_book_repository),
-        reader_repo: ReaderRepository = Depends(get_reader_repository)
+        reader_repo: ReaderRepository = Depends(get_reader_repository),
+        loan_settings: LoanSettings = Depends(get_loan_settings),
+        hold_repo: HoldRepository = Depends(get_hold_repository),
+        copy_repo: BookCopyRepository = Depends(get_book_copy_repository),
+        outbox_repo: OutboxRepository = Depends(get_outbox_repository),
+        audit: TransactionAudit = Depends(get_audit_writer)
 ) -> BorrowedBookService:
-    return BorrowedBookService(book_repo, borrowed_book_repo, reader_repo)
+    return BorrowedBookService(
+        book_repo, borrowed_book_repo, reader_repo, loan_settings, hold_repo, copy_repo, outbox_repo, audit
+    )
+
+
+def get_hold_service(
+        hold_repo: HoldRepository = Depends(get_hold_repository),
+        book_repo: BookRepository = Depends(get_book_repository),
+        reader_repo: ReaderRepository = Depends(get_reader_repository),
+        loan_settings: LoanSettings = Depends(get_loan_settings),
+        copy_repo: BookCopyRepository = Depends(get_book_copy_repository),
+        unit_of_work: UnitOfWork = Depends(get_unit_of_work)
+) -> HoldService:
+    return HoldService(hold_repo, book_repo, reader_repo, loan_settings, copy_repo, unit_of_work)
+
+
+def get_fine_repository(db: Session = Depends(get_db)) -> FineRepository:
+    return FineRepository(db)
+
+
+def get_job_watermark_repository(db: Session = Depends(get_db)) -> JobWatermarkRepository:
+    return JobWatermarkRepository(db)
+
+
+def get_fine_settings(container: AppContainer = Depends(get_container)) -> FineSettings:
+    return container.fine_settings
+
+
+def get_fine_service(
+        fine_repo: FineRepository = Depends(get_fine_repository),
+        watermark_repo: JobWatermarkRepository = Depends(get_job_watermark_repository),
+        fine_settings: FineSettings = Depends(get_fine_settings)
+) -> FineService:
+    return FineService(fine_repo, watermark_repo, fine_settings)
+
+
+def get_stats_repository(db: Session = Depends(get_db)) -> StatsRepository:
+    return StatsRepository(db)
+
+
+def get_stats_settings(container: AppContainer = Depends(get_container)) -> StatsSettings:
+    return container.stats_settings
+
+
+def get_stats_service(
+        stats_repo: StatsRepository = Depends(get_stats_repository),
+        watermark_repo: JobWatermarkRepository = Depends(get_job_watermark_repository),
+        stats_settings: StatsSettings = Depends(get_stats_settings)
+) -> StatsService:
+    return StatsService(stats_repo, watermark_repo, stats_settings)
+
+
+def get_event_stream_settings(container: AppContainer = Depends(get_container)) -> EventStreamSettings:
+    return container.event_stream_settings
+
+
+def get_event_broadcaster(container: AppContainer = Depends(get_container)) -> EventBroadcaster:
+    return container.event_broadcaster
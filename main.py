@@ -1,13 +1,74 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.routers import librarian_router, auth_router, reader_router, book_router, borrowed_book_router
 
-app = FastAPI()
+from app.container import AppContainer
+from app.middleware.admission_middleware import DEFAULT_RULES, AdmissionMiddleware, Bulkhead
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.middleware.idempotency_middleware import IdempotencyMiddleware
+from app.routers import librarian_router, auth_router, reader_router, book_router, borrowed_book_router, fine_router, \
+    stats_router, hold_router, event_router, metrics_router
+from app.utils.settings import AdmissionSettings, CompressionSettings, IdempotencySettings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = AppContainer()
+    app.state.container = container
+    container.start()
+    try:
+        yield
+    finally:
+        await container.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Added first so it sits inside compression and stores uncompressed bodies.
+# It takes its session factory from the container once the app has started.
+idempotency_settings = IdempotencySettings()
+app.add_middleware(
+    IdempotencyMiddleware,
+    ttl_hours=idempotency_settings.idempotency_ttl_hours,
+    lock_seconds=idempotency_settings.idempotency_lock_seconds,
+)
+
+compression_settings = CompressionSettings()
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=compression_settings.compression_minimum_size,
+    compress_level=compression_settings.compression_level,
+    cache_size=compression_settings.compression_cache_size,
+)
+
+# Added last so it is outermost: a shed request costs no body reading, compression or DB work
+admission_settings = AdmissionSettings()
+app.add_middleware(
+    AdmissionMiddleware,
+    bulkheads=[
+        Bulkhead(
+            name,
+            max_concurrent=getattr(admission_settings, f"admission_{name}_concurrency"),
+            max_wait=admission_settings.admission_max_wait_seconds,
+            max_queue=admission_settings.admission_max_queue,
+            statement_timeout_ms=getattr(admission_settings, f"admission_{name}_statement_timeout_ms"),
+        )
+        for name in ("auth", "checkout", "catalog", "write", "export")
+    ],
+    rules=DEFAULT_RULES,
+    retry_after=admission_settings.admission_retry_after_seconds,
+)
 
 app.include_router(librarian_router.router)
 app.include_router(auth_router.router)
 app.include_router(reader_router.router)
 app.include_router(book_router.router)
 app.include_router(borrowed_book_router.router)
+app.include_router(fine_router.router)
+app.include_router(stats_router.router)
+app.include_router(hold_router.router)
+app.include_router(event_router.router)
+app.include_router(metrics_router.router)
 
 
 @app.get("/")
@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.admission_middleware import ADMISSION_REJECTED, AdmissionMiddleware, Bulkhead, RouteRule, \
+    DEFAULT_RULES, READ_METHODS
+
+
+def build_app(max_concurrent=1, max_wait=0.05, max_queue=10):
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get("/books/")
+    async def books(request: Request):
+        return {"timeout": getattr(request.state, "statement_timeout_ms", None)}
+
+    @app.post("/books/")
+    async def create_book(request: Request):
+        return {"timeout": getattr(request.state, "statement_timeout_ms", None)}
+
+    @app.get("/stats/slow")
+    async def slow():
+        await asyncio.wait_for(release.wait(), 1)
+        return {"ok": True}
+
+    @app.get("/stats/release")
+    async def release_slow():
+        release.set()
+        return {"ok": True}
+
+    app.add_middleware(
+        AdmissionMiddleware,
+        bulkheads=[
+            Bulkhead("catalog", 10, 1.0, 10, statement_timeout_ms=2000),
+            Bulkhead("export", max_concurrent, max_wait, max_queue, statement_timeout_ms=30000),
+        ],
+        rules=[
+            RouteRule("/stats/release", "catalog"),
+            RouteRule("/stats", "export"),
+            RouteRule("/books", "catalog", READ_METHODS),
+        ],
+        retry_after=3,
+    )
+    return app
+
+
+class TestRouteRule:
+    def test_prefix_matches_whole_segments(self):
+        rule = RouteRule("/books", "catalog")
+
+        assert rule.matches("GET", "/books")
+        assert rule.matches("GET", "/books/1")
+        assert not rule.matches("GET", "/bookshelf")
+
+    def test_methods_restrict_match(self):
+        rule = RouteRule("/books", "catalog", READ_METHODS)
+
+        assert rule.matches("HEAD", "/books/")
+        assert not rule.matches("POST", "/books/")
+
+    def test_default_rules_limit_every_write(self):
+        def bulkhead(method, path):
+            return next((rule.bulkhead for rule in DEFAULT_RULES if rule.matches(method, path)), None)
+
+        for path in ("/books/1", "/readers/", "/librarians/2", "/fines/3"):
+            assert bulkhead("POST", path) == "write"
+            assert bulkhead("DELETE", path) == "write"
+            assert bulkhead("GET", path) == "catalog"
+        assert bulkhead("POST", "/auth/login") == "auth"
+        assert bulkhead("POST", "/fines/accrue") == "export"
+        assert bulkhead("GET", "/events/stream") is None
+        assert bulkhead("GET", "/metrics") is None
+
+
+class TestAdmissionMiddleware:
+    def test_passes_statement_timeout_of_bulkhead(self):
+        client = TestClient(build_app())
+
+        assert client.get("/books/").json() == {"timeout": 2000}
+
+    def test_unmatched_routes_are_not_limited(self):
+        client = TestClient(build_app())
+
+        assert client.post("/books/").json() == {"timeout": None}
+
+    def test_full_bulkhead_sheds_with_retry_after(self):
+        app = build_app(max_concurrent=1, max_wait=0.05)
+        before = ADMISSION_REJECTED.value(bulkhead="export")
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                slow = asyncio.create_task(client.get("/stats/slow"))
+                await asyncio.sleep(0.05)
+
+                shed = await client.get("/stats/other")
+                other_class = await client.get("/books/")
+                await client.get("/stats/release")
+                return shed, other_class, await slow
+
+        shed, other_class, finished = asyncio.run(scenario())
+
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "3"
+        assert other_class.status_code == 200
+        assert finished.status_code == 200
+        assert ADMISSION_REJECTED.value(bulkhead="export") == before + 1
+
+    def test_queue_limit_sheds_without_waiting(self):
+        app = build_app(max_concurrent=1, max_wait=5, max_queue=0)
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                slow = asyncio.create_task(client.get("/stats/slow"))
+                await asyncio.sleep(0.05)
+
+                shed = await asyncio.wait_for(client.get("/stats/other"), 1)
+                await client.get("/stats/release")
+                await slow
+                return shed
+
+        assert asyncio.run(scenario()).status_code == 503
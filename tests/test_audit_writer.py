@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.utils.audit_writer import AuditWriter, TransactionAudit
+
+
+class RecordingAuditRepository:
+    def __init__(self):
+        self.batches = []
+
+    def add_many(self, entries):
+        self.batches.append(list(entries))
+        return len(entries)
+
+
+@pytest.fixture
+def repository():
+    return RecordingAuditRepository()
+
+
+def make_writer(repository, **kwargs):
+    return AuditWriter(MagicMock, repository_factory=lambda db: repository, **kwargs)
+
+
+class TestAuditWriter:
+    def test_stop_flushes_queued_entries(self, repository):
+        writer = make_writer(repository, flush_interval=60)
+        for id in range(5):
+            writer.record("book.updated", "book", id, actor_id=1)
+
+        writer.start()
+        writer.stop(timeout=5)
+
+        entries = [entry for batch in repository.batches for entry in batch]
+        assert [entry["entity_id"] for entry in entries] == [0, 1, 2, 3, 4]
+        assert entries[0]["actor_id"] == 1
+        assert entries[0]["occurred_at"] is not None
+
+    def test_entries_are_written_in_batches(self, repository):
+        writer = make_writer(repository, batch_size=3, flush_interval=60)
+        for id in range(7):
+            writer.record("book.deleted", "book", id)
+
+        writer.start()
+        writer.stop(timeout=5)
+
+        assert [len(batch) for batch in repository.batches] == [3, 3, 1]
+
+    def test_full_queue_drops_after_timeout(self, repository):
+        writer = make_writer(repository, max_queue_size=2, enqueue_timeout=0.01)
+
+        assert writer.record("book.created", "book", 1)
+        assert writer.record("book.created", "book", 2)
+        assert not writer.record("book.created", "book", 3)
+        assert writer.dropped == 1
+
+
+class TestTransactionAudit:
+    @pytest.fixture
+    def db(self):
+        with Session(create_engine("sqlite://")) as session:
+            yield session
+
+    @pytest.fixture
+    def writer(self):
+        return create_autospec(AuditWriter)
+
+    def test_entries_are_written_after_commit(self, db, writer):
+        audit = TransactionAudit(writer, db)
+        db.execute(text("SELECT 1"))
+
+        audit.record("book.created", "book", 1, actor_id=2)
+        writer.record.assert_not_called()
+
+        db.commit()
+        writer.record.assert_called_once_with("book.created", "book", 1, 2, None)
+
+        db.commit()
+        writer.record.assert_called_once()
+
+    def test_rolled_back_entries_are_dropped(self, db, writer):
+        audit = TransactionAudit(writer, db)
+        db.execute(text("SELECT 1"))
+
+        audit.record("book.deleted", "book", 1)
+        db.rollback()
+        db.commit()
+
+        writer.record.assert_not_called()
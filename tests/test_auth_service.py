@@ -7,8 +7,12 @@ from pydantic import SecretStr
 
 from app.models import Librarian, Person
 from app.repositories.librarian_repository import LibrarianRepository
+from app.repositories.refresh_token_repository import ConsumedRefreshToken, RefreshTokenRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.repositories.unit_of_work import UnitOfWork
 from app.services.auth_service import AuthService
-from app.utils.security import SecuritySettings, PasswordSecurity
+from app.utils.security import PASSWORD_VERIFY_SECONDS, SecuritySettings, PasswordSecurity
+from app.utils.token_denylist import TokenDenylist
 
 
 class TestAuthService:
@@ -29,14 +33,38 @@ class TestAuthService:
         settings.secret_key = SecretStr("test_secret_key")
         settings.algorithm = "HS256"
         settings.access_token_expire_minutes = 30
+        settings.refresh_token_expire_days = 30
         return settings
 
     @pytest.fixture
-    def auth_service(self, mock_repository, mock_password_security, mock_security_settings):
+    def mock_refresh_repository(self):
+        return create_autospec(RefreshTokenRepository)
+
+    @pytest.fixture
+    def mock_revoked_repository(self):
+        repository = create_autospec(RevokedTokenRepository)
+        repository.get_since.return_value = []
+        return repository
+
+    @pytest.fixture
+    def denylist(self):
+        return TokenDenylist(capacity=100)
+
+    @pytest.fixture
+    def unit_of_work(self):
+        return create_autospec(UnitOfWork)
+
+    @pytest.fixture
+    def auth_service(self, mock_repository, mock_password_security, mock_security_settings, mock_refresh_repository,
+                     mock_revoked_repository, denylist, unit_of_work):
         return AuthService(
             repository=mock_repository,
             password_security=mock_password_security,
-            security_settings=mock_security_settings
+            security_settings=mock_security_settings,
+            refresh_token_repository=mock_refresh_repository,
+            revoked_token_repository=mock_revoked_repository,
+            denylist=denylist,
+            unit_of_work=unit_of_work
         )
 
     @pytest.fixture
@@ -203,4 +231,251 @@ class TestAuthService:
 
         # Act & Assert
         with pytest.raises(ValueError, match="Failed to change password"):
-            auth_service.change_password(current_password, new_password, sample_librarian)
\ No newline at end of file
+            auth_service.change_password(current_password, new_password, sample_librarian)
+
+    def test_authenticate_schedules_rehash_when_cost_is_off_policy(self, auth_service, mock_repository,
+                                                                  mock_password_security, sample_librarian):
+        # Arrange
+        password = SecretStr("password123")
+        mock_repository.get_by_email.return_value = sample_librarian
+        mock_password_security.needs_rehash.return_value = True
+        schedule = MagicMock()
+
+        # Act
+        result = auth_service.authenticate("admin@example.com", password, schedule_rehash=schedule)
+
+        # Assert
+        assert result == sample_librarian
+        schedule.assert_called_once_with(auth_service.rehash_password, sample_librarian.id,
+                                         sample_librarian.hash_password, password)
+        mock_password_security.get_password_hash.assert_not_called()
+
+    def test_authenticate_does_not_schedule_rehash_for_current_cost(self, auth_service, mock_repository,
+                                                                   mock_password_security, sample_librarian):
+        # Arrange
+        mock_repository.get_by_email.return_value = sample_librarian
+        mock_password_security.needs_rehash.return_value = False
+        schedule = MagicMock()
+
+        # Act
+        auth_service.authenticate("admin@example.com", SecretStr("password123"), schedule_rehash=schedule)
+
+        # Assert
+        schedule.assert_not_called()
+
+    def test_rehash_password_swaps_hash_conditionally(self, auth_service, mock_repository, mock_password_security,
+                                                      unit_of_work):
+        # Arrange
+        mock_repository.update_password_hash.return_value = True
+
+        # Act
+        result = auth_service.rehash_password(1, "old_hash", SecretStr("password123"))
+
+        # Assert
+        assert result is True
+        mock_repository.update_password_hash.assert_called_once_with(1, "old_hash", "new_hashed_password")
+        unit_of_work.commit.assert_called_once()
+
+    def test_rehash_password_swallows_errors(self, auth_service, mock_repository):
+        # Arrange
+        mock_repository.update_password_hash.side_effect = ValueError("DB error")
+
+        # Act & Assert
+        assert auth_service.rehash_password(1, "old_hash", SecretStr("password123")) is False
+
+    def test_create_refresh_token_stores_only_digest(self, auth_service, mock_refresh_repository):
+        # Act
+        token = auth_service.create_refresh_token(1)
+
+        # Assert
+        librarian_id, family_id, digest, expires_at = mock_refresh_repository.create.call_args.args
+        assert librarian_id == 1
+        assert len(family_id) == 32
+        assert digest == auth_service._digest_refresh_token(token)
+        assert token not in digest
+        assert expires_at > datetime.now(timezone.utc) + timedelta(days=29)
+
+    def test_refresh_rotates_token_within_family(self, auth_service, mock_refresh_repository,
+                                                mock_password_security, mock_security_settings):
+        # Arrange
+        mock_refresh_repository.consume.return_value = ConsumedRefreshToken(1, "family", "admin@example.com")
+
+        # Act
+        access_token, refresh_token = auth_service.refresh("old-token")
+
+        # Assert
+        mock_refresh_repository.consume.assert_called_once_with(auth_service._digest_refresh_token("old-token"))
+        _, family_id, digest, _ = mock_refresh_repository.create.call_args.args
+        assert family_id == "family"
+        assert digest == auth_service._digest_refresh_token(refresh_token)
+        assert refresh_token != "old-token"
+        payload = jwt.decode(access_token, mock_security_settings.secret_key.get_secret_value(),
+                             algorithms=[mock_security_settings.algorithm])
+        assert payload["sub"] == "admin@example.com"
+        mock_password_security.verify_password.assert_not_called()
+
+    def test_refresh_unknown_token(self, auth_service, mock_refresh_repository):
+        # Arrange
+        mock_refresh_repository.consume.return_value = None
+        mock_refresh_repository.get_by_digest.return_value = None
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Invalid refresh token"):
+            auth_service.refresh("unknown")
+        mock_refresh_repository.revoke_family.assert_not_called()
+
+    def test_refresh_reused_token_revokes_family(self, auth_service, mock_refresh_repository, unit_of_work):
+        # Arrange
+        mock_refresh_repository.consume.return_value = None
+        mock_refresh_repository.get_by_digest.return_value = MagicMock(
+            family_id="family", librarian_id=1, revoked_at=datetime.now(timezone.utc)
+        )
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Invalid refresh token"):
+            auth_service.refresh("rotated-token")
+        mock_refresh_repository.revoke_family.assert_called_once_with("family")
+        mock_refresh_repository.create.assert_not_called()
+        # Committed before the error rolls the rest of the request back
+        unit_of_work.commit.assert_called_once()
+
+    def test_access_token_carries_jti(self, auth_service, mock_security_settings):
+        # Act
+        token = auth_service.create_access_token({"sub": "admin@example.com", "lid": 1})
+
+        # Assert
+        payload = jwt.decode(token, mock_security_settings.secret_key.get_secret_value(),
+                             algorithms=[mock_security_settings.algorithm])
+        assert len(payload["jti"]) == 32
+        assert payload["lid"] == 1
+        assert "iat" in payload
+
+    def test_token_not_in_filter_skips_database(self, auth_service, mock_revoked_repository):
+        # Act
+        revoked = auth_service.is_token_revoked({"sub": "admin@example.com", "jti": "abc", "lid": 1, "iat": 0})
+
+        # Assert
+        assert revoked is False
+        mock_revoked_repository.get_since.assert_called_once_with(None)
+        mock_revoked_repository.is_revoked.assert_not_called()
+
+    def test_filter_hit_is_confirmed_in_database(self, auth_service, mock_revoked_repository):
+        # Arrange
+        mock_revoked_repository.get_since.return_value = [("abc", 1, datetime.now(timezone.utc))]
+        mock_revoked_repository.is_revoked.return_value = True
+
+        # Act
+        revoked = auth_service.is_token_revoked({"sub": "admin@example.com", "jti": "abc", "lid": 1, "iat": 0})
+
+        # Assert
+        assert revoked is True
+        mock_revoked_repository.is_revoked.assert_called_once_with(
+            "abc", 1, datetime.fromtimestamp(0, timezone.utc)
+        )
+
+    def test_denylist_load_only_reads(self, auth_service, mock_revoked_repository):
+        # Act
+        auth_service.is_token_revoked({"sub": "admin@example.com", "jti": "abc", "lid": 1})
+
+        # Assert
+        mock_revoked_repository.purge_expired.assert_not_called()
+
+    def test_purge_expired_revocations(self, auth_service, mock_revoked_repository):
+        # Arrange
+        mock_revoked_repository.purge_expired.return_value = 3
+
+        # Act & Assert
+        assert auth_service.purge_expired_revocations() == 3
+
+    def test_failed_first_load_falls_back_to_database(self, auth_service, mock_revoked_repository, denylist):
+        # Arrange
+        mock_revoked_repository.get_since.side_effect = ValueError("DB error")
+        mock_revoked_repository.is_revoked.return_value = True
+
+        # Act
+        revoked = auth_service.is_token_revoked({"sub": "admin@example.com", "jti": "abc", "lid": 1, "iat": 0})
+
+        # Assert
+        assert denylist.loaded is False
+        assert revoked is True
+        mock_revoked_repository.is_revoked.assert_called_once_with(
+            "abc", 1, datetime.fromtimestamp(0, timezone.utc)
+        )
+
+    def test_load_in_progress_elsewhere_falls_back_to_database(self, auth_service, mock_revoked_repository,
+                                                               denylist):
+        # Arrange: another request holds the refresh lock before this worker's first load
+        denylist._lock.acquire()
+        mock_revoked_repository.is_revoked.return_value = True
+
+        # Act
+        try:
+            revoked = auth_service.is_token_revoked({"sub": "admin@example.com", "jti": "abc", "lid": 1})
+        finally:
+            denylist._lock.release()
+
+        # Assert
+        assert revoked is True
+        mock_revoked_repository.get_since.assert_not_called()
+
+    def test_logout_revokes_token_and_refresh_family(self, auth_service, mock_revoked_repository,
+                                                    mock_refresh_repository, denylist, sample_librarian):
+        # Arrange
+        payload = {"sub": "admin@example.com", "jti": "abc", "lid": 1, "exp": 1_900_000_000}
+        mock_refresh_repository.get_by_digest.return_value = MagicMock(librarian_id=1, family_id="family")
+
+        # Act
+        auth_service.logout(sample_librarian, payload, "refresh-token")
+
+        # Assert
+        mock_revoked_repository.add.assert_called_once_with(
+            1, datetime.fromtimestamp(1_900_000_000, timezone.utc), jti="abc"
+        )
+        mock_refresh_repository.revoke_family.assert_called_once_with("family")
+        assert denylist.might_be_revoked("abc", None)
+
+    def test_logout_ignores_refresh_token_of_other_librarian(self, auth_service, mock_refresh_repository,
+                                                            sample_librarian):
+        # Arrange
+        mock_refresh_repository.get_by_digest.return_value = MagicMock(librarian_id=2, family_id="family")
+
+        # Act
+        auth_service.logout(sample_librarian, {"jti": "abc", "exp": 1_900_000_000}, "refresh-token")
+
+        # Assert
+        mock_refresh_repository.revoke_family.assert_not_called()
+
+    def test_revoke_all_sessions(self, auth_service, mock_revoked_repository, mock_refresh_repository, denylist):
+        # Act
+        auth_service.revoke_all_sessions(1, actor_id=1)
+
+        # Assert
+        librarian_id, expires_at = mock_revoked_repository.add.call_args.args
+        assert librarian_id == 1
+        assert expires_at > datetime.now(timezone.utc) + timedelta(minutes=29)
+        mock_refresh_repository.revoke_for_librarian.assert_called_once_with(1)
+        assert denylist.might_be_revoked("any", 1)
+
+class TestPasswordSecurity:
+    def test_hash_uses_configured_rounds(self):
+        security = PasswordSecurity(rounds=4)
+
+        hashed = security.get_password_hash(SecretStr("password123"))
+
+        assert PasswordSecurity.get_cost(hashed) == 4
+        assert security.needs_rehash(hashed) is False
+
+    def test_needs_rehash_when_cost_differs_from_policy(self):
+        hashed = PasswordSecurity(rounds=5).get_password_hash(SecretStr("password123"))
+
+        assert PasswordSecurity(rounds=4).needs_rehash(hashed) is True
+
+    def test_verify_records_latency_by_cost(self):
+        security = PasswordSecurity(rounds=4)
+        hashed = security.get_password_hash(SecretStr("password123"))
+        before = PASSWORD_VERIFY_SECONDS.count(cost="4")
+
+        assert security.verify_password(SecretStr("password123"), hashed) is True
+        assert security.verify_password(SecretStr("wrong-password"), hashed) is False
+
+        assert PASSWORD_VERIFY_SECONDS.count(cost="4") == before + 2
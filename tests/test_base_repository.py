@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import Book, Reader
+from app.repositories.book_repository import BookRepository
+from app.repositories.reader_repository import ReaderRepository
+
+
+def compiled(db):
+    statement = db.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestBaseRepository:
+    def test_exists_selects_exists_only(self):
+        db = MagicMock()
+        db.execute.return_value.scalar_one.return_value = True
+
+        assert BookRepository(db).exists(id=5) is True
+
+        sql = compiled(db)
+        assert sql.startswith("SELECT EXISTS (SELECT")
+        assert "books.id = %(id_1)s" in sql
+        db.get.assert_not_called()
+
+    def test_named_checks_use_exists(self):
+        db = MagicMock()
+        db.execute.return_value.scalar_one.return_value = False
+
+        assert BookRepository(db).author_exists("Tolkien") is False
+        assert "books.author = " in compiled(db)
+
+        assert ReaderRepository(db).reader_exists(3) is False
+        assert compiled(db).startswith("SELECT EXISTS")
+
+    def test_count(self):
+        db = MagicMock()
+        db.execute.return_value.scalar_one.return_value = 2
+
+        assert BookRepository(db).count(author="Tolkien", year=1954) == 2
+
+        sql = compiled(db)
+        assert sql.startswith("SELECT count(*) AS count_1 \nFROM books")
+        assert "books.author = " in sql and "books.year = " in sql
+
+    def test_get_many_keeps_request_order(self):
+        db = MagicMock()
+        db.execute.return_value.scalars.return_value = [Book(id=2), Book(id=1)]
+
+        found, missing = BookRepository(db).get_many([1, 3, 2])
+
+        assert [book.id for book in found] == [1, 2]
+        assert missing == [3]
+        assert "books.id = ANY (%(param_1)s)" in compiled(db)
+
+    def test_get_many_applies_loader_options(self):
+        db = MagicMock()
+        db.execute.return_value.scalars.return_value = [Reader(id=1)]
+
+        ReaderRepository(db).get_many([1])
+
+        assert "JOIN persons" in compiled(db)
+
+    def test_unknown_filter_column(self):
+        with pytest.raises(ValueError, match="Unexpected error when checking book existence"):
+            BookRepository(MagicMock()).exists(publisher="Allen & Unwin")
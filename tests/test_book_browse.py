@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from app.models import Book, BookCopy
+from app.models.book_copy_model import COPY_AVAILABLE, COPY_ON_LOAN
+from app.repositories.book_repository import BookRepository
+from app.schemas.book_schema import BookFilter
+
+
+def browse_sql(filters):
+    statement = BookRepository._browse(select(Book.id), filters)
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestBookBrowse:
+    def test_no_filters_leaves_the_query_alone(self):
+        assert browse_sql(None) == "SELECT books.id \nFROM books"
+
+    def test_author_year_range_and_availability(self):
+        sql = browse_sql(BookFilter(author="Tolkien", year_from=2010, available=True, sort="-year", limit=20))
+
+        assert "books.author = 'Tolkien'" in sql
+        assert "books.year >= 2010" in sql
+        # Both branches match a partial index predicate, so neither scans its whole table
+        assert "books.id IN (SELECT books.id \nFROM books \nWHERE books.number_of_copies > 0 " \
+               "UNION SELECT bookcopies.book_id \nFROM bookcopies \nWHERE bookcopies.status = 'available')" in sql
+        assert sql.endswith("ORDER BY books.year DESC, books.id DESC \n LIMIT 20")
+
+    def test_isbn_prefix_is_escaped(self):
+        compiled = BookRepository._browse(select(Book.id), BookFilter(isbn_prefix="978-5_%")).compile(
+            dialect=postgresql.dialect()
+        )
+
+        assert "books.isbn LIKE %(isbn_1)s ESCAPE" in str(compiled)
+        assert compiled.params["isbn_1"] == "978-5\\_\\%%"
+
+    @pytest.fixture
+    def db(self):
+        engine = create_engine("sqlite://")
+        Book.metadata.create_all(engine, tables=[Book.__table__, BookCopy.__table__])
+        with Session(engine) as session:
+            session.add_all([
+                # Every registered copy is out; the counter was handed over when they were registered
+                Book(id=1, name="Lent out", author="A", year=2001, number_of_copies=0),
+                BookCopy(book_id=1, barcode="1-1", status=COPY_ON_LOAN),
+                BookCopy(book_id=1, barcode="1-2", status=COPY_ON_LOAN),
+                Book(id=2, name="On the shelf", author="A", year=2002, number_of_copies=0),
+                BookCopy(book_id=2, barcode="2-1", status=COPY_AVAILABLE),
+                # No copies registered, so the counter decides
+                Book(id=3, name="Counted", author="A", year=2003, number_of_copies=1),
+                Book(id=4, name="None left", author="A", year=2004, number_of_copies=0),
+            ])
+            session.commit()
+            yield session
+
+    def test_availability_follows_the_copies(self, db):
+        def browse(available):
+            return db.execute(BookRepository._browse(select(Book.id), BookFilter(available=available))).scalars().all()
+
+        assert browse(True) == [2, 3]
+        assert browse(False) == [1, 4]
+
+    def test_partial_indexes_match_the_availability_filter(self):
+        def ddl(table, name):
+            index = next(index for index in table.indexes if index.name == name)
+            return str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+        assert ddl(Book.__table__, "ix_books_available").endswith("WHERE number_of_copies > 0")
+        assert ddl(BookCopy.__table__, "ix_bookcopies_available").endswith("WHERE status = 'available'")
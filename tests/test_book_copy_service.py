@@ -0,0 +1,60 @@
+from unittest.mock import create_autospec
+
+import pytest
+
+from app.models import BookCopy
+from app.repositories.book_copy_repository import BookCopyRepository
+from app.repositories.book_repository import BookRepository
+from app.schemas.book_copy_schema import BookCopyCreate
+from app.schemas.book_schema import BookUpdate
+from app.services.book_copy_service import BookCopyService
+
+
+class TestBookCopyService:
+    @pytest.fixture
+    def copy_repo(self):
+        return create_autospec(BookCopyRepository)
+
+    @pytest.fixture
+    def book_repo(self):
+        return create_autospec(BookRepository)
+
+    @pytest.fixture
+    def service(self, copy_repo, book_repo):
+        return BookCopyService(copy_repo, book_repo)
+
+    def test_add_copy_success(self, service, copy_repo, book_repo):
+        data = BookCopyCreate(barcode="LIB-0001", location="Shelf A3")
+        copy = BookCopy(id=1, book_id=1, barcode="LIB-0001", location="Shelf A3")
+        book_repo.exists.return_value = True
+        copy_repo.exists_by_barcode.return_value = False
+        copy_repo.has_copies.return_value = True
+        copy_repo.create.return_value = copy
+
+        assert service.add_copy(1, data) == copy
+        copy_repo.create.assert_called_once_with(1, data)
+        book_repo.update.assert_not_called()
+
+    def test_first_copy_hands_the_counter_over(self, service, copy_repo, book_repo):
+        book_repo.exists.return_value = True
+        copy_repo.exists_by_barcode.return_value = False
+        copy_repo.has_copies.return_value = False
+
+        service.add_copy(1, BookCopyCreate(barcode="LIB-0001"))
+
+        book_repo.update.assert_called_once_with(1, BookUpdate(number_of_copies=0))
+
+    def test_add_copy_duplicate_barcode(self, service, copy_repo, book_repo):
+        book_repo.exists.return_value = True
+        copy_repo.exists_by_barcode.return_value = True
+
+        with pytest.raises(ValueError, match="Copy with this barcode already exists"):
+            service.add_copy(1, BookCopyCreate(barcode="LIB-0001"))
+        copy_repo.create.assert_not_called()
+
+    def test_get_copies_unknown_book(self, service, copy_repo, book_repo):
+        book_repo.exists.return_value = False
+
+        with pytest.raises(ValueError, match="Book not found"):
+            service.get_copies(1)
+        copy_repo.get_by_book.assert_not_called()
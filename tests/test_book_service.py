@@ -6,8 +6,12 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app.models import Book
 from app.repositories.book_repository import BookRepository
-from app.schemas.book_schema import BookCreate, BookUpdate
+from app.repositories.outbox_repository import OutboxRepository
+from app.schemas.book_schema import BookCreate, BookFilter, BookUpdate
 from app.services.book_service import BookService
+from app.utils.audit_writer import TransactionAudit
+from app.utils.etag import make_etag, parse_if_match
+from app.utils.exceptions import PreconditionFailedError
 
 
 class TestBookService:
@@ -16,8 +20,12 @@ class TestBookService:
         return create_autospec(BookRepository)
 
     @pytest.fixture
-    def book_service(self, mock_repository):
-        return BookService(repository=mock_repository)
+    def outbox_repo(self):
+        return create_autospec(OutboxRepository)
+
+    @pytest.fixture
+    def book_service(self, mock_repository, outbox_repo):
+        return BookService(repository=mock_repository, outbox_repo=outbox_repo)
 
     @pytest.fixture
     def sample_book(self):
@@ -52,17 +60,44 @@ class TestBookService:
         )
         expected_book = Book(**book_data.model_dump())
 
-        mock_repository.exists_by_isbn.return_value = False
         mock_repository.author_exists.return_value = True
         mock_repository.create.return_value = expected_book
 
         result = book_service.create(book_data)
 
         assert result == expected_book
-        mock_repository.exists_by_isbn.assert_called_once_with(book_data.isbn)
         mock_repository.author_exists.assert_called_once_with(book_data.author)
         mock_repository.create.assert_called_once_with(book_data)
 
+    def test_create_book_writes_outbox_event(self, book_service, mock_repository, outbox_repo, sample_book):
+        mock_repository.author_exists.return_value = True
+        mock_repository.create.return_value = sample_book
+
+        book_service.create(BookCreate(name="Sample Book", author="Author", year=2023, isbn="123-456-789"))
+
+        outbox_repo.add.assert_called_once()
+        event_type, payload = outbox_repo.add.call_args.args
+        assert event_type == "book.created"
+        assert payload["id"] == sample_book.id
+
+    def test_delete_missing_book_writes_no_event(self, book_service, mock_repository, outbox_repo, sample_book):
+        mock_repository.get_by_id.return_value = sample_book
+        mock_repository.delete.return_value = False
+
+        assert book_service.delete(sample_book.id) is False
+        outbox_repo.add.assert_not_called()
+
+    def test_update_book_is_audited(self, mock_repository, outbox_repo, sample_book):
+        audit = create_autospec(TransactionAudit)
+        service = BookService(mock_repository, outbox_repo, audit)
+        mock_repository.update.return_value = sample_book
+
+        service.update(sample_book.id, BookUpdate(name="Updated Name"), actor_id=7)
+
+        audit.record.assert_called_once_with(
+            "book.updated", "book", sample_book.id, 7, {"changes": {"name": "Updated Name"}}
+        )
+
     def test_create_book_with_existing_isbn(self, book_service, mock_repository):
         book_data = BookCreate(
             name="Test Book",
@@ -71,7 +106,8 @@ class TestBookService:
             isbn="123-456-789",
             number_of_copies=5
         )
-        mock_repository.exists_by_isbn.return_value = True
+        mock_repository.author_exists.return_value = True
+        mock_repository.create.side_effect = ValueError("Book with this ISBN already exists")
 
         with pytest.raises(ValueError, match="Book with this ISBN already exists"):
             book_service.create(book_data)
@@ -84,7 +120,6 @@ class TestBookService:
             isbn="123-456-789",
             number_of_copies=5
         )
-        mock_repository.exists_by_isbn.return_value = False
         mock_repository.author_exists.return_value = False
 
         with pytest.raises(ValueError, match="Author does not exist in our database"):
@@ -92,22 +127,20 @@ class TestBookService:
 
     def test_update_book_success(self, book_service, mock_repository, sample_book):
         update_data = BookUpdate(name="Updated Name")
-        mock_repository.exists.return_value = True
-        mock_repository.isbn_exists_except_current.return_value = False
         mock_repository.update.return_value = sample_book
 
         result = book_service.update(sample_book.id, update_data)
 
         assert result == sample_book
-        mock_repository.exists.assert_called_once_with(sample_book.id)
+        mock_repository.exists.assert_not_called()
         mock_repository.update.assert_called_once_with(sample_book.id, update_data)
 
     def test_update_nonexistent_book(self, book_service, mock_repository):
         book_id = 999
         update_data = BookUpdate(name="Updated Name")
-        mock_repository.exists.return_value = False
+        mock_repository.update.side_effect = ValueError(f"Book with id {book_id} not found")
 
-        with pytest.raises(ValueError, match="Book not found"):
+        with pytest.raises(ValueError, match="Book with id 999 not found"):
             book_service.update(book_id, update_data)
 
     def test_delete_book_success(self, book_service, mock_repository, sample_book):
@@ -158,16 +191,16 @@ class TestBookService:
         mock_repository.delete.assert_called_once_with(sample_book.id)
 
     def test_get_book_by_id_success(self, book_service, mock_repository, sample_book):
-        mock_repository.get_by_id.return_value = sample_book
+        mock_repository.get_cached_by_id.return_value = sample_book
 
         result = book_service.get_by_id(sample_book.id)
 
         assert result == sample_book
-        mock_repository.get_by_id.assert_called_once_with(sample_book.id)
+        mock_repository.get_cached_by_id.assert_called_once_with(sample_book.id)
 
     def test_get_nonexistent_book_by_id(self, book_service, mock_repository):
         book_id = 999
-        mock_repository.get_by_id.return_value = None
+        mock_repository.get_cached_by_id.return_value = None
 
         with pytest.raises(ValueError, match="Book not found"):
             book_service.get_by_id(book_id)
@@ -189,9 +222,86 @@ class TestBookService:
             isbn="123-456-789",
             number_of_copies=5
         )
-        mock_repository.exists_by_isbn.return_value = False
         mock_repository.author_exists.return_value = True
         mock_repository.create.side_effect = SQLAlchemyError("DB error")
 
         with pytest.raises(ValueError, match="Failed to create librarian"):
-            book_service.create(book_data)
\ No newline at end of file
+            book_service.create(book_data)
+
+    def test_get_many_books_deduplicates_ids(self, book_service, mock_repository, sample_book):
+        mock_repository.get_many.return_value = ([sample_book], [999])
+
+        books, missing = book_service.get_many([1, 999, 1])
+
+        assert books == [sample_book]
+        assert missing == [999]
+        mock_repository.get_many.assert_called_once_with([1, 999])
+
+    def test_get_many_books_too_many_ids(self, book_service, mock_repository):
+        with pytest.raises(ValueError, match="Cannot request more than 100 books at once"):
+            book_service.get_many(range(1, 102))
+        mock_repository.get_many.assert_not_called()
+
+    def test_get_all_books_projected(self, book_service, mock_repository):
+        rows = [{"id": 1, "name": "Sample Book"}]
+        mock_repository.get_all_projected.return_value = rows
+
+        result = book_service.get_all(["id", "name"])
+
+        assert result == rows
+        mock_repository.get_all_projected.assert_called_once_with(["id", "name"], None)
+        mock_repository.get_all.assert_not_called()
+
+    def test_get_all_books_filtered(self, book_service, mock_repository, sample_book):
+        filters = BookFilter(author="Author", year_from=2010, available=True, sort="-year")
+        mock_repository.get_all.return_value = [sample_book]
+
+        assert book_service.get_all(filters=filters) == [sample_book]
+        mock_repository.get_all.assert_called_once_with(filters)
+
+    def test_get_all_books_inverted_year_range(self, book_service, mock_repository):
+        with pytest.raises(ValueError, match="year_from must not be greater than year_to"):
+            book_service.get_all(filters=BookFilter(year_from=2020, year_to=2010))
+        mock_repository.get_all.assert_not_called()
+
+    def test_get_book_by_id_projected_not_found(self, book_service, mock_repository):
+        mock_repository.get_projected_by_id.return_value = None
+
+        with pytest.raises(ValueError, match="Book not found"):
+            book_service.get_by_id(999, ["id", "name"])
+        mock_repository.get_by_id.assert_not_called()
+
+    def test_parse_fields_always_includes_id(self):
+        assert BookService.parse_fields("name, author,name") == ["id", "name", "author"]
+        assert BookService.parse_fields(None) is None
+
+    def test_parse_fields_unknown_field(self):
+        with pytest.raises(ValueError, match="Unknown fields: hash_password"):
+            BookService.parse_fields("name,hash_password")
+
+    def test_update_book_with_expected_version_skips_existence_check(
+            self, book_service, mock_repository, sample_book
+    ):
+        update_data = BookUpdate(name="Updated Name")
+        mock_repository.update.return_value = sample_book
+
+        result = book_service.update(sample_book.id, update_data, expected_version=3)
+
+        assert result == sample_book
+        mock_repository.exists.assert_not_called()
+        mock_repository.update.assert_called_once_with(sample_book.id, update_data, expected_version=3)
+
+    def test_update_book_version_conflict_is_not_wrapped(self, book_service, mock_repository):
+        mock_repository.update.side_effect = PreconditionFailedError("Book with id 1 was modified by another request")
+
+        with pytest.raises(PreconditionFailedError):
+            book_service.update(1, BookUpdate(name="Updated Name"), expected_version=3)
+
+    def test_parse_if_match(self):
+        assert parse_if_match(make_etag(7)) == 7
+        assert parse_if_match(None) is None
+        assert parse_if_match("*") is None
+        with pytest.raises(ValueError, match="If-Match"):
+            parse_if_match('W/"7"')
+        with pytest.raises(ValueError, match="If-Match"):
+            parse_if_match('"7", "8"')
@@ -1,9 +1,15 @@
-from unittest.mock import Mock
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import ANY, Mock
 
 import pytest
 
+from app.models import Hold
+from app.models.book_copy_model import COPY_AVAILABLE
 from app.models.borrowed_book_model import BorrowedBook
+from app.models.hold_model import HOLD_FULFILLED, HOLD_READY
 from app.services.borrow_book_service import BorrowedBookService
+from app.utils.pagination import encode_cursor
+from app.utils.settings import LoanSettings
 
 
 class TestBorrowedBookService:
@@ -15,9 +21,42 @@ class TestBorrowedBookService:
         return book_repo, borrow_repo, reader_repo
 
     @pytest.fixture
-    def service(self, mock_repos):
+    def hold_repo(self):
+        hold_repo = Mock()
+        hold_repo.get_ready_hold.return_value = None
+        hold_repo.allocate_next.return_value = None
+        return hold_repo
+
+    @pytest.fixture
+    def copy_repo(self):
+        copy_repo = Mock()
+        copy_repo.claim_available.return_value = None
+        copy_repo.has_copies.return_value = False
+        return copy_repo
+
+    @pytest.fixture
+    def outbox_repo(self):
+        return Mock()
+
+    @pytest.fixture
+    def service(self, mock_repos, hold_repo, copy_repo, outbox_repo):
         book_repo, borrow_repo, reader_repo = mock_repos
-        return BorrowedBookService(book_repo, borrow_repo, reader_repo)
+        return BorrowedBookService(
+            book_repo, borrow_repo, reader_repo, LoanSettings(loan_period_days=14, max_renewals=2), hold_repo,
+            copy_repo, outbox_repo
+        )
+
+    @pytest.fixture
+    def open_borrowing(self):
+        return BorrowedBook(
+            id=1,
+            book_id=1,
+            reader_id=1,
+            librarian_id=1,
+            due_date=datetime.now(timezone.utc) + timedelta(days=3),
+            returned_date=None,
+            renewal_count=0
+        )
 
     def test_borrow_book_success(self, service, mock_repos):
         book_repo, borrow_repo, reader_repo = mock_repos
@@ -37,7 +76,9 @@ class TestBorrowedBookService:
         # Проверки
         assert isinstance(result, BorrowedBook)
         book_repo.decrease_book_copies.assert_called_once_with(1)
-        borrow_repo.create.assert_called_once_with(1, 1, 1)
+        borrow_repo.create.assert_called_once_with(1, 1, 1, due_date=ANY, copy_id=None)
+        due_date = borrow_repo.create.call_args.kwargs["due_date"]
+        assert timedelta(days=13) < due_date - datetime.now(timezone.utc) <= timedelta(days=14)
 
     def test_borrow_book_reader_not_found(self, service, mock_repos):
         book_repo, _, reader_repo = mock_repos
@@ -83,6 +124,79 @@ class TestBorrowedBookService:
         book_repo.increase_book_copies.assert_called_once_with(1)
         borrow_repo.mark_returned.assert_called_once_with(borrowing.id)
 
+    def test_return_book_allocates_to_next_hold(self, service, mock_repos, hold_repo):
+        book_repo, borrow_repo, _ = mock_repos
+        borrowing = BorrowedBook(book_id=1, reader_id=1, librarian_id=1)
+        borrow_repo.get_active_borrowing.return_value = borrowing
+        borrow_repo.mark_returned.return_value = borrowing
+        hold_repo.allocate_next.return_value = Hold(id=5, book_id=1, reader_id=2, status=HOLD_READY)
+
+        service.return_book(book_id=1, reader_id=1)
+
+        hold_repo.allocate_next.assert_called_once_with(1, ANY, copy_id=None)
+        book_repo.increase_book_copies.assert_not_called()
+        borrow_repo.mark_returned.assert_called_once_with(borrowing.id)
+
+    def test_borrow_book_with_ready_hold_skips_stock(self, service, mock_repos, hold_repo):
+        book_repo, borrow_repo, reader_repo = mock_repos
+        hold = Hold(id=5, book_id=1, reader_id=1, status=HOLD_READY)
+        reader_repo.reader_exists.return_value = True
+        hold_repo.get_ready_hold.return_value = hold
+        borrow_repo.get_active_borrowings.return_value = []
+
+        service.borrow_book(book_id=1, reader_id=1, librarian_id=1)
+
+        book_repo.is_book_available.assert_not_called()
+        book_repo.decrease_book_copies.assert_not_called()
+        hold_repo.set_status.assert_called_once_with(hold, HOLD_FULFILLED)
+        borrow_repo.create.assert_called_once_with(1, 1, 1, due_date=ANY, copy_id=None)
+
+    def test_borrow_book_claims_free_copy(self, service, mock_repos, copy_repo):
+        book_repo, borrow_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        borrow_repo.get_active_borrowings.return_value = []
+        copy_repo.claim_available.return_value = 7
+
+        service.borrow_book(book_id=1, reader_id=1, librarian_id=1)
+
+        copy_repo.claim_available.assert_called_once_with(1)
+        # The title's row is not written, so concurrent checkouts of other copies never wait on it
+        assert book_repo.method_calls == []
+        borrow_repo.create.assert_called_once_with(1, 1, 1, due_date=ANY, copy_id=7)
+
+    def test_borrow_book_all_copies_out(self, service, mock_repos, copy_repo):
+        book_repo, borrow_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        copy_repo.has_copies.return_value = True
+
+        with pytest.raises(ValueError, match="Book is not available for borrowing"):
+            service.borrow_book(book_id=1, reader_id=1, librarian_id=1)
+        book_repo.is_book_available.assert_not_called()
+        borrow_repo.create.assert_not_called()
+
+    def test_return_book_copy_goes_back_on_shelf(self, service, mock_repos, hold_repo, copy_repo):
+        book_repo, borrow_repo, _ = mock_repos
+        borrowing = BorrowedBook(id=3, book_id=1, reader_id=1, librarian_id=1, copy_id=7)
+        borrow_repo.get_active_borrowing.return_value = borrowing
+        borrow_repo.mark_returned.return_value = borrowing
+
+        service.return_book(book_id=1, reader_id=1)
+
+        hold_repo.allocate_next.assert_called_once_with(1, ANY, copy_id=7)
+        copy_repo.set_status.assert_called_once_with(7, COPY_AVAILABLE)
+        book_repo.increase_book_copies.assert_not_called()
+
+    def test_return_book_event_is_committed_with_return(self, service, mock_repos, outbox_repo):
+        _, borrow_repo, _ = mock_repos
+        borrowing = BorrowedBook(id=3, book_id=1, reader_id=1, librarian_id=1)
+        borrow_repo.get_active_borrowing.return_value = borrowing
+
+        service.return_book(book_id=1, reader_id=1)
+
+        outbox_repo.add.assert_called_once_with("borrowing.returned", {
+            "borrowing_id": 3, "book_id": 1, "reader_id": 1, "copy_id": None, "hold_id": None
+        })
+
     def test_return_book_no_active_borrowing(self, service, mock_repos):
         _, borrow_repo, _ = mock_repos
         borrow_repo.get_active_borrowing.return_value = None
@@ -90,4 +204,114 @@ class TestBorrowedBookService:
         with pytest.raises(ValueError) as exc_info:
             service.return_book(book_id=1, reader_id=1)
 
-        assert "No active borrowing record found" in str(exc_info.value)
\ No newline at end of file
+        assert "No active borrowing record found" in str(exc_info.value)
+
+    def test_renew_borrowing_success(self, service, mock_repos, open_borrowing):
+        _, borrow_repo, _ = mock_repos
+        borrow_repo.get_by_id.return_value = open_borrowing
+        borrow_repo.renew.return_value = open_borrowing
+
+        result = service.renew_borrowing(1)
+
+        assert result == open_borrowing
+        borrow_repo.renew.assert_called_once_with(1, open_borrowing.due_date + timedelta(days=14))
+
+    def test_renew_borrowing_returned(self, service, mock_repos, open_borrowing):
+        _, borrow_repo, _ = mock_repos
+        open_borrowing.returned_date = datetime.now(timezone.utc)
+        borrow_repo.get_by_id.return_value = open_borrowing
+
+        with pytest.raises(ValueError, match="Cannot renew a returned book"):
+            service.renew_borrowing(1)
+
+    def test_renew_borrowing_overdue(self, service, mock_repos, open_borrowing):
+        _, borrow_repo, _ = mock_repos
+        open_borrowing.due_date = datetime.now(timezone.utc) - timedelta(days=1)
+        borrow_repo.get_by_id.return_value = open_borrowing
+
+        with pytest.raises(ValueError, match="Cannot renew an overdue borrowing"):
+            service.renew_borrowing(1)
+
+    def test_renew_borrowing_limit_reached(self, service, mock_repos, open_borrowing):
+        _, borrow_repo, _ = mock_repos
+        open_borrowing.renewal_count = 2
+        borrow_repo.get_by_id.return_value = open_borrowing
+
+        with pytest.raises(ValueError, match="maximum number of renewals"):
+            service.renew_borrowing(1)
+        borrow_repo.renew.assert_not_called()
+
+    def test_get_overdue_borrowings_next_cursor(self, service, mock_repos):
+        _, borrow_repo, _ = mock_repos
+        due = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        borrowings = [BorrowedBook(id=i, due_date=due) for i in range(1, 4)]
+        borrow_repo.get_overdue.return_value = borrowings
+
+        items, next_cursor = service.get_overdue_borrowings(limit=2)
+
+        assert items == borrowings[:2]
+        assert next_cursor == encode_cursor(due, 2)
+        assert borrow_repo.get_overdue.call_args.args[1] == 3
+
+    def test_get_overdue_borrowings_last_page(self, service, mock_repos):
+        _, borrow_repo, _ = mock_repos
+        due = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        borrow_repo.get_overdue.return_value = [BorrowedBook(id=5, due_date=due)]
+
+        items, next_cursor = service.get_overdue_borrowings(cursor=encode_cursor(due, 4), limit=2)
+
+        assert len(items) == 1
+        assert next_cursor is None
+        assert borrow_repo.get_overdue.call_args.args[2] == (due, 4)
+
+    def test_get_overdue_borrowings_invalid_cursor(self, service):
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            service.get_overdue_borrowings(cursor="not-a-cursor")
+
+    def test_get_reader_history_pages_backwards(self, service, mock_repos):
+        _, borrow_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        borrowed = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        history = [BorrowedBook(id=i, borrowed_date=borrowed) for i in (9, 8, 7)]
+        borrow_repo.get_reader_history.return_value = history
+
+        items, next_cursor = service.get_reader_history(1, limit=2)
+
+        assert items == history[:2]
+        assert next_cursor == encode_cursor(borrowed, 8)
+        borrow_repo.get_reader_history.assert_called_once_with(1, 3, after=None, date_from=None, date_to=None)
+
+    def test_get_reader_history_date_range(self, service, mock_repos):
+        _, borrow_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        borrow_repo.get_reader_history.return_value = []
+
+        service.get_reader_history(1, date_from=date(2024, 1, 1), date_to=date(2024, 12, 31))
+
+        kwargs = borrow_repo.get_reader_history.call_args.kwargs
+        assert kwargs["date_from"] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert kwargs["date_to"] == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def test_get_reader_history_reader_not_found(self, service, mock_repos):
+        _, borrow_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = False
+
+        with pytest.raises(ValueError, match="Reader with ID 1 not found"):
+            service.get_reader_history(1)
+        borrow_repo.get_reader_history.assert_not_called()
+
+    def test_get_active_borrowings_with_include(self, service, mock_repos):
+        _, borrow_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        borrow_repo.get_active_borrowings.return_value = []
+
+        service.get_active_borrowings(1, include="book, reader")
+
+        borrow_repo.get_active_borrowings.assert_called_once_with(1, include={"book", "reader"})
+
+    def test_get_all_borrowings_unknown_include(self, service, mock_repos):
+        _, borrow_repo, _ = mock_repos
+
+        with pytest.raises(ValueError, match="Cannot include author"):
+            service.get_all_active_borrowings(include="book,author")
+        borrow_repo.get_all_borrowings.assert_not_called()
@@ -0,0 +1,108 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import Book, Librarian, Person
+from app.repositories.book_repository import BookRepository
+from app.utils.cache import LocalCache, attach, detached_snapshot
+
+
+class TestLocalCache:
+    def test_get_returns_stored_value(self):
+        cache = LocalCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_entries_expire(self):
+        cache = LocalCache(max_size=10, ttl_seconds=60)
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("app.utils.cache.time.monotonic", return_value=161.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LocalCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_delete(self):
+        cache = LocalCache()
+        cache.set("a", 1)
+        cache.delete("a")
+        cache.delete("missing")
+
+        assert cache.get("a") is None
+
+
+class TestDetachedSnapshot:
+    @pytest.fixture
+    def librarian(self):
+        person = Person(id=1, first_name="John", last_name="Doe", email="john@example.com", version_id=1)
+        return Librarian(id=1, person=person, person_id=1, hash_password="hashed",
+                         created_at=datetime.now(), updated_at=datetime.now())
+
+    def test_attach_makes_clean_persistent_copy(self, librarian):
+        snapshot = detached_snapshot(librarian, "person")
+        db = Session()
+
+        attached = attach(db, snapshot)
+
+        assert attached is not snapshot
+        assert attached in db and attached.person in db
+        assert attached.person.email == "john@example.com"
+        assert not db.dirty and not db.new
+
+    def test_changes_to_attached_copy_do_not_leak_into_cache(self, librarian):
+        snapshot = detached_snapshot(librarian, "person")
+
+        attach(Session(), snapshot).hash_password = "changed"
+
+        assert snapshot.hash_password == "hashed"
+
+
+class TestBookRepositoryCache:
+    @pytest.fixture
+    def book(self):
+        return Book(id=3, name="Book", author="Author", year=2000, isbn="123", number_of_copies=2, version_id=1)
+
+    def test_second_read_is_served_from_cache(self, book):
+        repository = BookRepository(Session(), cache=LocalCache())
+        repository.get_by_id = MagicMock(return_value=book)
+
+        first = repository.get_cached_by_id(3)
+        second = repository.get_cached_by_id(3)
+
+        repository.get_by_id.assert_called_once_with(3)
+        assert first is book
+        assert second.number_of_copies == 2
+
+    def test_without_cache_always_queries(self, book):
+        repository = BookRepository(Session())
+        repository.get_by_id = MagicMock(return_value=book)
+
+        repository.get_cached_by_id(3)
+        repository.get_cached_by_id(3)
+
+        assert repository.get_by_id.call_count == 2
+
+    def test_write_evicts_cached_book(self, book):
+        db = MagicMock()
+        db.get.return_value = book
+        cache = LocalCache()
+        cache.set(3, detached_snapshot(book))
+        repository = BookRepository(db, cache=cache)
+
+        repository.increase_book_copies(3)
+
+        assert cache.get(3) is None
@@ -0,0 +1,122 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.repositories.book_repository import BookRepository
+from app.repositories.librarian_repository import LibrarianRepository
+from app.utils.cache import LocalCache
+from app.utils.cache_invalidation import BOOK_CACHE, PRINCIPAL_CACHE, InvalidationListener
+
+
+class FakeConnection:
+    """Stands in for a psycopg2 connection: select() sees it readable once a notify is queued."""
+
+    def __init__(self, payloads):
+        self.autocommit = False
+        self.notifies = []
+        self._pending = list(payloads)
+        self.cursor_mock = MagicMock()
+        self.closed = False
+
+    def cursor(self):
+        return self.cursor_mock
+
+    def poll(self):
+        self.notifies.extend(SimpleNamespace(payload=payload) for payload in self._pending)
+        self._pending = []
+
+    def close(self):
+        self.closed = True
+
+
+class TestInvalidationListener:
+    @pytest.fixture
+    def caches(self):
+        book_cache = LocalCache()
+        principal_cache = LocalCache()
+        book_cache.set(1, "book 1")
+        book_cache.set(2, "book 2")
+        principal_cache.set(1, "librarian 1")
+        return {BOOK_CACHE: book_cache, PRINCIPAL_CACHE: principal_cache}
+
+    def test_handle_evicts_only_the_named_key(self, caches):
+        listener = InvalidationListener(MagicMock(), caches)
+
+        listener.handle("book:1")
+
+        assert caches[BOOK_CACHE].get(1) is None
+        assert caches[BOOK_CACHE].get(2) == "book 2"
+        assert caches[PRINCIPAL_CACHE].get(1) == "librarian 1"
+
+    def test_handle_ignores_unknown_cache(self, caches):
+        listener = InvalidationListener(MagicMock(), caches)
+
+        listener.handle("reader:1")
+
+        assert caches[BOOK_CACHE].get(1) == "book 1"
+
+    def test_listens_and_applies_notifications(self, caches):
+        connection = FakeConnection(["librarian:1", "book:2"])
+        listener = InvalidationListener(lambda: connection, caches, poll_timeout=0.01)
+        applied = threading.Event()
+        original_handle = listener.handle
+
+        def handle(payload):
+            original_handle(payload)
+            if payload == "book:2":
+                applied.set()
+
+        listener.handle = handle
+        with patch("app.utils.cache_invalidation.select_module.select", side_effect=lambda r, w, x, t: (r, [], [])):
+            listener.start()
+            assert applied.wait(2)
+            listener.stop(timeout=2)
+
+        connection.cursor_mock.__enter__.return_value.execute.assert_called_once_with('LISTEN "cache_invalidation"')
+        assert connection.autocommit is True
+        assert connection.closed
+        assert caches[PRINCIPAL_CACHE].get(1) is None
+        assert caches[BOOK_CACHE].get(2) is None
+        assert caches[BOOK_CACHE].get(1) == "book 1"
+
+    def test_connection_failure_clears_caches(self, caches):
+        failed = threading.Event()
+
+        def connection_factory():
+            failed.set()
+            raise OSError("connection refused")
+
+        listener = InvalidationListener(connection_factory, caches, reconnect_delay=0.01)
+        listener.start()
+        assert failed.wait(2)
+        listener.stop(timeout=2)
+
+        assert len(caches[BOOK_CACHE]) == 0
+        assert len(caches[PRINCIPAL_CACHE]) == 0
+
+
+class TestRepositoriesPublishInvalidations:
+    def test_book_write_notifies_in_the_same_transaction(self):
+        db = MagicMock()
+        db.get.return_value = MagicMock(number_of_copies=1)
+        calls = []
+        db.execute.side_effect = lambda statement: calls.append(("notify", str(statement.compile(
+            compile_kwargs={"literal_binds": True}))))
+        db.flush.side_effect = lambda: calls.append(("flush", None))
+
+        BookRepository(db).decrease_book_copies(5)
+
+        assert calls[0][0] == "notify" and "pg_notify('cache_invalidation', 'book:5')" in calls[0][1]
+        assert calls[1] == ("flush", None)
+        db.commit.assert_not_called()
+
+    def test_librarian_password_change_notifies(self):
+        db = MagicMock()
+        db.get.return_value = MagicMock()
+
+        LibrarianRepository(db).change_password(3, "new_hash")
+
+        statement = db.execute.call_args.args[0]
+        assert "'librarian:3'" in str(statement.compile(compile_kwargs={"literal_binds": True}))
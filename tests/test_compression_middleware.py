@@ -0,0 +1,94 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression_middleware import CompressionMiddleware, negotiate_encoding
+
+LARGE_BODY = "book " * 1000
+
+
+@pytest.fixture
+def middleware_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(LARGE_BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter(["chunk-%d " % i * 50 for i in range(5)]), media_type="text/plain")
+
+    return app
+
+
+@pytest.fixture
+def client(middleware_app):
+    return TestClient(middleware_app)
+
+
+def get_raw(client, path, accept_encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_negotiate_encoding_prefers_highest_quality():
+    assert negotiate_encoding("gzip;q=0.5, zstd;q=0.9", ["zstd", "gzip"]) == "zstd"
+    assert negotiate_encoding("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+    assert negotiate_encoding("br", ["gzip"]) is None
+    assert negotiate_encoding("*;q=0.1", ["gzip"]) == "gzip"
+    assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+    assert negotiate_encoding("", ["gzip"]) is None
+
+
+def test_large_response_is_gzipped(client):
+    response, raw = get_raw(client, "/large", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw).decode() == LARGE_BODY
+
+
+def test_small_response_is_not_compressed(client):
+    response, raw = get_raw(client, "/small", "gzip")
+
+    assert "content-encoding" not in response.headers
+    assert raw == b"tiny"
+
+
+def test_identity_when_not_accepted(client):
+    response, raw = get_raw(client, "/large", "identity")
+
+    assert "content-encoding" not in response.headers
+    assert raw.decode() == LARGE_BODY
+
+
+def test_streaming_response_is_compressed_incrementally(client):
+    response, raw = get_raw(client, "/stream", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert zlib.decompress(raw, 16 + zlib.MAX_WBITS).decode() == "".join("chunk-%d " % i * 50 for i in range(5))
+
+
+def test_repeated_payload_is_served_from_cache(monkeypatch):
+    middleware = CompressionMiddleware(app=None, minimum_size=0)
+    calls = []
+    original = middleware._compress
+    monkeypatch.setattr(middleware, "_compress", lambda encoding, body: calls.append(body) or original(encoding, body))
+
+    first = middleware.compress_body("gzip", LARGE_BODY.encode())
+    second = middleware.compress_body("gzip", LARGE_BODY.encode())
+
+    assert first == second
+    assert len(calls) == 1
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.utils.event_broadcaster import EventBroadcaster, StreamEvent
+
+
+class InMemoryOutbox:
+    def __init__(self):
+        self.events = []
+
+    def add(self, id, event_type="borrowing.created", payload=None):
+        self.events.append(SimpleNamespace(id=id, event_type=event_type, payload=payload or {"id": id}))
+
+    def get_after(self, last_id, limit):
+        return [event for event in sorted(self.events, key=lambda e: e.id) if event.id > last_id][:limit]
+
+    def get_last_id(self):
+        return max((event.id for event in self.events), default=0)
+
+    def purge_before(self, cutoff):
+        return 0
+
+
+@pytest.fixture
+def outbox():
+    return InMemoryOutbox()
+
+
+@pytest.fixture
+def broadcaster(outbox):
+    return EventBroadcaster(
+        MagicMock, poll_interval=3600, queue_size=2, gap_timeout=60, repository_factory=lambda db: outbox
+    )
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait().id)
+    return events
+
+
+class TestEventBroadcaster:
+    def test_fans_out_new_events_to_every_subscriber(self, broadcaster, outbox):
+        async def scenario():
+            outbox.add(1)
+            first = await broadcaster.subscribe()
+            second = await broadcaster.subscribe()
+            outbox.add(2)
+            await broadcaster._poll()
+            await broadcaster.stop()
+            return drain(first), drain(second)
+
+        assert asyncio.run(scenario()) == ([2], [2])
+
+    def test_waits_for_gap_before_skipping_it(self, broadcaster, outbox):
+        async def scenario():
+            subscription = await broadcaster.subscribe()
+            outbox.add(2)
+            await broadcaster._poll()
+            held_back = drain(subscription)
+            outbox.add(1)
+            await broadcaster._poll()
+            await broadcaster.stop()
+            return held_back, drain(subscription)
+
+        assert asyncio.run(scenario()) == ([], [1, 2])
+
+    def test_slow_subscriber_is_closed(self, broadcaster, outbox):
+        async def scenario():
+            subscription = await broadcaster.subscribe()
+            for id in (1, 2, 3):
+                outbox.add(id)
+            await broadcaster._poll()
+            await broadcaster.stop()
+            return subscription
+
+        subscription = asyncio.run(scenario())
+        assert subscription.closed
+        assert drain(subscription) == [1, 2]
+
+    def test_replay_stops_at_the_published_position(self, broadcaster, outbox):
+        async def scenario():
+            for id in (1, 2):
+                outbox.add(id)
+            subscription = await broadcaster.subscribe()
+            # 4 is committed but 3 is not yet: the poller holds 4 back, and so must the replay
+            outbox.add(4)
+            await broadcaster._poll()
+            replayed = [event.id async for event in broadcaster.replay(0)]
+            outbox.add(3)
+            await broadcaster._poll()
+            await broadcaster.stop()
+            return replayed, drain(subscription)
+
+        assert asyncio.run(scenario()) == ([1, 2], [3, 4])
+
+    def test_to_sse(self):
+        event = StreamEvent(7, "book.deleted", {"id": 3})
+        assert event.to_sse() == 'id: 7\nevent: book.deleted\ndata: {"id": 3}\n\n'
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.fine_repository import FineRepository
+
+
+def accrual_sql():
+    db = MagicMock()
+    db.execute.return_value.rowcount = 0
+    FineRepository(db).accrue(datetime(2025, 7, 1, tzinfo=timezone.utc), None, Decimal("5.00"), Decimal("100.00"))
+    statement = db.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestFineAccrual:
+    def test_capped_fine_still_updates_days_overdue(self):
+        sql = accrual_sql()
+
+        # A fine at max_fine keeps its amount but not its day count, so both are compared
+        assert "SET days_overdue = excluded.days_overdue, amount = excluded.amount" in sql
+        assert (
+            "WHERE (fines.amount, fines.days_overdue) IS DISTINCT FROM "
+            "(excluded.amount, excluded.days_overdue)"
+        ) in sql
+
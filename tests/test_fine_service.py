@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import ANY, create_autospec
+
+import pytest
+
+from app.models import Fine
+from app.repositories.fine_repository import FineRepository
+from app.repositories.job_watermark_repository import JobWatermarkRepository
+from app.services.fine_service import FINE_ACCRUAL_JOB, FineService
+from app.utils.settings import FineSettings
+
+
+class TestFineService:
+    @pytest.fixture
+    def mock_fine_repo(self):
+        return create_autospec(FineRepository)
+
+    @pytest.fixture
+    def mock_watermark_repo(self):
+        return create_autospec(JobWatermarkRepository)
+
+    @pytest.fixture
+    def fine_service(self, mock_fine_repo, mock_watermark_repo):
+        settings = FineSettings(fine_per_day=Decimal("5.00"), max_fine=Decimal("100.00"))
+        return FineService(mock_fine_repo, mock_watermark_repo, settings)
+
+    def test_accrue_fines_first_run(self, fine_service, mock_fine_repo, mock_watermark_repo):
+        mock_watermark_repo.get.return_value = None
+        mock_fine_repo.accrue.return_value = 7
+
+        result = fine_service.accrue_fines()
+
+        assert result.processed == 7
+        mock_fine_repo.accrue.assert_called_once_with(
+            now=result.watermark,
+            since=None,
+            fine_per_day=Decimal("5.00"),
+            max_fine=Decimal("100.00")
+        )
+        mock_watermark_repo.set.assert_called_once_with(FINE_ACCRUAL_JOB, result.watermark)
+
+    def test_accrue_fines_uses_previous_watermark(self, fine_service, mock_fine_repo, mock_watermark_repo):
+        previous_run = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        mock_watermark_repo.get.return_value = previous_run
+        mock_fine_repo.accrue.return_value = 0
+
+        fine_service.accrue_fines()
+
+        mock_fine_repo.accrue.assert_called_once_with(now=ANY, since=previous_run, fine_per_day=ANY, max_fine=ANY)
+
+    def test_accrue_fines_keeps_watermark_on_failure(self, fine_service, mock_fine_repo, mock_watermark_repo):
+        mock_watermark_repo.get.return_value = None
+        mock_fine_repo.accrue.side_effect = ValueError("Database error when accruing fines")
+
+        with pytest.raises(ValueError, match="accruing fines"):
+            fine_service.accrue_fines()
+        mock_watermark_repo.set.assert_not_called()
+
+    def test_get_reader_fines(self, fine_service, mock_fine_repo):
+        fines = [Fine(id=1, borrowing_id=1, reader_id=1, days_overdue=2, amount=Decimal("10.00"))]
+        mock_fine_repo.get_by_reader.return_value = fines
+
+        assert fine_service.get_reader_fines(1) == fines
+        mock_fine_repo.get_by_reader.assert_called_once_with(1)
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.models import Hold
+from app.models.hold_model import HOLD_CANCELLED, HOLD_READY, HOLD_WAITING
+from app.repositories.hold_repository import HoldRepository
+
+
+class TestHoldRepository:
+    @pytest.fixture
+    def db(self):
+        engine = create_engine("sqlite://")
+        Hold.metadata.create_all(engine, tables=[Hold.__table__])
+        start = datetime(2025, 7, 1, tzinfo=timezone.utc)
+        with Session(engine) as session:
+            session.add_all([
+                Hold(id=1, book_id=1, reader_id=2, status=HOLD_WAITING, created_at=start),
+                Hold(id=2, book_id=1, reader_id=3, status=HOLD_CANCELLED, created_at=start + timedelta(hours=1)),
+                Hold(id=3, book_id=1, reader_id=1, status=HOLD_WAITING, created_at=start + timedelta(hours=2)),
+                Hold(id=4, book_id=2, reader_id=1, status=HOLD_WAITING, created_at=start + timedelta(hours=3)),
+                Hold(id=5, book_id=3, reader_id=1, status=HOLD_READY, created_at=start + timedelta(hours=4)),
+                Hold(id=6, book_id=2, reader_id=4, status=HOLD_WAITING, created_at=start + timedelta(hours=5)),
+            ])
+            session.commit()
+            yield session
+
+    def test_positions_come_from_one_query(self, db):
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        holds = HoldRepository(db).get_by_reader_with_positions(1)
+
+        assert [(hold.id, position) for hold, position in holds] == [(3, 2), (4, 1), (5, None)]
+        assert len(statements) == 1
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, Mock
+
+import pytest
+
+from app.models import Hold
+from app.models.hold_model import HOLD_CANCELLED, HOLD_EXPIRED, HOLD_FULFILLED, HOLD_READY, HOLD_WAITING
+from app.services.hold_service import HoldService
+from app.utils.settings import LoanSettings
+
+
+class TestHoldService:
+    @pytest.fixture
+    def mock_repos(self):
+        hold_repo = Mock()
+        book_repo = Mock()
+        reader_repo = Mock()
+        return hold_repo, book_repo, reader_repo
+
+    @pytest.fixture
+    def unit_of_work(self):
+        return Mock()
+
+    @pytest.fixture
+    def service(self, mock_repos, unit_of_work):
+        hold_repo, book_repo, reader_repo = mock_repos
+        return HoldService(
+            hold_repo, book_repo, reader_repo, LoanSettings(hold_pickup_days=3), Mock(), unit_of_work
+        )
+
+    @pytest.fixture
+    def waiting_hold(self):
+        return Hold(id=1, book_id=1, reader_id=1, status=HOLD_WAITING, created_at=datetime.now(timezone.utc))
+
+    def test_place_hold_success(self, service, mock_repos, waiting_hold):
+        hold_repo, book_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        book_repo.exists.return_value = True
+        book_repo.is_book_available.return_value = False
+        hold_repo.get_open_hold.return_value = None
+        hold_repo.create.return_value = waiting_hold
+        hold_repo.get_position.return_value = 3
+
+        hold, position = service.place_hold(book_id=1, reader_id=1)
+
+        assert hold == waiting_hold
+        assert position == 3
+        hold_repo.create.assert_called_once_with(1, 1)
+
+    def test_place_hold_on_available_book(self, service, mock_repos):
+        hold_repo, book_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        book_repo.exists.return_value = True
+        book_repo.is_book_available.return_value = True
+
+        with pytest.raises(ValueError, match="Book is available"):
+            service.place_hold(book_id=1, reader_id=1)
+        hold_repo.create.assert_not_called()
+
+    def test_place_duplicate_hold(self, service, mock_repos, waiting_hold):
+        hold_repo, book_repo, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        book_repo.exists.return_value = True
+        book_repo.is_book_available.return_value = False
+        hold_repo.get_open_hold.return_value = waiting_hold
+
+        with pytest.raises(ValueError, match="already has a hold"):
+            service.place_hold(book_id=1, reader_id=1)
+
+    def test_cancel_waiting_hold(self, service, mock_repos, waiting_hold):
+        hold_repo, book_repo, _ = mock_repos
+        hold_repo.get_by_id.return_value = waiting_hold
+
+        service.cancel_hold(1)
+
+        hold_repo.set_status.assert_called_once_with(waiting_hold, HOLD_CANCELLED)
+        hold_repo.allocate_next.assert_not_called()
+        book_repo.increase_book_copies.assert_not_called()
+
+    def test_cancel_ready_hold_passes_copy_on(self, service, mock_repos, waiting_hold):
+        hold_repo, book_repo, _ = mock_repos
+        waiting_hold.status = HOLD_READY
+        hold_repo.get_by_id.return_value = waiting_hold
+        hold_repo.allocate_next.return_value = None
+
+        service.cancel_hold(1)
+
+        hold_repo.allocate_next.assert_called_once_with(1, ANY, copy_id=None)
+        ready_until = hold_repo.allocate_next.call_args.args[1]
+        assert timedelta(days=2) < ready_until - datetime.now(timezone.utc) <= timedelta(days=3)
+        book_repo.increase_book_copies.assert_called_once_with(1)
+
+    def test_cancel_closed_hold(self, service, mock_repos, waiting_hold):
+        hold_repo, _, _ = mock_repos
+        waiting_hold.status = HOLD_FULFILLED
+        hold_repo.get_by_id.return_value = waiting_hold
+
+        with pytest.raises(ValueError, match="Cannot cancel a fulfilled hold"):
+            service.cancel_hold(1)
+
+    def test_expire_ready_holds(self, service, mock_repos, unit_of_work):
+        hold_repo, book_repo, _ = mock_repos
+        expired = [Hold(id=i, book_id=i, reader_id=1, status=HOLD_READY) for i in (1, 2)]
+        hold_repo.get_next_expired_ready.side_effect = expired + [None]
+        hold_repo.allocate_next.side_effect = [Hold(id=9, book_id=1, reader_id=2), None]
+
+        assert service.expire_ready_holds() == 2
+
+        hold_repo.set_status.assert_any_call(expired[0], HOLD_EXPIRED)
+        hold_repo.set_status.assert_any_call(expired[1], HOLD_EXPIRED)
+        book_repo.increase_book_copies.assert_called_once_with(2)
+        # Each hold is its own transaction, so a failure keeps the holds already expired
+        assert unit_of_work.commit.call_count == 2
+
+    def test_get_reader_holds_reads_positions_in_one_call(self, service, mock_repos, waiting_hold):
+        hold_repo, _, reader_repo = mock_repos
+        reader_repo.reader_exists.return_value = True
+        hold_repo.get_by_reader_with_positions.return_value = [(waiting_hold, 2)]
+
+        assert service.get_reader_holds(1) == [(waiting_hold, 2)]
+        hold_repo.get_by_reader_with_positions.assert_called_once_with(1)
+        hold_repo.get_position.assert_not_called()
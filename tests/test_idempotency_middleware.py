@@ -0,0 +1,241 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+from jose import jwt
+from pydantic import SecretStr
+from sqlalchemy.dialects import postgresql
+
+from app.middleware.idempotency_middleware import IdempotencyMiddleware
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.utils.security import SecuritySettings
+
+SECURITY_SETTINGS = SecuritySettings(
+    secret_key=SecretStr("test-secret"), algorithm="HS256", access_token_expire_minutes=15
+)
+
+
+def bearer(librarian_id, jti="a"):
+    token = jwt.encode({"sub": f"{librarian_id}@library.org", "lid": librarian_id, "jti": jti}, "test-secret")
+    return {"Authorization": f"Bearer {token}"}
+
+
+class InMemoryIdempotencyRepository:
+    def __init__(self):
+        self.records = {}
+
+    def claim(self, scope, key, request_hash, expires_at, locked_until):
+        record = self.records.get((scope, key))
+        now = datetime.now(timezone.utc)
+        if record is not None and not (record.status_code is None and record.locked_until < now):
+            return record
+        self.records[(scope, key)] = SimpleNamespace(
+            request_hash=request_hash, status_code=None, content_type=None, response_body=None,
+            response_headers=None, locked_until=locked_until
+        )
+        return None
+
+    def complete(self, scope, key, status_code, content_type, body, headers=None):
+        record = self.records[(scope, key)]
+        record.status_code = status_code
+        record.content_type = content_type
+        record.response_body = body
+        record.response_headers = headers
+
+    def release(self, scope, key):
+        record = self.records.get((scope, key))
+        if record is not None and record.status_code is None:
+            del self.records[(scope, key)]
+
+
+@pytest.fixture
+def repository():
+    return InMemoryIdempotencyRepository()
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def client(repository, calls):
+    app = FastAPI()
+    app.add_middleware(
+        IdempotencyMiddleware,
+        session_factory=MagicMock,
+        repository_factory=lambda db: repository,
+        security_settings=SECURITY_SETTINGS,
+    )
+
+    @app.post("/borrow")
+    def borrow(payload: dict):
+        calls.append(payload)
+        return {"id": len(calls), **payload}
+
+    @app.patch("/books/1", status_code=201)
+    def update_book(payload: dict, response: Response):
+        calls.append(payload)
+        response.headers["ETag"] = '"7"'
+        response.headers["Location"] = "/books/1"
+        return payload
+
+    @app.post("/auth/login")
+    def login():
+        calls.append("login")
+        return {"access_token": "secret", "refresh_token": "secret"}
+
+    @app.post("/fail")
+    def fail():
+        calls.append("fail")
+        raise HTTPException(status_code=400, detail="Book not available")
+
+    return TestClient(app, headers=bearer(1))
+
+
+class TestIdempotencyMiddleware:
+    def test_replays_stored_response(self, client, calls):
+        first = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+        second = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["idempotent-replayed"] == "true"
+        assert second.headers["content-type"] == "application/json"
+        assert len(calls) == 1
+
+    def test_replays_stored_headers(self, client, calls):
+        first = client.patch("/books/1", json={"name": "Dune"}, headers={"Idempotency-Key": "abc"})
+        second = client.patch("/books/1", json={"name": "Dune"}, headers={"Idempotency-Key": "abc"})
+
+        assert second.status_code == 201
+        assert second.headers["idempotent-replayed"] == "true"
+        assert second.headers["etag"] == first.headers["etag"] == '"7"'
+        assert second.headers["location"] == "/books/1"
+        assert second.headers["content-length"] == str(len(first.content))
+        assert len(calls) == 1
+
+    def test_requests_without_key_are_not_deduplicated(self, client, calls):
+        client.post("/borrow", json={"book_id": 1})
+        client.post("/borrow", json={"book_id": 1})
+
+        assert len(calls) == 2
+
+    def test_reused_key_with_different_body_is_rejected(self, client, calls):
+        client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+        response = client.post("/borrow", json={"book_id": 2}, headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 422
+        assert len(calls) == 1
+
+    def test_in_progress_key_returns_conflict(self, client, repository, calls):
+        client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+        record = next(iter(repository.records.values()))
+        record.status_code = None
+
+        response = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 409
+        assert len(calls) == 1
+
+    def test_keys_are_scoped_to_caller(self, client, calls):
+        client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc", **bearer(1)})
+        client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc", **bearer(2)})
+
+        assert len(calls) == 2
+
+    def test_retry_with_refreshed_token_is_replayed(self, client, calls):
+        first = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc", **bearer(1, "a")})
+        second = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc", **bearer(1, "b")})
+
+        assert second.headers["idempotent-replayed"] == "true"
+        assert second.json() == first.json()
+        assert len(calls) == 1
+
+    def test_requests_without_valid_token_are_not_deduplicated(self, client, repository, calls):
+        for authorization in ("", "Bearer forged", "Basic dXNlcjpwYXNz"):
+            headers = {"Idempotency-Key": "abc", "Authorization": authorization}
+            client.post("/borrow", json={"book_id": 1}, headers=headers)
+
+        assert len(calls) == 3
+        assert repository.records == {}
+
+    def test_failed_request_releases_key(self, client, repository, calls):
+        first = client.post("/fail", headers={"Idempotency-Key": "abc"})
+        second = client.post("/fail", headers={"Idempotency-Key": "abc"})
+
+        assert first.status_code == 400
+        assert second.status_code == 400
+        assert "idempotent-replayed" not in second.headers
+        assert calls == ["fail", "fail"]
+        assert repository.records == {}
+
+    def test_overlong_key_is_rejected(self, client, calls):
+        response = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "x" * 256})
+
+        assert response.status_code == 400
+        assert calls == []
+
+    def test_auth_responses_are_never_stored(self, client, repository, calls):
+        first = client.post("/auth/login", headers={"Idempotency-Key": "abc"})
+        second = client.post("/auth/login", headers={"Idempotency-Key": "abc"})
+
+        assert first.status_code == 200
+        assert "idempotent-replayed" not in second.headers
+        assert calls == ["login", "login"]
+        assert repository.records == {}
+
+    def test_abandoned_key_is_taken_over_after_lease(self, client, repository, calls):
+        client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+        record = next(iter(repository.records.values()))
+        record.status_code = None
+        record.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        response = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 200
+        assert "idempotent-replayed" not in response.headers
+        assert len(calls) == 2
+
+    def test_failed_complete_still_returns_response(self, client, repository, calls, monkeypatch):
+        def complete(*args):
+            raise ValueError("Database error when storing idempotent response")
+
+        monkeypatch.setattr(repository, "complete", complete)
+
+        response = client.post("/borrow", json={"book_id": 1}, headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 200
+        assert response.json() == {"id": 1, "book_id": 1}
+
+    def test_failed_release_still_returns_response(self, client, repository, calls, monkeypatch):
+        def release(*args):
+            raise ValueError("Database error when releasing idempotency key")
+
+        monkeypatch.setattr(repository, "release", release)
+
+        response = client.post("/fail", headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Book not available"}
+
+
+class TestIdempotencyRepository:
+    def test_claim_takes_over_expired_or_abandoned_keys(self):
+        db = MagicMock()
+        db.execute.return_value.scalar_one_or_none.return_value = 1
+        now = datetime.now(timezone.utc)
+
+        assert IdempotencyRepository(db).claim("caller", "abc", "hash", now, now) is None
+
+        statement = db.execute.call_args_list[0].args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "locked_until = excluded.locked_until" in sql
+        assert (
+            "WHERE idempotencykeys.expires_at < now() OR "
+            "idempotencykeys.status_code IS NULL AND idempotencykeys.locked_until < now()"
+        ) in sql
@@ -68,7 +68,6 @@ class TestLibrarianService:
 
     def test_create_librarian_success(self, librarian_service, mock_repository, mock_password_security, librarian_create_data):
         # Arrange
-        mock_repository.get_by_email.return_value = None
         expected_librarian = MagicMock()
         mock_repository.create.return_value = expected_librarian
 
@@ -77,7 +76,7 @@ class TestLibrarianService:
 
         # Assert
         assert result == expected_librarian
-        mock_repository.get_by_email.assert_called_once_with(librarian_create_data.person.email)
+        mock_repository.get_by_email.assert_not_called()
         mock_password_security.get_password_hash.assert_called_once_with(librarian_create_data.password)
         mock_repository.create.assert_called_once()
         call_args = mock_repository.create.call_args[0][0]
@@ -86,7 +85,7 @@ class TestLibrarianService:
 
     def test_create_librarian_with_existing_email(self, librarian_service, mock_repository, librarian_create_data):
         # Arrange
-        mock_repository.get_by_email.return_value = MagicMock()
+        mock_repository.create.side_effect = ValueError("Email already in use")
 
         # Act & Assert
         with pytest.raises(ValueError, match="Email already in use"):
@@ -94,7 +93,6 @@ class TestLibrarianService:
 
     def test_create_librarian_repository_error(self, librarian_service, mock_repository, librarian_create_data):
         # Arrange
-        mock_repository.get_by_email.return_value = None
         mock_repository.create.side_effect = SQLAlchemyError("DB error")
 
         # Act & Assert
@@ -104,7 +102,6 @@ class TestLibrarianService:
     def test_update_librarian_success(self, librarian_service, mock_repository, sample_librarian, librarian_update_data):
         # Arrange
         mock_repository.get_by_id.return_value = sample_librarian
-        mock_repository.get_by_email.return_value = None
         mock_repository.update.return_value = sample_librarian
 
         # Act
@@ -129,7 +126,7 @@ class TestLibrarianService:
     def test_update_librarian_with_existing_email(self, librarian_service, mock_repository, sample_librarian, librarian_update_data):
         # Arrange
         mock_repository.get_by_id.return_value = sample_librarian
-        mock_repository.get_by_email.return_value = MagicMock()  # Simulate existing email
+        mock_repository.update.side_effect = ValueError("New email already in use")  # Unique constraint hit
 
         # Act & Assert
         with pytest.raises(ValueError, match="New email already in use"):
@@ -138,7 +135,6 @@ class TestLibrarianService:
     def test_update_librarian_repository_error(self, librarian_service, mock_repository, sample_librarian, librarian_update_data):
         # Arrange
         mock_repository.get_by_id.return_value = sample_librarian
-        mock_repository.get_by_email.return_value = None
         mock_repository.update.side_effect = SQLAlchemyError("DB error")
 
         # Act & Assert
@@ -0,0 +1,44 @@
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    @pytest.fixture
+    def registry(self):
+        return MetricsRegistry()
+
+    def test_histogram_renders_cumulative_buckets(self, registry):
+        histogram = registry.histogram("verify_seconds", "Verify time", label_names=("cost",), buckets=(0.1, 0.5))
+
+        histogram.observe(0.05, cost="12")
+        histogram.observe(0.3, cost="12")
+        histogram.observe(2.0, cost="12")
+
+        output = registry.render()
+        assert '# TYPE verify_seconds histogram' in output
+        assert 'verify_seconds_bucket{cost="12",le="0.1"} 1' in output
+        assert 'verify_seconds_bucket{cost="12",le="0.5"} 2' in output
+        assert 'verify_seconds_bucket{cost="12",le="+Inf"} 3' in output
+        assert 'verify_seconds_count{cost="12"} 3' in output
+
+    def test_counter_tracks_label_sets_separately(self, registry):
+        counter = registry.counter("cache_requests_total", "Cache lookups", label_names=("result",))
+
+        counter.inc(result="hit")
+        counter.inc(result="hit")
+        counter.inc(result="miss")
+
+        assert counter.value(result="hit") == 2
+        assert 'cache_requests_total{result="miss"} 1.0' in registry.render()
+
+    def test_register_returns_existing_metric(self, registry):
+        first = registry.counter("events_total", "Events")
+
+        assert registry.counter("events_total", "Events") is first
+
+    def test_rejects_unknown_labels(self, registry):
+        counter = registry.counter("events_total", "Events", label_names=("type",))
+
+        with pytest.raises(ValueError, match="Expected labels type"):
+            counter.inc(kind="x")
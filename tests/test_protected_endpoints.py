@@ -13,8 +13,13 @@ from main import app
 
 
 @pytest.fixture
-def client():
-    return TestClient(app)
+def client(monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "test_secret_key")
+    monkeypatch.setenv("ALGORITHM", "HS256")
+    monkeypatch.setenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    # Entering the client runs the lifespan, which builds the application container
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture
@@ -78,7 +83,7 @@ def test_access_with_valid_token(client, mock_librarian, mock_librarian_service)
         )
 
         assert response.status_code == status.HTTP_200_OK
-        mock_librarian_service.update.assert_called_once_with(1, LibrarianUpdate(**update_data))
+        mock_librarian_service.update.assert_called_once_with(1, LibrarianUpdate(**update_data), actor_id=1)
 
         # Проверка структуры ответа
         response_data = response.json()
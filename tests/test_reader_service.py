@@ -10,6 +10,7 @@ from app.repositories.reader_repository import ReaderRepository
 from app.schemas.person_schema import PersonCreate, PersonUpdate
 from app.schemas.reader_schema import ReaderCreate, ReaderUpdate
 from app.services.reader_service import ReaderService
+from app.utils.exceptions import PreconditionFailedError
 
 
 class TestReaderService:
@@ -67,7 +68,6 @@ class TestReaderService:
 
     def test_create_reader_success(self, reader_service, mock_repository, reader_create_data):
         # Arrange
-        mock_repository.get_by_email.return_value = None
         expected_reader = MagicMock()
         mock_repository.create.return_value = expected_reader
 
@@ -76,12 +76,12 @@ class TestReaderService:
 
         # Assert
         assert result == expected_reader
-        mock_repository.get_by_email.assert_called_once_with(reader_create_data.person.email)
+        mock_repository.get_by_email.assert_not_called()
         mock_repository.create.assert_called_once_with(reader_create_data)
 
     def test_create_reader_with_existing_email(self, reader_service, mock_repository, reader_create_data):
         # Arrange
-        mock_repository.get_by_email.return_value = MagicMock()
+        mock_repository.create.side_effect = ValueError("Email already in use")
 
         # Act & Assert
         with pytest.raises(ValueError, match="Email already in use"):
@@ -89,7 +89,6 @@ class TestReaderService:
 
     def test_create_reader_repository_error(self, reader_service, mock_repository, reader_create_data):
         # Arrange
-        mock_repository.get_by_email.return_value = None
         mock_repository.create.side_effect = SQLAlchemyError("DB error")
 
         # Act & Assert
@@ -99,7 +98,6 @@ class TestReaderService:
     def test_update_reader_success(self, reader_service, mock_repository, sample_reader, reader_update_data):
         # Arrange
         mock_repository.get_by_id.return_value = sample_reader
-        mock_repository.get_by_email.return_value = None
         mock_repository.update.return_value = sample_reader
 
         # Act
@@ -110,6 +108,14 @@ class TestReaderService:
         mock_repository.get_by_id.assert_called_once_with(sample_reader.id)
         mock_repository.update.assert_called_once_with(sample_reader.id, reader_update_data)
 
+    def test_update_reader_version_conflict(self, reader_service, mock_repository, sample_reader, reader_update_data):
+        mock_repository.get_by_id.return_value = sample_reader
+        mock_repository.update.side_effect = PreconditionFailedError("Reader with id 1 was modified by another request")
+
+        with pytest.raises(PreconditionFailedError):
+            reader_service.update(sample_reader.id, reader_update_data, expected_version=2)
+        mock_repository.update.assert_called_once_with(sample_reader.id, reader_update_data, expected_version=2)
+
     def test_update_reader_not_found(self, reader_service, mock_repository, reader_update_data):
         # Arrange
         mock_repository.get_by_id.return_value = None
@@ -121,7 +127,7 @@ class TestReaderService:
     def test_update_reader_with_existing_email(self, reader_service, mock_repository, sample_reader, reader_update_data):
         # Arrange
         mock_repository.get_by_id.return_value = sample_reader
-        mock_repository.get_by_email.return_value = MagicMock()  # Simulate existing email
+        mock_repository.update.side_effect = ValueError("New email already in use")  # Unique constraint hit
 
         # Act & Assert
         with pytest.raises(ValueError, match="New email already in use"):
@@ -130,7 +136,6 @@ class TestReaderService:
     def test_update_reader_repository_error(self, reader_service, mock_repository, sample_reader, reader_update_data):
         # Arrange
         mock_repository.get_by_id.return_value = sample_reader
-        mock_repository.get_by_email.return_value = None
         mock_repository.update.side_effect = SQLAlchemyError("DB error")
 
         # Act & Assert
@@ -271,4 +276,22 @@ class TestReaderService:
 
         # Act & Assert
         with pytest.raises(ValueError, match="Failed to get all readers"):
-            reader_service.get_all()
\ No newline at end of file
+            reader_service.get_all()
+
+    def test_get_many_readers_success(self, reader_service, mock_repository, sample_reader):
+        # Arrange
+        mock_repository.get_many.return_value = ([sample_reader], [2])
+
+        # Act
+        readers, missing = reader_service.get_many([1, 2])
+
+        # Assert
+        assert readers == [sample_reader]
+        assert missing == [2]
+        mock_repository.get_many.assert_called_once_with([1, 2])
+
+    def test_get_many_readers_too_many_ids(self, reader_service, mock_repository):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Cannot request more than 100 readers at once"):
+            reader_service.get_many(list(range(1, 102)))
+        mock_repository.get_many.assert_not_called()
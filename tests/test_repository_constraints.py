@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.book_model import ISBN_CONSTRAINT
+from app.models.person_model import EMAIL_CONSTRAINT
+from app.repositories.book_repository import BookRepository
+from app.repositories.reader_repository import ReaderRepository
+from app.schemas.book_schema import BookCreate
+from app.schemas.person_schema import PersonCreate
+from app.schemas.reader_schema import ReaderCreate
+from app.utils.exceptions import violated_constraint
+
+
+def unique_violation(constraint_name):
+    orig = Exception("duplicate key value violates unique constraint")
+    orig.diag = SimpleNamespace(constraint_name=constraint_name)
+    return IntegrityError("INSERT ...", {}, orig)
+
+
+class TestConstraintTranslation:
+    def test_violated_constraint_name(self):
+        assert violated_constraint(unique_violation(ISBN_CONSTRAINT)) == ISBN_CONSTRAINT
+        assert violated_constraint(IntegrityError("INSERT ...", {}, Exception("no diag"))) is None
+
+    def test_duplicate_isbn_on_create(self):
+        db = MagicMock()
+        db.flush.side_effect = unique_violation(ISBN_CONSTRAINT)
+
+        with pytest.raises(ValueError, match="^Book with this ISBN already exists$"):
+            BookRepository(db).create(BookCreate(name="Book", author="Author", year=2020, isbn="123-456-789"))
+        db.rollback.assert_called_once()
+
+    def test_other_integrity_errors_keep_the_generic_message(self):
+        db = MagicMock()
+        db.flush.side_effect = unique_violation("books_pkey")
+
+        with pytest.raises(ValueError, match="Database integrity error when creating book"):
+            BookRepository(db).create(BookCreate(name="Book", author="Author", year=2020, isbn="123-456-789"))
+
+    def test_duplicate_email_on_create(self):
+        db = MagicMock()
+        db.flush.side_effect = unique_violation(EMAIL_CONSTRAINT)
+        data = ReaderCreate(person=PersonCreate(
+            first_name="John", last_name="Doe", surname=None, email="john@example.com"
+        ))
+
+        with pytest.raises(ValueError, match="^Email already in use$"):
+            ReaderRepository(db).create(data)
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app.models import Book, BookCopy
+from app.models.book_copy_model import COPY_AVAILABLE, COPY_ON_LOAN
+from app.utils.cache import attach, detached_snapshot
+
+
+class TestShelfCount:
+    @pytest.fixture
+    def db(self):
+        engine = create_engine("sqlite://")
+        Book.metadata.create_all(engine, tables=[Book.__table__, BookCopy.__table__])
+        with Session(engine) as session:
+            session.add_all([
+                Book(id=1, name="Registered", author="A", year=2001, number_of_copies=0),
+                BookCopy(id=1, book_id=1, barcode="1-1", status=COPY_AVAILABLE),
+                BookCopy(id=2, book_id=1, barcode="1-2", status=COPY_AVAILABLE),
+                Book(id=2, name="Counted", author="A", year=2002, number_of_copies=3),
+            ])
+            session.commit()
+            yield session
+
+    def test_registered_copies_are_counted_from_bookcopies(self, db):
+        assert db.get(Book, 1).available_copies == 2
+        assert db.get(Book, 2).available_copies == 3
+
+    def test_checkout_leaves_the_title_row_alone(self, db):
+        version = db.get(Book, 1).version_id
+
+        db.execute(update(BookCopy).where(BookCopy.id == 1).values(status=COPY_ON_LOAN))
+        db.expire_all()
+
+        book = db.get(Book, 1)
+        assert book.available_copies == 1
+        assert book.version_id == version
+
+    def test_cached_snapshot_keeps_the_count(self, db):
+        snapshot = detached_snapshot(db.get(Book, 1))
+        db.expunge_all()
+
+        assert attach(db, snapshot).available_copies == 2
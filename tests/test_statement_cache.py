@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models import Book, BookCopy, Person, Reader
+from app.repositories.book_repository import BookRepository
+from app.repositories.reader_repository import ReaderRepository
+from database import STATEMENT_CACHE, record_statement_cache
+
+
+class TestStatementCache:
+    @pytest.fixture
+    def db(self):
+        engine = create_engine("sqlite://")
+        Book.metadata.create_all(engine, tables=[Book.__table__, BookCopy.__table__, Person.__table__, Reader.__table__])
+        record_statement_cache(engine)
+        with Session(engine) as session:
+            session.add_all([
+                Book(id=1, name="First", author="A", year=2001, number_of_copies=1),
+                Book(id=2, name="Second", author="B", year=2002, number_of_copies=1),
+            ])
+            session.commit()
+            yield session
+
+    def test_lambda_statements_bind_each_call(self, db):
+        repository = BookRepository(db)
+
+        assert repository.get_by_id(1).name == "First"
+        assert repository.get_by_id(2).name == "Second"
+        assert repository.get_by_id(3) is None
+        assert ReaderRepository(db).reader_exists(1) is False
+
+    def test_repeated_lookups_hit_the_compiled_cache(self, db):
+        repository = BookRepository(db)
+        repository.get_by_id(1)
+        hits = STATEMENT_CACHE.value(result="hit")
+
+        repository.get_by_id(2)
+
+        assert STATEMENT_CACHE.value(result="hit") == hits + 1
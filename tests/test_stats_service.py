@@ -0,0 +1,68 @@
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import create_autospec
+
+import pytest
+
+from app.repositories.job_watermark_repository import JobWatermarkRepository
+from app.repositories.stats_repository import StatsRepository
+from app.services.stats_service import STATS_REFRESH_JOB, StatsService
+from app.utils.settings import StatsSettings
+
+
+class TestStatsService:
+    @pytest.fixture
+    def mock_stats_repo(self):
+        return create_autospec(StatsRepository)
+
+    @pytest.fixture
+    def mock_watermark_repo(self):
+        return create_autospec(JobWatermarkRepository)
+
+    @pytest.fixture
+    def stats_service(self, mock_stats_repo, mock_watermark_repo):
+        return StatsService(mock_stats_repo, mock_watermark_repo, StatsSettings(stats_default_period_days=7))
+
+    def test_first_refresh_rebuilds_everything(self, stats_service, mock_stats_repo, mock_watermark_repo):
+        mock_watermark_repo.get.return_value = None
+
+        result = stats_service.refresh()
+
+        assert result.refreshed_days is None
+        mock_stats_repo.get_touched_days.assert_not_called()
+        mock_stats_repo.refresh_days.assert_called_once_with(None)
+        mock_watermark_repo.set.assert_called_once_with(STATS_REFRESH_JOB, result.watermark)
+
+    def test_incremental_refresh_only_touched_days(self, stats_service, mock_stats_repo, mock_watermark_repo):
+        since = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        touched = [date(2025, 5, 30), date(2025, 6, 1)]
+        mock_watermark_repo.get.return_value = since
+        mock_stats_repo.get_touched_days.return_value = touched
+
+        result = stats_service.refresh()
+
+        assert result.refreshed_days == 2
+        mock_stats_repo.get_touched_days.assert_called_once_with(since)
+        mock_stats_repo.refresh_days.assert_called_once_with(touched)
+
+    def test_refresh_without_changes(self, stats_service, mock_stats_repo, mock_watermark_repo):
+        mock_watermark_repo.get.return_value = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        mock_stats_repo.get_touched_days.return_value = []
+
+        result = stats_service.refresh()
+
+        assert result.refreshed_days == 0
+        mock_stats_repo.refresh_days.assert_not_called()
+        mock_watermark_repo.set.assert_called_once()
+
+    def test_default_period(self, stats_service, mock_stats_repo):
+        mock_stats_repo.count_active_readers.return_value = 4
+
+        result = stats_service.get_active_readers(None, None)
+
+        assert result.active_readers == 4
+        assert result.date_to - result.date_from == timedelta(days=6)
+        mock_stats_repo.count_active_readers.assert_called_once_with(result.date_from, result.date_to)
+
+    def test_invalid_period(self, stats_service):
+        with pytest.raises(ValueError, match="date_from must not be after date_to"):
+            stats_service.get_top_books(date(2025, 6, 2), date(2025, 6, 1), 10)
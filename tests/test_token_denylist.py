@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.utils.bloom_filter import BloomFilter
+from app.utils.token_denylist import TokenDenylist
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti:{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate_is_bounded(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti:{i}")
+
+        false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+
+        assert false_positives < 300
+
+    def test_saturation(self):
+        bloom = BloomFilter(capacity=2)
+        bloom.add("a")
+        assert not bloom.is_saturated()
+        bloom.add("b")
+        assert bloom.is_saturated()
+
+    def test_rejects_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=10, error_rate=1.5)
+
+
+class TestTokenDenylist:
+    @pytest.fixture
+    def now(self):
+        return datetime(2025, 7, 4, 12, 0, tzinfo=timezone.utc)
+
+    def test_unknown_token_is_not_revoked(self):
+        denylist = TokenDenylist(capacity=100)
+
+        assert denylist.might_be_revoked("abc", 1) is False
+
+    def test_add_marks_token_and_librarian(self):
+        denylist = TokenDenylist(capacity=100)
+
+        denylist.add("abc", 1)
+        denylist.add(None, 2)
+
+        assert denylist.might_be_revoked("abc", 3) is True
+        assert denylist.might_be_revoked("other", 2) is True
+        assert denylist.might_be_revoked("other", 1) is False
+
+    def test_first_refresh_loads_everything_then_increments(self, now):
+        denylist = TokenDenylist(capacity=100, refresh_interval=0, overlap=timedelta(seconds=30))
+        loader = MagicMock(side_effect=[
+            [("abc", 1, now)],
+            [("def", 1, now + timedelta(seconds=5))],
+        ])
+
+        assert denylist.refresh(loader) is True
+        assert denylist.refresh(loader) is True
+
+        assert loader.call_args_list[0].args == (None,)
+        assert loader.call_args_list[1].args == (now - timedelta(seconds=30),)
+        assert denylist.might_be_revoked("abc", None)
+        assert denylist.might_be_revoked("def", None)
+
+    def test_refresh_is_rate_limited(self, now):
+        denylist = TokenDenylist(capacity=100, refresh_interval=60)
+        loader = MagicMock(return_value=[])
+
+        assert denylist.refresh(loader) is True
+        assert denylist.refresh(loader) is False
+        assert denylist.refresh(loader, force=True) is True
+
+        assert loader.call_count == 2
+
+    def test_overlapping_rows_do_not_count_twice(self, now):
+        denylist = TokenDenylist(capacity=100, refresh_interval=0)
+        loader = MagicMock(return_value=[("abc", 1, now)])
+
+        denylist.refresh(loader)
+        denylist.refresh(loader)
+
+        assert denylist._filter.count == 1
+
+    def test_saturated_filter_is_rebuilt(self, now):
+        denylist = TokenDenylist(capacity=2, refresh_interval=0)
+        loader = MagicMock(side_effect=[
+            [("a", 1, now), ("b", 1, now)],
+            [("b", 1, now)],
+        ])
+
+        denylist.refresh(loader)
+        denylist.refresh(loader)
+
+        assert loader.call_args_list[1].args == (None,)
+        assert denylist._filter.count == 1
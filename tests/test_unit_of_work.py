@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.repositories.unit_of_work import UnitOfWork
+from database import get_db
+
+
+class TestUnitOfWork:
+    def test_commits_once_on_success(self):
+        session = MagicMock()
+
+        with UnitOfWork(session) as unit_of_work:
+            unit_of_work.session.flush()
+
+        session.commit.assert_called_once()
+        session.rollback.assert_not_called()
+        session.close.assert_not_called()
+
+    def test_rolls_back_on_error(self):
+        session = MagicMock()
+
+        with pytest.raises(ValueError):
+            with UnitOfWork(session):
+                raise ValueError("boom")
+
+        session.rollback.assert_called_once()
+        session.commit.assert_not_called()
+
+    def test_begin_closes_its_session(self):
+        session = MagicMock()
+        session.commit.side_effect = RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            with UnitOfWork.begin(lambda: session):
+                pass
+
+        session.close.assert_called_once()
+
+
+class TestRequestUnitOfWork:
+    @pytest.fixture
+    def session(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def client(self, session):
+        app = FastAPI()
+        app.state.container = SimpleNamespace(session_factory=lambda: session)
+
+        @app.post("/ok")
+        def ok(db: Session = Depends(get_db)):
+            db.flush()
+            return {"ok": True}
+
+        @app.post("/fail")
+        def fail(db: Session = Depends(get_db)):
+            db.flush()
+            raise HTTPException(status_code=400, detail="rejected")
+
+        return TestClient(app)
+
+    def test_request_commits_once(self, client, session):
+        assert client.post("/ok").status_code == 200
+
+        session.commit.assert_called_once()
+        session.close.assert_called_once()
+
+    def test_failed_request_rolls_back(self, client, session):
+        assert client.post("/fail").status_code == 400
+
+        session.commit.assert_not_called()
+        session.rollback.assert_called_once()
+        session.close.assert_called_once()